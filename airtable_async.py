@@ -0,0 +1,160 @@
+"""
+Asyncio variant of the Airtable client for bulk seeding and teardown.
+
+Usage:
+    from airtable_async import AsyncAirtableClient
+
+    async with AsyncAirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID) as client:
+        records = await client.create_batches('deals', fields_list)
+
+Many batched writes run concurrently in one event loop. They share the
+per-base rate limiter of airtable_client (so sync and async clients in one
+process never exceed the base limit together) and a cap on in-flight
+requests. Retries follow the same policy as the sync client.
+
+Requires httpx (pip install httpx).
+"""
+
+import asyncio
+
+import httpx
+
+from airtable_client import (
+    MAX_RETRIES,
+    REQUEST_TIMEOUT_SECONDS,
+    RETRY_STATUS_CODES,
+    api_url,
+    backoff_seconds,
+    chunked,
+    rate_limiter_for_base,
+)
+
+# Default cap on concurrently open requests
+DEFAULT_MAX_IN_FLIGHT = 10
+
+
+class AsyncAirtableClient:
+    """Async Airtable REST client with a shared rate limiter and an in-flight cap."""
+
+    def __init__(self, token, base_id, rate_limiter=None, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 max_retries=MAX_RETRIES):
+        self.base_id = base_id
+        self.api_url = api_url()
+        self.rate_limiter = rate_limiter or rate_limiter_for_base(base_id)
+        self.max_retries = max_retries
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0}
+
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._http = httpx.AsyncClient(
+            headers={
+                'Authorization': f'Bearer {token}',
+                'Content-Type': 'application/json'
+            },
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight),
+            timeout=REQUEST_TIMEOUT_SECONDS
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    def url(self, table_name, record_id=None):
+        url = f'{self.api_url}/{self.base_id}/{table_name}'
+        return f'{url}/{record_id}' if record_id else url
+
+    async def request(self, method, table_name, record_id=None, **kwargs):
+        """Send a rate-limited request, retrying on 429, 5xx and connection errors.
+
+        Returns the last response, or None if the request never got one.
+        """
+        url = self.url(table_name, record_id)
+
+        for attempt in range(1, self.max_retries + 2):
+            async with self._in_flight:
+                await self.rate_limiter.acquire_async()
+                self.stats['requests'] += 1
+
+                try:
+                    response = await self._http.request(method, url, **kwargs)
+                except httpx.TransportError as e:
+                    if attempt > self.max_retries:
+                        print(f"Error: {method} {table_name} failed after {attempt} attempts: {e!r}")
+                        return None
+                    delay = backoff_seconds(attempt)
+                    print(f"   Retry {attempt}/{self.max_retries} for {method} {table_name} in {delay:.1f}s ({e.__class__.__name__})")
+                else:
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        return response
+                    if attempt > self.max_retries:
+                        return response
+                    delay = backoff_seconds(attempt, response.headers.get('Retry-After'))
+                    print(f"   Retry {attempt}/{self.max_retries} for {method} {table_name} in {delay:.1f}s (status {response.status_code})")
+
+            # Sleep outside the semaphore so waiting retries don't block other requests
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+
+    def _report_error(self, action, table_name, response):
+        self.stats['failed'] += 1
+        if response is None:
+            print(f"Error {action} {table_name}: no response")
+            return
+        print(f"Error {action} {table_name}: {response.status_code}")
+        print(response.text)
+
+    async def create_records(self, table_name, fields_list):
+        """Create up to AIRTABLE_BATCH_SIZE records in one request.
+
+        Returns the created records in the same order as fields_list,
+        or None if the request failed.
+        """
+        payload = {'records': [{'fields': fields} for fields in fields_list]}
+        response = await self.request('POST', table_name, json=payload)
+
+        if response is None or response.status_code != 200:
+            self._report_error(f'creating {len(fields_list)} records in', table_name, response)
+            return None
+
+        return response.json()['records']
+
+    async def delete_records(self, table_name, record_ids):
+        """Delete up to AIRTABLE_BATCH_SIZE records in one request.
+
+        Returns the list of deleted IDs, or an empty list if the request failed.
+        """
+        params = [('records[]', record_id) for record_id in record_ids]
+        response = await self.request('DELETE', table_name, params=params)
+
+        if response is None or response.status_code != 200:
+            self._report_error(f'deleting {len(record_ids)} records from', table_name, response)
+            return []
+
+        return [record['id'] for record in response.json()['records'] if record.get('deleted')]
+
+    async def create_batches(self, table_name, fields_list):
+        """Create any number of records as concurrent batches.
+
+        Returns one entry per batch: the created records or None.
+        """
+        return await asyncio.gather(*(
+            self.create_records(table_name, batch) for batch in chunked(fields_list)
+        ))
+
+    async def delete_batches(self, table_name, record_ids):
+        """Delete any number of records as concurrent batches.
+
+        Returns the list of deleted IDs.
+        """
+        results = await asyncio.gather(*(
+            self.delete_records(table_name, batch) for batch in chunked(record_ids)
+        ))
+        return [record_id for deleted_ids in results for record_id in deleted_ids]
+
+    def print_stats(self):
+        print(f"Airtable requests: {self.stats['requests']}, "
+              f"retries: {self.stats['retries']}, failed: {self.stats['failed']}")
@@ -0,0 +1,279 @@
+"""
+Shared Airtable client for the test data scripts.
+
+Usage:
+    from airtable_client import AirtableClient
+
+    client = AirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID)
+    record = client.create_record('deals', {'deal_name': 'Test'})
+
+All requests go through one pooled requests.Session (keep-alive), a token
+bucket that matches Airtable's limit of 5 requests per second per base,
+and are retried with exponential backoff on 429 and 5xx responses.
+
+The API URL and the rate limit can be overridden via the environment, e.g.
+to run against the local stand-in from fake_airtable.py:
+
+    AIRTABLE_API_URL=http://127.0.0.1:8765/v0
+    AIRTABLE_RATE_LIMIT=50
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+AIRTABLE_API_URL = 'https://api.airtable.com/v0'
+
+# Airtable accepts at most 10 records per create/delete request
+AIRTABLE_BATCH_SIZE = 10
+
+# Maximum page size of the list endpoint
+AIRTABLE_PAGE_SIZE = 100
+
+# Airtable allows 5 requests per second per base
+RATE_LIMIT_PER_SECOND = 5
+
+# Retry settings for 429 and 5xx responses
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class RateLimiter:
+    """Thread-safe token bucket.
+
+    Tokens refill at `rate` per second up to `capacity`. Each caller
+    reserves one token; if none is left it gets the time to wait until
+    its token is due, so concurrent callers are spread out evenly.
+    """
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserve one token and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait in the event loop until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# The limit applies per base, so all clients of one base share a limiter
+_BASE_LIMITERS = {}
+_BASE_LIMITERS_LOCK = threading.Lock()
+
+
+def api_url():
+    """Return the API URL, AIRTABLE_API_URL from the environment wins."""
+    return (os.getenv('AIRTABLE_API_URL') or AIRTABLE_API_URL).rstrip('/')
+
+
+def rate_limiter_for_base(base_id):
+    """Return the process-wide rate limiter of a base.
+
+    AIRTABLE_RATE_LIMIT in the environment overrides the requests per second.
+    """
+    with _BASE_LIMITERS_LOCK:
+        if base_id not in _BASE_LIMITERS:
+            rate = float(os.getenv('AIRTABLE_RATE_LIMIT') or RATE_LIMIT_PER_SECOND)
+            _BASE_LIMITERS[base_id] = RateLimiter(rate)
+        return _BASE_LIMITERS[base_id]
+
+
+def chunked(items, size=AIRTABLE_BATCH_SIZE):
+    """Split a list into consecutive chunks of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def backoff_seconds(attempt, retry_after=None):
+    """Delay before retry number `attempt` (1-based).
+
+    A Retry-After header wins, otherwise exponential backoff with jitter.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class AirtableClient:
+    """Airtable REST client with connection pooling, rate limiting and retries."""
+
+    def __init__(self, token, base_id, rate_limiter=None, pool_size=10, max_retries=MAX_RETRIES):
+        self.base_id = base_id
+        self.api_url = api_url()
+        self.rate_limiter = rate_limiter or rate_limiter_for_base(base_id)
+        self.max_retries = max_retries
+        self.stats = {'requests': 0, 'retries': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/json'
+        })
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def url(self, table_name, record_id=None):
+        url = f'{self.api_url}/{self.base_id}/{table_name}'
+        return f'{url}/{record_id}' if record_id else url
+
+    def request(self, method, table_name, record_id=None, **kwargs):
+        """Send a rate-limited request, retrying on 429, 5xx and connection errors.
+
+        Returns the last response, or None if the request never got one.
+        """
+        url = self.url(table_name, record_id)
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT_SECONDS)
+
+        for attempt in range(1, self.max_retries + 2):
+            self.rate_limiter.acquire()
+            self._count('requests')
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt > self.max_retries:
+                    print(f"Error: {method} {table_name} failed after {attempt} attempts: {e}")
+                    return None
+                delay = backoff_seconds(attempt)
+                print(f"   Retry {attempt}/{self.max_retries} for {method} {table_name} in {delay:.1f}s ({e.__class__.__name__})")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                if attempt > self.max_retries:
+                    return response
+                delay = backoff_seconds(attempt, response.headers.get('Retry-After'))
+                print(f"   Retry {attempt}/{self.max_retries} for {method} {table_name} in {delay:.1f}s (status {response.status_code})")
+
+            self._count('retries')
+            time.sleep(delay)
+
+    def _report_error(self, action, table_name, response):
+        self._count('failed')
+        if response is None:
+            print(f"Error {action} {table_name}: no response")
+            return
+        print(f"Error {action} {table_name}: {response.status_code}")
+        print(response.text)
+
+    def create_record(self, table_name, fields):
+        """Create a record. Returns the created record or None."""
+        response = self.request('POST', table_name, json={'fields': fields})
+
+        if response is None or response.status_code != 200:
+            self._report_error('creating record in', table_name, response)
+            return None
+
+        return response.json()
+
+    def create_records(self, table_name, fields_list):
+        """Create up to AIRTABLE_BATCH_SIZE records in one request.
+
+        Returns the created records in the same order as fields_list,
+        or None if the request failed.
+        """
+        payload = {'records': [{'fields': fields} for fields in fields_list]}
+        response = self.request('POST', table_name, json=payload)
+
+        if response is None or response.status_code != 200:
+            self._report_error(f'creating {len(fields_list)} records in', table_name, response)
+            return None
+
+        return response.json()['records']
+
+    def delete_record(self, table_name, record_id):
+        """Delete a record. Returns True on success."""
+        response = self.request('DELETE', table_name, record_id)
+
+        if response is None or response.status_code != 200:
+            self._report_error(f'deleting record {record_id} from', table_name, response)
+            return False
+
+        return True
+
+    def delete_records(self, table_name, record_ids):
+        """Delete up to AIRTABLE_BATCH_SIZE records in one request.
+
+        Returns the list of deleted IDs, or an empty list if the request failed.
+        """
+        params = [('records[]', record_id) for record_id in record_ids]
+        response = self.request('DELETE', table_name, params=params)
+
+        if response is None or response.status_code != 200:
+            self._report_error(f'deleting {len(record_ids)} records from', table_name, response)
+            return []
+
+        return [record['id'] for record in response.json()['records'] if record.get('deleted')]
+
+    def list_records(self, table_name, formula=None, fields=None, view=None):
+        """Yield all records of a table matching the formula, page by page.
+
+        Only the given fields are requested. Raises on a failed request so a
+        partial scan is never mistaken for a complete one.
+        """
+        params = [('pageSize', AIRTABLE_PAGE_SIZE)]
+        if formula:
+            params.append(('filterByFormula', formula))
+        if view:
+            params.append(('view', view))
+        for field in fields or []:
+            params.append(('fields[]', field))
+
+        offset = None
+        while True:
+            page_params = params + [('offset', offset)] if offset else params
+            response = self.request('GET', table_name, params=page_params)
+
+            if response is None or response.status_code != 200:
+                self._report_error('listing records from', table_name, response)
+                raise RuntimeError(f"Listing records from {table_name} failed")
+
+            data = response.json()
+            yield from data.get('records', [])
+
+            offset = data.get('offset')
+            if not offset:
+                return
+
+    def print_stats(self):
+        print(f"Airtable requests: {self.stats['requests']}, "
+              f"retries: {self.stats['retries']}, failed: {self.stats['failed']}")
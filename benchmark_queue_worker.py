@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Benchmark the N8N queue worker with a burst of pending documents.
+
+Usage:
+    python scripts/tests/benchmark_queue_worker.py --count 40
+    python scripts/tests/benchmark_queue_worker.py --count 200 --timeout 3600 --keep
+
+Creates K fixtures at once (create_test_data.py bulk mode) with the
+document status "pending", so the queue worker picks them all up. The
+formulars are spread across all eight FORMULARE. watch_documents.py then
+timestamps every status change until the documents are done/error.
+The record IDs go to queue_benchmark_ids.json (test_data_ids.json is left
+alone); after an aborted run clean up with
+delete_test_data.py --file queue_benchmark_ids.json.
+
+Each document is enqueued at its Airtable createdTime. Processing starts
+at the first intermediate status the worker sets, if it sets one and a
+poll catches it. Otherwise the worker is assumed to process one document
+at a time: a document starts when it was enqueued or when the previous
+document finished, whichever is later. Documents that finish between the
+same two polls share that interval evenly.
+
+Reported:
+- drain rate (documents per minute, overall and between 10% and 90% done)
+- queue wait (enqueued -> processing started)
+- processing time per formular
+"""
+
+import json
+import time
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import create_test_data
+import delete_test_data
+from airtable_client import chunked
+from latency_stats import format_seconds, percentile, print_histogram, print_latency_summary, summarize
+from watch_documents import DocumentWatcher, POLL_BATCH_SIZE, record_id_formula
+
+# ============================================================
+# CONFIGURATION - Edit these values as needed
+# ============================================================
+
+DEFAULT_COUNT = 40
+DEFAULT_TIMEOUT_SECONDS = 1800
+
+# Poll faster than in watch_documents.py, the poll interval limits how
+# precisely completions (and the processing times derived from them) are seen
+MIN_INTERVAL_SECONDS = 1
+MAX_INTERVAL_SECONDS = 10
+
+# ============================================================
+# DO NOT EDIT BELOW THIS LINE
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+RESULTS_FILE = SCRIPT_DIR / 'queue_benchmark.jsonl'
+# Kept apart from test_data_ids.json so a benchmark never touches the regular fixtures
+IDS_FILE = SCRIPT_DIR / 'queue_benchmark_ids.json'
+
+client = create_test_data.client
+
+
+def parse_airtable_time(value):
+    """Airtable createdTime (e.g. 2024-01-01T12:00:00.000Z) as epoch seconds."""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def enqueue_times(document_ids):
+    """Monotonic enqueue time per document, converted from the Airtable createdTime.
+
+    Assumes the local clock is in sync with Airtable (NTP), an offset shifts
+    the queue wait of every document by the same amount.
+    """
+    offset = time.monotonic() - time.time()
+    enqueued = {}
+    for batch in chunked(document_ids, POLL_BATCH_SIZE):
+        for record in client.list_records('documents', formula=record_id_formula(batch), fields=['status']):
+            enqueued[record['id']] = parse_airtable_time(record['createdTime']) + offset
+    return enqueued
+
+
+def seed(count, workers):
+    """Create `count` pending fixtures, returns (fixture_ids, formular name per fixture)."""
+    formular_keys = sorted(create_test_data.FORMULARE)
+    fixtures = create_test_data.build_fixtures(count, create_test_data.DOCUMENT_STATUSES[1])
+    fixture_ids = create_test_data.create_fixtures_bulk(fixtures, workers=workers)
+    # build_fixtures spreads the formulars round-robin in this order
+    formulars = [create_test_data.FORMULARE[formular_keys[n % len(formular_keys)]]['name'] for n in range(count)]
+    return fixture_ids, formulars
+
+
+def processing_times(results, watcher):
+    """Add 'enqueued_s', 'queue_wait_s' and 'processing_s' to the finished results (in place).
+
+    All times are relative to the first enqueued document.
+    """
+    start_of_run = min(doc['started'] for doc in watcher.documents.values())
+    finished = sorted(
+        (r for r in results if r['latency_s'] is not None),
+        key=lambda r: watcher.documents[r['document_id']]['finished']
+    )
+
+    previous_finish = start_of_run
+    n = 0
+    while n < len(finished):
+        # Documents seen final in the same poll
+        finish = watcher.documents[finished[n]['document_id']]['finished']
+        group = [r for r in finished[n:] if watcher.documents[r['document_id']]['finished'] == finish]
+        enqueued = max(watcher.documents[r['document_id']]['started'] for r in group)
+        share = (finish - max(previous_finish, enqueued)) / len(group)
+
+        for k, result in enumerate(group):
+            doc = watcher.documents[result['document_id']]
+            end = max(previous_finish, enqueued) + share * (k + 1)
+            started = end - share
+            # An observed intermediate status (e.g. "processing") beats the estimate
+            observed = next((t for t in doc['transitions']
+                             if t['status'] not in ('pending', None) and t['status'] not in watcher.final_statuses), None)
+            if observed:
+                started = doc['started'] + observed['at_s']
+                end = finish
+            result['enqueued_s'] = round(doc['started'] - start_of_run, 3)
+            result['queue_wait_s'] = round(max(0.0, started - doc['started']), 3)
+            result['processing_s'] = round(end - started, 3)
+            result['processing_estimated'] = observed is None
+
+        previous_finish = finish
+        n += len(group)
+
+
+def drain_rates(results):
+    """(overall, 10%-90%) documents per minute, None if too few documents finished."""
+    done_at = sorted(r['enqueued_s'] + r['queue_wait_s'] + r['processing_s'] for r in results if 'processing_s' in r)
+    if len(done_at) < 2:
+        return None, None
+
+    overall = len(done_at) / done_at[-1] * 60 if done_at[-1] else None
+    low, high = percentile(done_at, 10), percentile(done_at, 90)
+    count = sum(1 for t in done_at if low < t <= high)
+    steady = count / (high - low) * 60 if high > low else None
+    return overall, steady
+
+
+def print_report(results, duration):
+    processed = [r for r in results if 'processing_s' in r]
+    overall, steady = drain_rates(results)
+
+    print_latency_summary(summarize(results, duration), 'QUEUE WORKER (enqueued -> final)')
+    print(f"Drain rate:  {overall or 0:.1f} documents/min overall, "
+          f"{steady or 0:.1f} documents/min between 10% and 90% done")
+
+    waits = sorted(r['queue_wait_s'] for r in processed)
+    print(f"Queue wait:  p50 {format_seconds(percentile(waits, 50))}, p95 {format_seconds(percentile(waits, 95))}, "
+          f"max {format_seconds(waits[-1] if waits else None)}")
+    if any(r['processing_estimated'] for r in processed):
+        print("             (no intermediate status seen, assuming one document at a time)")
+
+    print("\nProcessing time per formular:")
+    by_formular = {}
+    for r in processed:
+        by_formular.setdefault(r['formular'], []).append(r['processing_s'])
+    for formular, times in sorted(by_formular.items(), key=lambda item: -sum(item[1]) / len(item[1])):
+        times.sort()
+        print(f"  {formular[:45]:<45} {len(times):4}x  mean {sum(times) / len(times):7.2f}s  "
+              f"p50 {percentile(times, 50):7.2f}s  max {times[-1]:7.2f}s")
+
+    print_histogram([r['queue_wait_s'] for r in processed], title='Queue wait')
+
+
+def measure(fixture_ids, formulars, timeout, results_file):
+    """Watch the seeded documents until they are final, then write and print the results."""
+    documents = {ids['document_id']: formulars[n] for n, ids in enumerate(fixture_ids) if ids.get('document_id')}
+    enqueued = enqueue_times(list(documents))
+
+    watcher = DocumentWatcher(min_interval=MIN_INTERVAL_SECONDS, max_interval=MAX_INTERVAL_SECONDS)
+    for document_id, formular in documents.items():
+        watcher.add(document_id, enqueued.get(document_id), formular=formular)
+
+    print(f"\nWatching {len(watcher.documents)} document(s), timeout {timeout:.0f}s...")
+    try:
+        watcher.run(timeout=timeout)
+    except KeyboardInterrupt:
+        print("\nInterrupted, reporting the documents finished so far.")
+    duration = time.monotonic() - min(doc['started'] for doc in watcher.documents.values())
+
+    results = watcher.results()
+    processing_times(results, watcher)
+    with open(results_file, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    print_report(results, duration)
+    print(f"\nResults: {results_file}")
+
+
+def cleanup(fixture_ids, workers, keep=False):
+    """Delete the benchmark records, keep IDS_FILE if anything is left."""
+    if keep:
+        print(f"Keeping test data, run 'python scripts/tests/delete_test_data.py --file {IDS_FILE.name}' to clean up")
+        return
+
+    print("\nCleaning up...")
+    failed_ids = delete_test_data.delete_tables_bulk(delete_test_data.group_ids_by_table(fixture_ids), workers=workers)
+    if failed_ids:
+        print(f"{len(failed_ids)} record(s) could not be deleted, run 'python scripts/tests/delete_test_data.py --file {IDS_FILE.name}'")
+    else:
+        IDS_FILE.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the queue worker with a burst of pending documents.')
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT,
+                        help=f'Number of pending documents (default: {DEFAULT_COUNT})')
+    parser.add_argument('--workers', type=int, default=create_test_data.DEFAULT_WORKERS,
+                        help='Parallel batch requests while seeding and cleaning up')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help=f'Give up after this many seconds (default: {DEFAULT_TIMEOUT_SECONDS})')
+    parser.add_argument('--results', default=RESULTS_FILE, help=f'Per-document results (default: {RESULTS_FILE.name})')
+    parser.add_argument('--keep', action='store_true', help='Do not delete the test data afterwards')
+    args = parser.parse_args()
+
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    print(f"Seeding {args.count} pending document(s) (Formulare 1-{len(create_test_data.FORMULARE)})...")
+    fixture_ids, formulars = seed(args.count, args.workers)
+    # Saved right away so delete_test_data.py --file can clean up an aborted run
+    create_test_data.save_test_data(fixture_ids, IDS_FILE)
+
+    try:
+        measure(fixture_ids, formulars, args.timeout, args.results)
+    finally:
+        # Also after an error, so the records of a failed run do not pile up
+        cleanup(fixture_ids, args.workers, args.keep)
+        client.print_stats()
+
+
+if __name__ == '__main__':
+    main()
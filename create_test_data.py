@@ -4,18 +4,38 @@ Create test data in Airtable for N8N workflow testing.
 
 Usage:
     python scripts/tests/create_test_data.py
+    python scripts/tests/create_test_data.py --bulk
+    python scripts/tests/create_test_data.py --count 500 --workers 5
+    python scripts/tests/create_test_data.py --count 5000 --async --workers 20
+    python scripts/tests/create_test_data.py --fixtures testdaten.jsonl
 
 This script creates records in Airtable and saves the IDs to a JSON file
 so they can be deleted later with delete_test_data.py.
+
+With --bulk the records are created tier by tier (all businesses, then all
+deals, ...) using Airtable's batch endpoint, which accepts up to 10 records
+per request. With --count N, N independent fixtures with unique names are
+created and the formulars are spread across FORMULARE. The batches of one
+tier run in parallel on a bounded thread pool, or with --async as
+concurrent requests in one event loop (see airtable_async.py).
+
+With --fixtures FILE the business and employee of each fixture come from
+a JSONL file written by generate_test_data.py (one fixture per line,
+--count limits the number of lines read).
 """
 
 import os
 import json
-import requests
+import asyncio
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+from airtable_client import AirtableClient, AIRTABLE_BATCH_SIZE, chunked
+
 # ============================================================
 # CONFIGURATION - Edit these values as needed
 # ============================================================
@@ -83,25 +103,271 @@ load_dotenv(PROJECT_ROOT / '.env.local', override=True)
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 
-HEADERS = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Parallel batch requests per tier (the client keeps them at 5 requests/s)
+DEFAULT_WORKERS = 5
+
+client = AirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID, pool_size=AIRTABLE_BATCH_SIZE)
+
+
+def build_fixture(document_status, formular, suffix=''):
+    """Build the field values of one fixture from the configuration above.
+
+    Linked-record fields are left out, they are filled in tier by tier
+    once the IDs of the linked records are known. The suffix is appended
+    to all names to make the fixture unique.
+    """
+    return {
+        'business': {
+            'business_name': f'{BUSINESS_NAME}{suffix}',
+            'Unternehmensbranche': BUSINESS_BRANCHE
+        },
+        'deal': {
+            'deal_name': f'{DEAL_NAME}{suffix}'
+        },
+        'employee': {
+            'first_name': f'{EMPLOYEE_FIRST_NAME}{suffix}',
+            'last_name': EMPLOYEE_LAST_NAME,
+            'Aktueller Job Titel': EMPLOYEE_JOB_TITLE,
+            'work_start_date': EMPLOYEE_WORK_START_DATE,
+            'link_to_educational_programs': [EDUCATIONAL_PROGRAM_ID]
+        },
+        'document': {
+            'status': document_status,
+            'Formulare 2': [formular['record_id']]
+        },
+        'application': {
+            'application_name': f'{APPLICATION_NAME}{suffix}',
+            'application_status': APPLICATION_STATUS,
+            'Antrags-Art': ANTRAGS_ART,
+            'link_to_program': [EDUCATIONAL_PROGRAM_ID],
+            'application_folder': APPLICATION_FOLDER
+        }
+    }
+
+
+# Creation order: (id key, table, label, fields builder).
+# Each builder gets the fixture and the IDs created in the previous tiers.
+FIXTURE_TIERS = [
+    ('business_client_id', 'businesses_clients', 'Business Clients',
+     lambda fixture, ids: fixture['business']),
+    ('deal_id', 'deals', 'Deals',
+     lambda fixture, ids: {**fixture['deal'],
+                           'linked_business': [ids['business_client_id']]}),
+    ('employee_student_id', 'employees_students', 'Employees/Students',
+     lambda fixture, ids: {**fixture['employee'],
+                           'link_to_business': [ids['business_client_id']],
+                           'link_to_deals': [ids['deal_id']]}),
+    ('document_id', 'documents', 'Documents',
+     lambda fixture, ids: {**fixture['document'],
+                           'employees_students': [ids['employee_student_id']]}),
+    ('application_id', 'applications', 'Applications',
+     lambda fixture, ids: {**fixture['application'],
+                           'documents': [ids['document_id']],
+                           'link_to_deals': [ids['deal_id']],
+                           'link_to_students': [ids['employee_student_id']],
+                           'businesses_clients': [ids['business_client_id']]}),
+]
+
+
+def load_identities(path, limit=None):
+    """Read generated identities, one per line (see generate_test_data.py)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = (line for line in f if line.strip())
+        for line in itertools.islice(lines, limit):
+            yield json.loads(line)
+
+
+def fixture_from_identity(identity, document_status, formular, suffix=''):
+    """Build a fixture whose business and employee come from a generated identity.
+
+    Only the first employee of the identity is used. The application name
+    keeps APPLICATION_NAME so find_and_delete_test_data.py still finds it.
+    """
+    fixture = build_fixture(document_status, formular, suffix)
+    employee = (identity.get('mitarbeiter') or [{}])[0]
+
+    if identity.get('firma'):
+        fixture['business']['business_name'] = identity['firma']
+    fixture['employee']['first_name'] = employee.get('vorname', EMPLOYEE_FIRST_NAME)
+    fixture['employee']['last_name'] = employee.get('nachname', EMPLOYEE_LAST_NAME)
+    fixture['employee']['Aktueller Job Titel'] = employee.get('jobtitel', EMPLOYEE_JOB_TITLE)
+    if employee.get('beschaeftigung_beginn'):
+        start = datetime.strptime(employee['beschaeftigung_beginn'], '%d.%m.%Y')
+        fixture['employee']['work_start_date'] = start.strftime('%Y-%m-%d')
+
+    return fixture
+
+
+def build_fixtures(count, document_status, identities=None):
+    """Build `count` unique fixtures with the formulars spread across FORMULARE.
+
+    With `identities` (see load_identities) one fixture is built per identity.
+    """
+    run_tag = datetime.now().strftime('%Y%m%d%H%M%S')
+    formular_keys = sorted(FORMULARE)
+    if identities is None:
+        identities = [None] * count
+
+    fixtures = []
+    for n, identity in enumerate(identities):
+        formular = FORMULARE[formular_keys[n % len(formular_keys)]]
+        suffix = f' {run_tag}-{n + 1:04d}'
+        if identity is None:
+            fixtures.append(build_fixture(document_status, formular, suffix))
+        else:
+            fixtures.append(fixture_from_identity(identity, document_status, formular, suffix))
+    return fixtures
+
+
+def store_tier_results(batches, results, fixture_ids, id_key, failed):
+    """Store the IDs created for one tier, mark fixtures of failed batches.
+
+    Returns the number of created records.
+    """
+    created = 0
+    for batch, records in zip(batches, results):
+        if records is None:
+            failed.update(batch)
+            continue
+
+        for i, record in zip(batch, records):
+            fixture_ids[i][id_key] = record['id']
+        created += len(records)
+
+    return created
+
+
+def create_fixtures_bulk(fixtures, workers=DEFAULT_WORKERS):
+    """Create many fixtures tier by tier using batch requests.
+
+    The batches of one tier are sent in parallel by up to `workers` threads,
+    the next tier starts when all batches of the current tier are done.
+
+    Returns one dict of created IDs per fixture. A fixture whose record
+    could not be created in one tier is skipped in all following tiers,
+    its IDs from earlier tiers are still returned so they can be deleted.
+    """
+    fixture_ids = [{} for _ in fixtures]
+    failed = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for step, (id_key, table_name, label, build_fields) in enumerate(FIXTURE_TIERS, 1):
+            indices = [i for i in range(len(fixtures)) if i not in failed]
+            print(f"\n{step}. Creating {label} ({len(indices)})...")
+
+            batches = list(chunked(indices))
+            results = executor.map(
+                lambda batch: client.create_records(
+                    table_name,
+                    [build_fields(fixtures[i], fixture_ids[i]) for i in batch]
+                ),
+                batches
+            )
+
+            created = store_tier_results(batches, results, fixture_ids, id_key, failed)
+            print(f"   Created {created}/{len(indices)} {label}")
+
+    if failed:
+        print(f"\n{len(failed)} fixture(s) are incomplete, their partial IDs are saved for cleanup.")
+
+    return fixture_ids
+
+
+async def create_fixtures_bulk_async(fixtures, max_in_flight=DEFAULT_WORKERS):
+    """Async variant of create_fixtures_bulk.
+
+    All batches of one tier are sent concurrently in one event loop with at
+    most `max_in_flight` open requests, under the same per-base rate limit.
+    """
+    from airtable_async import AsyncAirtableClient
+
+    fixture_ids = [{} for _ in fixtures]
+    failed = set()
+
+    async with AsyncAirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID, max_in_flight=max_in_flight) as async_client:
+        for step, (id_key, table_name, label, build_fields) in enumerate(FIXTURE_TIERS, 1):
+            indices = [i for i in range(len(fixtures)) if i not in failed]
+            print(f"\n{step}. Creating {label} ({len(indices)})...")
+
+            batches = list(chunked(indices))
+            results = await asyncio.gather(*(
+                async_client.create_records(
+                    table_name,
+                    [build_fields(fixtures[i], fixture_ids[i]) for i in batch]
+                )
+                for batch in batches
+            ))
+
+            created = store_tier_results(batches, results, fixture_ids, id_key, failed)
+            print(f"   Created {created}/{len(indices)} {label}")
+
+        async_client.print_stats()
 
+    if failed:
+        print(f"\n{len(failed)} fixture(s) are incomplete, their partial IDs are saved for cleanup.")
 
-def create_record(table_name, fields):
-    """Create a record in the specified Airtable table."""
-    url = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{table_name}'
-    payload = {'fields': fields}
+    return fixture_ids
 
-    response = requests.post(url, headers=HEADERS, json=payload)
 
-    if response.status_code != 200:
-        print(f"Error creating record in {table_name}: {response.status_code}")
-        print(response.text)
-        return None
+def save_test_data(fixture_ids, path=TEST_DATA_FILE):
+    """Save created IDs to `path` (default: TEST_DATA_FILE).
 
-    return response.json()
+    A single fixture is stored in the flat format the other scripts read,
+    several fixtures are stored as a list under 'fixtures'.
+    """
+    created_at = datetime.now().isoformat()
+
+    if len(fixture_ids) == 1:
+        test_data = {**fixture_ids[0], 'created_at': created_at}
+    else:
+        test_data = {'fixtures': fixture_ids, 'created_at': created_at}
+
+    with open(path, 'w') as f:
+        json.dump(test_data, f, indent=2)
+
+
+def main_bulk(count=1, workers=DEFAULT_WORKERS, use_async=False, identities_file=None):
+    print("Creating test data in Airtable (bulk)...")
+
+    document_status = DOCUMENT_STATUSES[SELECTED_STATUS]
+    print(f"Document Status: {SELECTED_STATUS} - {document_status}")
+
+    if identities_file:
+        identities = list(load_identities(identities_file, count))
+        print(f"Fixtures: {len(identities)} from {identities_file} (Formulare 1-{len(FORMULARE)}), Workers: {workers}")
+        fixtures = build_fixtures(len(identities), document_status, identities)
+        if not fixtures:
+            print("\nNo identities found.")
+            return
+    elif count == 1:
+        formular = FORMULARE[SELECTED_FORMULAR]
+        print(f"Formular: {SELECTED_FORMULAR} - {formular['name']}")
+        fixtures = [build_fixture(document_status, formular)]
+    else:
+        print(f"Fixtures: {count} (Formulare 1-{len(FORMULARE)}), Workers: {workers}")
+        fixtures = build_fixtures(count, document_status)
+
+    started = datetime.now()
+    if use_async:
+        fixture_ids = asyncio.run(create_fixtures_bulk_async(fixtures, max_in_flight=workers))
+    else:
+        fixture_ids = create_fixtures_bulk(fixtures, workers=workers)
+    duration = (datetime.now() - started).total_seconds()
+
+    if not any(fixture_ids):
+        print("\nNo records were created.")
+        return
+
+    save_test_data(fixture_ids)
+
+    complete = sum(1 for ids in fixture_ids if 'application_id' in ids)
+    print("\n" + "="*50)
+    print(f"Test data created: {complete}/{len(fixtures)} complete fixture(s) in {duration:.1f}s")
+    print("="*50)
+    if not use_async:
+        client.print_stats()
+    print(f"\nIDs saved to: {TEST_DATA_FILE}")
+    print("Run 'python scripts/tests/delete_test_data.py' to clean up")
 
 
 def main():
@@ -115,7 +381,7 @@ def main():
 
     # 1. Create Business Client
     print("\n1. Creating Business Client...")
-    business_client = create_record('businesses_clients', {
+    business_client = client.create_record('businesses_clients', {
         'business_name': BUSINESS_NAME,
         'Unternehmensbranche': BUSINESS_BRANCHE
     })
@@ -129,7 +395,7 @@ def main():
 
     # 2. Create Deal linked to Business Client
     print("\n2. Creating Deal...")
-    deal = create_record('deals', {
+    deal = client.create_record('deals', {
         'deal_name': DEAL_NAME,
         'linked_business': [business_client_id]  # Linked record field expects array
     })
@@ -144,7 +410,7 @@ def main():
 
     # 3. Create Employee/Student linked to Business Client, Deal, and Educational Program
     print("\n3. Creating Employee/Student...")
-    employee_student = create_record('employees_students', {
+    employee_student = client.create_record('employees_students', {
         'first_name': EMPLOYEE_FIRST_NAME,
         'last_name': EMPLOYEE_LAST_NAME,
         'Aktueller Job Titel': EMPLOYEE_JOB_TITLE,
@@ -165,7 +431,7 @@ def main():
 
     # 4. Create Document linked to Employee/Student and Formular
     print("\n4. Creating Document...")
-    document = create_record('documents', {
+    document = client.create_record('documents', {
         'employees_students': [employee_student_id],  # Linked record field expects array
         'status': document_status,
         'Formulare 2': [formular['record_id']]  # Linked record field expects array
@@ -182,7 +448,7 @@ def main():
 
     # 5. Create Application linked to all records
     print("\n5. Creating Application...")
-    application = create_record('applications', {
+    application = client.create_record('applications', {
         'application_name': APPLICATION_NAME,
         'application_status': APPLICATION_STATUS,
         'Antrags-Art': ANTRAGS_ART,
@@ -206,17 +472,13 @@ def main():
     print(f"   Created Application: {application_id}")
 
     # 6. Save IDs to JSON file
-    test_data = {
+    save_test_data([{
         'business_client_id': business_client_id,
         'deal_id': deal_id,
         'employee_student_id': employee_student_id,
         'document_id': document_id,
-        'application_id': application_id,
-        'created_at': datetime.now().isoformat()
-    }
-
-    with open(TEST_DATA_FILE, 'w') as f:
-        json.dump(test_data, f, indent=2)
+        'application_id': application_id
+    }])
 
     print("\n" + "="*50)
     print("Test data created successfully!")
@@ -234,4 +496,44 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Create test data in Airtable.")
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Create records tier by tier via the batch endpoint (10 records per request)"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        help="Number of independent fixtures to create (implies --bulk, default: 1)"
+    )
+    parser.add_argument(
+        "--fixtures",
+        metavar="FILE",
+        help="JSONL file from generate_test_data.py, one fixture per line (implies --bulk)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Parallel batch requests per tier (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Send the batches from one asyncio event loop, --workers caps the requests in flight (requires httpx)"
+    )
+    args = parser.parse_args()
+
+    if args.count is not None and args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.fixtures:
+        main_bulk(count=args.count, workers=args.workers, use_async=args.use_async, identities_file=args.fixtures)
+    elif args.bulk or (args.count or 1) > 1 or args.use_async:
+        main_bulk(count=args.count or 1, workers=args.workers, use_async=args.use_async)
+    else:
+        main()
@@ -4,17 +4,30 @@ Delete test data from Airtable that was created by create_test_data.py.
 
 Usage:
     python scripts/tests/delete_test_data.py
+    python scripts/tests/delete_test_data.py --workers 5
+    python scripts/tests/delete_test_data.py --async --workers 20
+    python scripts/tests/delete_test_data.py --file queue_benchmark_ids.json
 
 This script reads the record IDs from test_data_ids.json and deletes
 only those specific records. It will NOT delete any other data.
+
+test_data_ids.json may contain a single fixture or many fixtures (list
+under 'fixtures', written by create_test_data.py --count N). The IDs are
+grouped per table and deleted in batches of 10, table by table in
+dependency order; the batches of one table run in parallel (threads, or
+with --async concurrent requests in one event loop).
 """
 
 import os
 import json
-import requests
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
+from airtable_client import AirtableClient, AIRTABLE_BATCH_SIZE, chunked
+
 # Get the project root directory (2 levels up from this script)
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
@@ -26,37 +39,153 @@ load_dotenv(PROJECT_ROOT / '.env.local', override=True)
 AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN')
 AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
 
-HEADERS = {
-    'Authorization': f'Bearer {AIRTABLE_TOKEN}',
-    'Content-Type': 'application/json'
-}
+# Parallel batch requests per table (the client keeps them at 5 requests/s)
+DEFAULT_WORKERS = 5
+
+client = AirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID, pool_size=AIRTABLE_BATCH_SIZE)
+
+# Deletion order: (id key, table, label). Dependent records go first.
+DELETE_TIERS = [
+    ('application_id', 'applications', 'Applications'),
+    ('document_id', 'documents', 'Documents'),
+    ('employee_student_id', 'employees_students', 'Employees/Students'),
+    ('deal_id', 'deals', 'Deals'),
+    ('business_client_id', 'businesses_clients', 'Business Clients'),
+]
+
+
+def load_fixtures(test_data):
+    """Return the list of fixtures from a single- or multi-fixture manifest."""
+    if 'fixtures' in test_data:
+        return test_data['fixtures']
+    return [test_data]
+
+
+def group_ids_by_table(fixtures):
+    """Collect the record IDs of all fixtures per table, in deletion order."""
+    grouped = []
+    for id_key, table_name, label in DELETE_TIERS:
+        record_ids = list(dict.fromkeys(
+            fixture[id_key] for fixture in fixtures if fixture.get(id_key)
+        ))
+        grouped.append((table_name, label, record_ids))
+    return grouped
+
+
+def delete_tables_bulk(grouped, workers=DEFAULT_WORKERS):
+    """Delete grouped record IDs table by table in batches of 10.
+
+    The batches of one table are sent in parallel by up to `workers`
+    threads. Returns the IDs that could not be deleted.
+    """
+    failed_ids = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for step, (table_name, label, record_ids) in enumerate(grouped, 1):
+            print(f"\n{step}. Deleting {label} ({len(record_ids)})...")
+            if not record_ids:
+                continue
+
+            batches = list(chunked(record_ids))
+            results = executor.map(lambda batch: client.delete_records(table_name, batch), batches)
+
+            deleted = collect_deleted(batches, results, failed_ids)
+            print(f"   Deleted {deleted}/{len(record_ids)} {label}")
+
+    return failed_ids
+
+
+async def delete_tables_bulk_async(grouped, max_in_flight=DEFAULT_WORKERS):
+    """Async variant of delete_tables_bulk.
+
+    All batches of one table are sent concurrently in one event loop with
+    at most `max_in_flight` open requests, under the same per-base rate limit.
+    """
+    from airtable_async import AsyncAirtableClient
+
+    failed_ids = []
 
+    async with AsyncAirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID, max_in_flight=max_in_flight) as async_client:
+        for step, (table_name, label, record_ids) in enumerate(grouped, 1):
+            print(f"\n{step}. Deleting {label} ({len(record_ids)})...")
+            if not record_ids:
+                continue
 
-def delete_record(table_name, record_id):
-    """Delete a record from the specified Airtable table."""
-    url = f'https://api.airtable.com/v0/{AIRTABLE_BASE_ID}/{table_name}/{record_id}'
+            batches = list(chunked(record_ids))
+            results = await asyncio.gather(*(
+                async_client.delete_records(table_name, batch) for batch in batches
+            ))
 
-    response = requests.delete(url, headers=HEADERS)
+            deleted = collect_deleted(batches, results, failed_ids)
+            print(f"   Deleted {deleted}/{len(record_ids)} {label}")
 
-    if response.status_code != 200:
-        print(f"Error deleting record {record_id} from {table_name}: {response.status_code}")
-        print(response.text)
-        return False
+        async_client.print_stats()
 
-    return True
+    return failed_ids
 
 
-def main():
-    # Check if test_data_ids.json exists
-    if not TEST_DATA_FILE.exists():
-        print(f"No {TEST_DATA_FILE} found.")
+def collect_deleted(batches, results, failed_ids):
+    """Add the IDs a batch did not delete to failed_ids, return the deleted count."""
+    deleted = 0
+    for batch, deleted_ids in zip(batches, results):
+        deleted += len(deleted_ids)
+        failed_ids.extend(rid for rid in batch if rid not in deleted_ids)
+    return deleted
+
+
+def main_bulk(test_data, workers=DEFAULT_WORKERS, use_async=False, test_data_file=TEST_DATA_FILE):
+    fixtures = load_fixtures(test_data)
+
+    print("Deleting test data from Airtable (bulk)...")
+    print(f"Created at: {test_data.get('created_at', 'unknown')}")
+    print(f"Fixtures: {len(fixtures)}, Workers: {workers}")
+
+    grouped = group_ids_by_table(fixtures)
+    if use_async:
+        failed_ids = asyncio.run(delete_tables_bulk_async(grouped, max_in_flight=workers))
+    else:
+        failed_ids = delete_tables_bulk(grouped, workers=workers)
+        client.print_stats()
+
+    if failed_ids:
+        # Keep only the records that are still there so a rerun can finish the job
+        failed = set(failed_ids)
+        remaining = [
+            {key: value for key, value in fixture.items() if value in failed}
+            for fixture in fixtures
+        ]
+        remaining = [fixture for fixture in remaining if fixture]
+        with open(test_data_file, 'w') as f:
+            json.dump({'fixtures': remaining, 'created_at': test_data.get('created_at')}, f, indent=2)
+
+        print("\n" + "="*50)
+        print(f"{len(failed_ids)} record(s) could not be deleted.")
+        print(f"Remaining IDs saved to: {test_data_file}")
+        print("="*50)
+        return
+
+    test_data_file.unlink()
+
+    print("\n" + "="*50)
+    print("Test data cleanup complete!")
+    print("="*50)
+
+
+def main(workers=DEFAULT_WORKERS, use_async=False, test_data_file=TEST_DATA_FILE):
+    # Check if the ID file exists
+    if not test_data_file.exists():
+        print(f"No {test_data_file} found.")
         print("Either no test data was created, or it was already deleted.")
         return
 
     # Load the IDs
-    with open(TEST_DATA_FILE, 'r') as f:
+    with open(test_data_file, 'r') as f:
         test_data = json.load(f)
 
+    if 'fixtures' in test_data or use_async:
+        main_bulk(test_data, workers=workers, use_async=use_async, test_data_file=test_data_file)
+        return
+
     print("Deleting test data from Airtable...")
     print(f"Created at: {test_data.get('created_at', 'unknown')}")
 
@@ -64,7 +193,7 @@ def main():
     print("\n1. Deleting Application...")
     application_id = test_data.get('application_id')
     if application_id:
-        if delete_record('applications', application_id):
+        if client.delete_record('applications', application_id):
             print(f"   Deleted: {application_id}")
         else:
             print(f"   Failed to delete: {application_id}")
@@ -73,7 +202,7 @@ def main():
     print("\n2. Deleting Document...")
     document_id = test_data.get('document_id')
     if document_id:
-        if delete_record('documents', document_id):
+        if client.delete_record('documents', document_id):
             print(f"   Deleted: {document_id}")
         else:
             print(f"   Failed to delete: {document_id}")
@@ -82,7 +211,7 @@ def main():
     print("\n3. Deleting Employee/Student...")
     employee_id = test_data.get('employee_student_id')
     if employee_id:
-        if delete_record('employees_students', employee_id):
+        if client.delete_record('employees_students', employee_id):
             print(f"   Deleted: {employee_id}")
         else:
             print(f"   Failed to delete: {employee_id}")
@@ -91,7 +220,7 @@ def main():
     print("\n4. Deleting Deal...")
     deal_id = test_data.get('deal_id')
     if deal_id:
-        if delete_record('deals', deal_id):
+        if client.delete_record('deals', deal_id):
             print(f"   Deleted: {deal_id}")
         else:
             print(f"   Failed to delete: {deal_id}")
@@ -100,13 +229,13 @@ def main():
     print("\n5. Deleting Business Client...")
     business_id = test_data.get('business_client_id')
     if business_id:
-        if delete_record('businesses_clients', business_id):
+        if client.delete_record('businesses_clients', business_id):
             print(f"   Deleted: {business_id}")
         else:
             print(f"   Failed to delete: {business_id}")
 
     # 6. Remove the JSON file
-    TEST_DATA_FILE.unlink()
+    test_data_file.unlink()
 
     print("\n" + "="*50)
     print("Test data cleanup complete!")
@@ -114,4 +243,27 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Delete test data created by create_test_data.py.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Parallel batch requests per table (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--file",
+        default=str(TEST_DATA_FILE),
+        help=f"ID file written by create_test_data.py or benchmark_queue_worker.py, "
+             f"relative to the script directory (default: {TEST_DATA_FILE.name})"
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Send the batches from one asyncio event loop, --workers caps the requests in flight (requires httpx)"
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    main(workers=args.workers, use_async=args.use_async, test_data_file=SCRIPT_DIR / args.file)
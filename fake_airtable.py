@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Local in-memory stand-in for the Airtable REST API.
+
+Usage:
+    python fake_airtable.py --port 8765
+    python fake_airtable.py --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.05 --seed 1
+
+    AIRTABLE_API_URL=http://127.0.0.1:8765/v0 AIRTABLE_RATE_LIMIT=50 \\
+        python create_test_data.py --count 500
+
+Implements the subset of the API the scripts use, so the tooling can be
+tested and load-tested offline and deterministically:
+
+- create (single and batch of up to 10), list, get, update (PATCH), delete
+  (single and batch via records[])
+- list with filterByFormula, fields[], pageSize/maxRecords and offset
+  pagination
+- linked records: IDs of deleted records are removed from link fields
+
+filterByFormula supports field references, string/number literals, the
+operators = != < > <= >= & + - * / and the functions AND, OR, NOT, IF,
+FIND, SEARCH, LOWER, UPPER, LEN, TRIM, ARRAYJOIN, RECORD_ID, BLANK, TRUE
+and FALSE.
+
+Latency, random 429 responses and Airtable's per-base rate limit can be
+injected. Everything is kept in memory and lost when the server stops.
+"""
+
+import argparse
+import json
+import random
+import re
+import string
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+DEFAULT_PORT = 8765
+
+# Same limits as the real API
+MAX_BATCH_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class FormulaError(ValueError):
+    pass
+
+
+# ============================================================
+# FORMULA EVALUATION
+# ============================================================
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<field>\{[^}]*\})
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>!=|<=|>=|[=<>&+\-*/(),])
+    )''', re.VERBOSE)
+
+
+def tokenize(formula):
+    tokens = []
+    position = 0
+    formula = formula.strip()
+    while position < len(formula):
+        match = TOKEN_PATTERN.match(formula, position)
+        if not match or match.end() == position:
+            raise FormulaError(f"Unexpected character at {position}: {formula[position:position + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+        elif kind == 'number':
+            value = float(value) if '.' in value else int(value)
+        elif kind == 'field':
+            value = value[1:-1]
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def to_text(value):
+    """Convert a cell value to text the way Airtable does in string context."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, list):
+        return ', '.join(to_text(item) for item in value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def is_truthy(value):
+    if isinstance(value, list):
+        return len(value) > 0
+    return value not in (None, '', 0, False)
+
+
+def compare(op, left, right):
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        pass
+    else:
+        left, right = to_text(left), to_text(right)
+    if op == '=':
+        return left == right
+    if op == '!=':
+        return left != right
+    if op == '<':
+        return left < right
+    if op == '>':
+        return left > right
+    if op == '<=':
+        return left <= right
+    return left >= right
+
+
+def find(needle, haystack, start=1, ignore_case=False):
+    needle, haystack = to_text(needle), to_text(haystack)
+    if ignore_case:
+        needle, haystack = needle.lower(), haystack.lower()
+    return haystack.find(needle, max(int(start or 1) - 1, 0)) + 1
+
+
+FUNCTIONS = {
+    'AND': lambda *args: all(is_truthy(arg) for arg in args),
+    'OR': lambda *args: any(is_truthy(arg) for arg in args),
+    'NOT': lambda arg: not is_truthy(arg),
+    'IF': lambda cond, then, otherwise=None: then if is_truthy(cond) else otherwise,
+    'FIND': lambda needle, haystack, start=1: find(needle, haystack, start),
+    'SEARCH': lambda needle, haystack, start=1: find(needle, haystack, start, ignore_case=True) or None,
+    'LOWER': lambda text: to_text(text).lower(),
+    'UPPER': lambda text: to_text(text).upper(),
+    'LEN': lambda text: len(to_text(text)),
+    'TRIM': lambda text: to_text(text).strip(),
+    'ARRAYJOIN': lambda values, separator=', ': separator.join(to_text(v) for v in (values or [])),
+    'BLANK': lambda: None,
+    'TRUE': lambda: True,
+    'FALSE': lambda: False,
+}
+
+
+class FormulaParser:
+    """Recursive-descent parser that compiles a formula into a function of a record."""
+
+    def __init__(self, formula):
+        self.tokens = tokenize(formula)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            raise FormulaError(f"Expected {value!r}, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def compile(self):
+        expression = self.comparison()
+        if self.position != len(self.tokens):
+            raise FormulaError(f"Unexpected token {self.peek()[1]!r}")
+        return expression
+
+    def binary(self, operators, operand, apply):
+        left = operand()
+        while self.peek()[0] == 'op' and self.peek()[1] in operators:
+            op = self.take()[1]
+            right = operand()
+            left = (lambda op, l, r: lambda record: apply(op, l(record), r(record)))(op, left, right)
+        return left
+
+    def comparison(self):
+        return self.binary(('=', '!=', '<', '>', '<=', '>='), self.concatenation, compare)
+
+    def concatenation(self):
+        return self.binary(('&',), self.additive, lambda op, l, r: to_text(l) + to_text(r))
+
+    def additive(self):
+        return self.binary(('+', '-'), self.multiplicative, arithmetic)
+
+    def multiplicative(self):
+        return self.binary(('*', '/'), self.unary, arithmetic)
+
+    def unary(self):
+        if self.peek() == ('op', '-'):
+            self.take()
+            operand = self.unary()
+            return lambda record: -number(operand(record))
+        return self.primary()
+
+    def primary(self):
+        kind, value = self.take()
+        if kind in ('number', 'string'):
+            return lambda record: value
+        if kind == 'field':
+            return lambda record: record['fields'].get(value)
+        if kind == 'op' and value == '(':
+            expression = self.comparison()
+            self.take(')')
+            return expression
+        if kind == 'name':
+            return self.call(value.upper())
+        raise FormulaError(f"Unexpected token {value!r}")
+
+    def call(self, name):
+        self.take('(')
+        arguments = []
+        if self.peek() != ('op', ')'):
+            arguments.append(self.comparison())
+            while self.peek() == ('op', ','):
+                self.take()
+                arguments.append(self.comparison())
+        self.take(')')
+
+        if name == 'RECORD_ID':
+            return lambda record: record['id']
+        if name not in FUNCTIONS:
+            raise FormulaError(f"Unknown function {name}()")
+        function = FUNCTIONS[name]
+        return lambda record: function(*(argument(record) for argument in arguments))
+
+
+def number(value):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(to_text(value) or 0)
+    except ValueError:
+        return 0
+
+
+def arithmetic(op, left, right):
+    left, right = number(left), number(right)
+    if op == '+':
+        return left + right
+    if op == '-':
+        return left - right
+    if op == '*':
+        return left * right
+    return left / right if right else None
+
+
+def compile_formula(formula):
+    """Compile a filterByFormula expression into a predicate on a record."""
+    expression = FormulaParser(formula).compile()
+    return lambda record: is_truthy(expression(record))
+
+
+# ============================================================
+# IN-MEMORY BASE
+# ============================================================
+
+class ApiError(Exception):
+    def __init__(self, status, error_type, message):
+        super().__init__(message)
+        self.status = status
+        self.body = {'error': {'type': error_type, 'message': message}}
+
+
+class FakeBase:
+    """Tables of records, keyed by table name and record ID (insertion ordered)."""
+
+    def __init__(self, rng):
+        self.tables = {}
+        self.rng = rng
+        self.lock = threading.Lock()
+
+    def new_record_id(self):
+        alphabet = string.ascii_letters + string.digits
+        return 'rec' + ''.join(self.rng.choice(alphabet) for _ in range(14))
+
+    def table(self, table_name):
+        return self.tables.setdefault(table_name, {})
+
+    def get(self, table_name, record_id):
+        record = self.table(table_name).get(record_id)
+        if record is None:
+            raise ApiError(404, 'NOT_FOUND', f"Record {record_id} not found")
+        return record
+
+    def create(self, table_name, fields_list):
+        created_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        records = []
+        for fields in fields_list:
+            record = {'id': self.new_record_id(), 'createdTime': created_time, 'fields': dict(fields)}
+            self.table(table_name)[record['id']] = record
+            records.append(record)
+        return records
+
+    def update(self, table_name, updates, replace=False):
+        records = []
+        for update in updates:
+            record = self.get(table_name, update.get('id'))
+            if replace:
+                record['fields'] = dict(update.get('fields', {}))
+            else:
+                record['fields'].update(update.get('fields', {}))
+            records.append(record)
+        return records
+
+    def delete(self, table_name, record_ids):
+        table = self.table(table_name)
+        for record_id in record_ids:
+            if record_id not in table:
+                raise ApiError(404, 'NOT_FOUND', f"Record {record_id} not found")
+
+        for record_id in record_ids:
+            del table[record_id]
+        self.unlink(set(record_ids))
+        return [{'id': record_id, 'deleted': True} for record_id in record_ids]
+
+    def unlink(self, deleted_ids):
+        """Remove deleted record IDs from link fields, like Airtable does."""
+        for table in self.tables.values():
+            for record in table.values():
+                for name, value in record['fields'].items():
+                    if isinstance(value, list) and any(item in deleted_ids for item in value if isinstance(item, str)):
+                        record['fields'][name] = [item for item in value if item not in deleted_ids]
+
+    def list(self, table_name, formula=None, fields=None, page_size=MAX_PAGE_SIZE, max_records=None, offset=0):
+        records = list(self.table(table_name).values())
+        if formula:
+            predicate = compile_formula(formula)
+            records = [record for record in records if predicate(record)]
+        if max_records:
+            records = records[:max_records]
+
+        page = records[offset:offset + page_size]
+        if fields:
+            page = [
+                {**record, 'fields': {k: v for k, v in record['fields'].items() if k in fields}}
+                for record in page
+            ]
+
+        next_offset = offset + page_size if offset + page_size < len(records) else None
+        return page, next_offset
+
+
+# ============================================================
+# HTTP SERVER
+# ============================================================
+
+class FakeAirtableServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=None, seed=None, verbose=False):
+        super().__init__(address, FakeAirtableHandler)
+        self.rng = random.Random(seed)
+        self.bases = {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.verbose = verbose
+        self.request_times = {}
+        self.stats = {'requests': 0, 'throttled': 0}
+        self.lock = threading.Lock()
+
+    def base(self, base_id):
+        with self.lock:
+            if base_id not in self.bases:
+                self.bases[base_id] = FakeBase(self.rng)
+            return self.bases[base_id]
+
+    def injected_delay(self):
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(self.latency_ms + jitter, 0) / 1000
+
+    def should_throttle(self, base_id):
+        """Random 429s (--error-rate) and the per-base rate limit (--rate-limit)."""
+        with self.lock:
+            self.stats['requests'] += 1
+            throttled = self.error_rate and self.rng.random() < self.error_rate
+
+            if self.rate_limit and not throttled:
+                now = time.monotonic()
+                window = self.request_times.setdefault(base_id, deque())
+                while window and now - window[0] >= 1:
+                    window.popleft()
+                throttled = len(window) >= self.rate_limit
+                if not throttled:
+                    window.append(now)
+
+            if throttled:
+                self.stats['throttled'] += 1
+            return throttled
+
+
+class FakeAirtableHandler(BaseHTTPRequestHandler):
+    server_version = 'FakeAirtable/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ApiError(422, 'INVALID_REQUEST_BODY', "Could not parse request body")
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def do_PUT(self):
+        self.dispatch('PUT')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/')]
+        query = parse_qsl(url.query, keep_blank_values=True)
+
+        # Read the body first so the connection stays usable after an error
+        try:
+            body = self.read_json() if method in ('POST', 'PATCH', 'PUT') else {}
+        except ApiError as e:
+            self.send_json(e.status, e.body)
+            return
+
+        delay = self.server.injected_delay()
+        if delay:
+            time.sleep(delay)
+
+        if len(parts) not in (3, 4) or parts[0] != 'v0':
+            self.send_json(404, {'error': 'NOT_FOUND'})
+            return
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self.send_json(401, {'error': 'AUTHENTICATION_REQUIRED'})
+            return
+
+        base_id, table_name = parts[1], parts[2]
+        record_id = parts[3] if len(parts) == 4 else None
+
+        if self.server.should_throttle(base_id):
+            self.send_json(429, {'errors': [{
+                'error': 'RATE_LIMIT_REACHED',
+                'message': 'Rate limit exceeded. Please try again later'
+            }]})
+            return
+
+        base = self.server.base(base_id)
+        try:
+            with base.lock:
+                status, response = self.handle_api(method, base, table_name, record_id, query, body)
+        except ApiError as e:
+            self.send_json(e.status, e.body)
+            return
+        except FormulaError as e:
+            self.send_json(422, {'error': {'type': 'INVALID_FILTER_BY_FORMULA', 'message': str(e)}})
+            return
+        self.send_json(status, response)
+
+    def handle_api(self, method, base, table_name, record_id, query, body):
+        if method == 'GET' and record_id:
+            return 200, base.get(table_name, record_id)
+
+        if method == 'GET':
+            params = dict(query)
+            fields = [value for key, value in query if key in ('fields[]', 'fields')]
+            page_size = min(int(params.get('pageSize', MAX_PAGE_SIZE)), MAX_PAGE_SIZE)
+            max_records = int(params['maxRecords']) if params.get('maxRecords') else None
+            try:
+                offset = int(params.get('offset') or 0)
+            except ValueError:
+                raise ApiError(422, 'LIST_RECORDS_ITERATOR_NOT_AVAILABLE', "Invalid offset")
+            records, next_offset = base.list(
+                table_name, params.get('filterByFormula'), fields, page_size, max_records, offset
+            )
+            response = {'records': records}
+            if next_offset is not None:
+                response['offset'] = str(next_offset)
+            return 200, response
+
+        if method == 'POST' and not record_id:
+            if 'records' in body:
+                check_batch(body['records'])
+                return 200, {'records': base.create(table_name, [r.get('fields', {}) for r in body['records']])}
+            return 200, base.create(table_name, [body.get('fields', {})])[0]
+
+        if method in ('PATCH', 'PUT'):
+            replace = method == 'PUT'
+            if record_id:
+                return 200, base.update(table_name, [{'id': record_id, 'fields': body.get('fields', {})}], replace)[0]
+            check_batch(body.get('records', []))
+            return 200, {'records': base.update(table_name, body['records'], replace)}
+
+        if method == 'DELETE':
+            if record_id:
+                return 200, base.delete(table_name, [record_id])[0]
+            record_ids = [value for key, value in query if key in ('records[]', 'records')]
+            check_batch(record_ids)
+            return 200, {'records': base.delete(table_name, record_ids)}
+
+        raise ApiError(404, 'NOT_FOUND', f"{method} not supported here")
+
+
+def check_batch(items):
+    if not items:
+        raise ApiError(422, 'INVALID_REQUEST_MISSING_FIELDS', "No records given")
+    if len(items) > MAX_BATCH_SIZE:
+        raise ApiError(422, 'INVALID_RECORDS', f"At most {MAX_BATCH_SIZE} records per request")
+
+
+def start_server(port=0, **options):
+    """Start the fake in a background thread and return the server.
+
+    The API URL is f'http://127.0.0.1:{server.server_port}/v0'. Call
+    server.shutdown() to stop it.
+    """
+    server = FakeAirtableServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local in-memory stand-in for the Airtable API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 429 (0-1)")
+    parser.add_argument("--rate-limit", type=int, default=None,
+                        help="Answer with 429 above this many requests per second per base (Airtable: 5)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for record IDs, latency and errors")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = FakeAirtableServer(
+        (args.host, args.port),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+
+    print(f"Fake Airtable running on http://{args.host}:{args.port}/v0")
+    print(f"Use: AIRTABLE_API_URL=http://{args.host}:{args.port}/v0")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nRequests: {server.stats['requests']}, throttled (429): {server.stats['throttled']}")
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
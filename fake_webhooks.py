@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the n8n and Make webhooks that records every request.
+
+Usage:
+    python fake_webhooks.py --port 8780
+    python fake_webhooks.py --port 8780 --latency-ms 300 --jitter-ms 100 --error-rate 0.02 --seed 1
+    python fake_webhooks.py --routes routes.json --record webhook_requests.jsonl
+
+    WEBHOOK_BASE_URL=http://127.0.0.1:8780 python trigger_document_creation.py --load --rate 20
+
+The scripts keep the path of their live hook URL when WEBHOOK_BASE_URL is
+set (see webhooks.py), so every hook is its own route here. Routes are
+configured in a JSON file, keyed by path prefix (the longest matching
+prefix wins, "*" is the fallback):
+
+    {
+        "*": {"latency_ms": 50},
+        "/webhook/": {"latency_ms": 800, "jitter_ms": 300, "error_rate": 0.05,
+                      "error_status": 500, "body": "Workflow was started"},
+        "/nh9qkxqofgmcfrah8ntk6ka676ur7480": {"status": 200, "body": {"ok": true}}
+    }
+
+Route options: status (default 200), body (string or JSON, default
+"Accepted" like Make), latency_ms, jitter_ms, error_rate (0-1), error_status
+(default 500) and error_body. The CLI options are the defaults for all routes.
+
+Every request is recorded with time, method, path, JSON body (or text),
+the response status and the injected latency: in memory (GET /_requests,
+DELETE /_requests to clear, GET /_stats) and with --record as JSON lines.
+
+Built on asyncio streams (HTTP/1.1 with keep-alive), so thousands of
+concurrent requests with injected latency need no thread per request.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+DEFAULT_PORT = 8780
+
+DEFAULT_ROUTE = {
+    'status': 200,
+    'body': 'Accepted',
+    'latency_ms': 0,
+    'jitter_ms': 0,
+    'error_rate': 0.0,
+    'error_status': 500,
+    'error_body': 'Internal Server Error',
+}
+
+REASONS = {200: 'OK', 202: 'Accepted', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           410: 'Gone', 429: 'Too Many Requests', 500: 'Internal Server Error', 502: 'Bad Gateway',
+           503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+# ============================================================
+# ROUTES & RECORDING
+# ============================================================
+
+class FakeWebhooks:
+    """Route configuration, injected latency/errors and the recorded requests."""
+
+    def __init__(self, routes=None, defaults=None, record_file=None, seed=None, verbose=False):
+        self.defaults = {**DEFAULT_ROUTE, **(defaults or {})}
+        self.routes = {prefix: {**self.defaults, **options} for prefix, options in (routes or {}).items()}
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.requests = []
+        self.stats = {'requests': 0, 'errors': 0}
+        self.out = open(record_file, 'a', encoding='utf-8') if record_file else None
+
+    def route_for(self, path):
+        """(prefix, options) of the longest matching route prefix."""
+        matches = [prefix for prefix in self.routes if prefix != '*' and path.startswith(prefix)]
+        if matches:
+            prefix = max(matches, key=len)
+            return prefix, self.routes[prefix]
+        return '*', self.routes.get('*', self.defaults)
+
+    def response_for(self, path):
+        """(route prefix, status, body, delay in seconds) for a request to `path`."""
+        prefix, route = self.route_for(path)
+        jitter = self.rng.uniform(-route['jitter_ms'], route['jitter_ms']) if route['jitter_ms'] else 0
+        delay = max(route['latency_ms'] + jitter, 0) / 1000
+        if route['error_rate'] and self.rng.random() < route['error_rate']:
+            return prefix, route['error_status'], route['error_body'], delay
+        return prefix, route['status'], route['body'], delay
+
+    def record(self, entry):
+        self.requests.append(entry)
+        self.stats['requests'] += 1
+        self.stats['errors'] += entry['status'] >= 400
+        if self.out:
+            self.out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.out.flush()
+        if self.verbose:
+            print(f"{entry['method']} {entry['path']} -> {entry['status']} ({entry['delay_ms']:.0f} ms)")
+
+    def stats_per_route(self):
+        per_route = {}
+        for entry in self.requests:
+            route = per_route.setdefault(entry['route'], {'requests': 0, 'errors': 0})
+            route['requests'] += 1
+            route['errors'] += entry['status'] >= 400
+        return {**self.stats, 'routes': per_route}
+
+    def close(self):
+        if self.out:
+            self.out.close()
+            self.out = None
+
+
+def load_routes(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================
+# HTTP SERVER
+# ============================================================
+
+def encode_body(body):
+    """(bytes, content type) of a route body: strings as text, everything else as JSON."""
+    if isinstance(body, str):
+        return body.encode(), 'text/plain; charset=utf-8'
+    return json.dumps(body).encode(), 'application/json'
+
+
+async def write_response(writer, status, body, keep_alive):
+    data, content_type = encode_body(body)
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + data)
+    await writer.drain()
+
+
+async def read_request(reader):
+    """(method, target, headers, body) of the next request, None when the client closed the connection."""
+    try:
+        request_line = await reader.readline()
+    except (ConnectionError, asyncio.LimitOverrunError):
+        return None
+    if not request_line.strip():
+        return None
+
+    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length') or 0)
+    body = await reader.readexactly(length) if length else b''
+    return method, target, headers, body
+
+
+def parse_body(raw):
+    if not raw:
+        return None
+    text = raw.decode('utf-8', errors='replace')
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+async def handle_control(webhooks, writer, method, path, keep_alive):
+    """Endpoints under /_ to inspect the receiver, not recorded themselves."""
+    if path == '/_requests' and method == 'GET':
+        await write_response(writer, 200, webhooks.requests, keep_alive)
+    elif path == '/_requests' and method == 'DELETE':
+        webhooks.requests.clear()
+        await write_response(writer, 200, {'cleared': True}, keep_alive)
+    elif path == '/_stats':
+        await write_response(writer, 200, webhooks.stats_per_route(), keep_alive)
+    else:
+        await write_response(writer, 404, {'error': 'NOT_FOUND'}, keep_alive)
+
+
+async def handle_connection(webhooks, reader, writer):
+    try:
+        while True:
+            request = await read_request(reader)
+            if request is None:
+                break
+            method, target, headers, raw_body = request
+            keep_alive = headers.get('connection', '').lower() != 'close'
+            url = urlsplit(target)
+            path = unquote(url.path)
+
+            if path.startswith('/_'):
+                await handle_control(webhooks, writer, method, path, keep_alive)
+            else:
+                received = time.time()
+                route, status, body, delay = webhooks.response_for(path)
+                if delay:
+                    await asyncio.sleep(delay)
+                webhooks.record({
+                    'received_at': round(received, 6),
+                    'method': method,
+                    'path': path,
+                    'query': url.query,
+                    'route': route,
+                    'body': parse_body(raw_body),
+                    'status': status,
+                    'delay_ms': round(delay * 1000, 1),
+                })
+                await write_response(writer, status, body, keep_alive)
+
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(webhooks, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+    server = await asyncio.start_server(lambda r, w: handle_connection(webhooks, r, w), host, port)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def start_server(port=0, **options):
+    """Start the receiver in a background thread and return (webhooks, base URL).
+
+    Set WEBHOOK_BASE_URL to the returned URL to redirect the scripts to it.
+    """
+    webhooks = FakeWebhooks(**options)
+    started = threading.Event()
+    address = {}
+
+    def ready(server):
+        address['port'] = server.sockets[0].getsockname()[1]
+        started.set()
+
+    threading.Thread(target=lambda: asyncio.run(serve(webhooks, port=port, ready=ready)), daemon=True).start()
+    started.wait()
+    return webhooks, f"http://127.0.0.1:{address['port']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the n8n and Make webhooks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--routes", help="JSON file with options per path prefix")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Default latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Default random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Default share of failed requests (0-1)")
+    parser.add_argument("--error-status", type=int, default=500, help="Status of failed requests (default: 500)")
+    parser.add_argument("--record", help="Append every request to this JSONL file")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and errors")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    webhooks = FakeWebhooks(
+        routes=load_routes(args.routes) if args.routes else None,
+        defaults={
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate,
+            'error_status': args.error_status,
+        },
+        record_file=args.record,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+
+    print(f"Fake webhooks running on http://{args.host}:{args.port}")
+    print(f"Use: WEBHOOK_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(webhooks, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nRequests: {webhooks.stats['requests']}, errors: {webhooks.stats['errors']}")
+        for route, stats in webhooks.stats_per_route()['routes'].items():
+            print(f"  {route}: {stats['requests']} requests, {stats['errors']} errors")
+        webhooks.close()
+
+
+if __name__ == '__main__':
+    main()
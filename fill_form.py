@@ -6,9 +6,18 @@ Voraussetzungen:
     playwright install chromium
 """
 
-from playwright.sync_api import sync_playwright, Page
+from playwright.sync_api import sync_playwright, BrowserContext, Page, Locator, Response, Route, Request
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit
+import json
+import os
+import re
+import threading
 import time
 
+import tracing
+
 # =============================================================================
 # KONFIGURATION
 # =============================================================================
@@ -17,6 +26,60 @@ FORM_URL = "https://form.foerdernetz-deutschland.de/t/jnYBFipUYnus?deal_id=rec73
 
 HEADLESS = False  # True = headless, False = sichtbar
 
+# Einfache Textfelder eines Abschnitts in einem einzigen evaluate() füllen
+# (False = jedes Feld einzeln per Playwright fill)
+BATCH_FILL = True
+
+# Einstellungen für jeden Browser-Kontext
+CONTEXT_OPTIONS = {"viewport": {"width": 1400, "height": 900}, "locale": "de-DE"}
+
+# Maximale Wartezeiten (ms). Gewartet wird auf konkrete Signale der Seite,
+# nicht auf feste Zeiten - die Werte greifen nur, wenn das Signal ausbleibt.
+IFRAME_TIMEOUT_MS = 15000        # Mitarbeiter-iframe geladen
+OPTIONS_TIMEOUT_MS = 5000        # Dropdown-/Auswahllisten geöffnet
+UPLOAD_TIMEOUT_MS = 30000        # Datei-Upload abgeschlossen
+SUBMIT_TIMEOUT_MS = 10000        # Mitarbeiter-Modal geschlossen
+CONFIRMATION_TIMEOUT_MS = 15000  # Erfolgsmeldung nach dem Absenden
+KEEP_OPEN_MS = 10000             # Sichtbarer Browser bleibt offen (bis er geschlossen wird)
+
+# Request-Blocking: nicht benötigte Ressourcen werden abgebrochen, bevor sie
+# geladen werden. ALLOW_URL_PATTERNS hat Vorrang vor den Sperrlisten.
+BLOCK_REQUESTS = True
+BLOCK_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCK_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms",
+    "segment.io", "sentry.io", "intercom.io", "fullstory.com",
+    "mixpanel.com", "posthog.com",
+    "fonts.googleapis.com", "fonts.gstatic.com",
+]
+ALLOW_URL_PATTERNS = []  # z.B. ["captcha"] - Teilstrings von URLs, die nie blockiert werden
+
+# Größen der Ressourcen aus Läufen ohne Blocking, für die Schätzung der
+# eingesparten Bytes (blockierte Requests werden ja nie geladen). Liegt
+# neben dem Script, damit jeder Aufruf dieselbe Datei liest.
+RESOURCE_SIZES_FILE = Path(__file__).parent / "resource_sizes.json"
+
+# Teilstrings (klein geschrieben) in URLs von Upload-Endpoints. Andere
+# POST/PUT-Requests zählen nur als Upload, wenn sie die Datei tragen.
+UPLOAD_URL_PATTERNS = ["upload", "attachment"]
+
+SUBFORM_IFRAME = 'iframe[title="Create record form"]'
+SUCCESS_TEXT = re.compile(r"Vielen Dank|erfolgreich|Thank you", re.IGNORECASE)
+
+# Zeiten pro Mitarbeiter zusätzlich als JSON-Zeilen in diese Datei schreiben
+# (None = nur ausgeben)
+EMPLOYEE_TIMINGS_FILE = None
+
+# Spans für jeden Schritt und jeden Helfer (siehe tracing.py): JSONL-Datei,
+# Chrome-Trace für chrome://tracing bzw. Perfetto (None = aus)
+TRACE_FILE = None
+CHROME_TRACE_FILE = None
+
+# Playwright-Trace (Screenshots, DOM-Snapshots, Netzwerk) als ZIP für
+# `playwright show-trace` (None = aus)
+PLAYWRIGHT_TRACE_FILE = None
+
 # =============================================================================
 # TESTDATEN
 # =============================================================================
@@ -114,28 +177,127 @@ TEST_DATA = {
 # HILFSFUNKTIONEN
 # =============================================================================
 
-def fill_by_aria(page: Page, aria_label: str, value: str):
+def wait_for_signal(locator: Locator, state: str = "visible", timeout: int = OPTIONS_TIMEOUT_MS) -> bool:
+    """Wartet bis der Locator den Zustand erreicht. False bei Timeout statt Exception."""
+    try:
+        locator.wait_for(state=state, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def is_upload_response(response: Response, file_name: str, file_size: int) -> bool:
+    """Erkennt die Antwort auf den Upload einer Datei.
+
+    Passt ein POST/PUT an einen Endpoint aus UPLOAD_URL_PATTERNS oder ein
+    Request, der die Datei trägt: Multipart mit ihrem Dateinamen oder ein
+    Body mit genau ihrer Größe (direkter PUT, z.B. auf eine signierte URL).
+    """
+    request = response.request
+    if request.method not in ("POST", "PUT"):
+        return False
+    url = response.url.lower()
+    if any(pattern in url for pattern in UPLOAD_URL_PATTERNS):
+        return True
+    try:
+        body = request.post_data_buffer
+    except Exception:
+        return False
+    if not body:
+        return False
+    return len(body) == file_size or f'filename="{file_name}"'.encode() in body
+
+
+@tracing.traced(attrs=("aria_label",))
+def fill_by_aria(page: Page, aria_label: str, value: str) -> bool:
     """Füllt Input per aria-label."""
     if not value:
-        return
+        return False
     try:
-        page.fill(f'input[aria-label="{aria_label}"]', value)
+        page.locator(f'input[aria-label="{aria_label}"]').fill(value)
         print(f"  [OK] {aria_label}")
+        return True
     except Exception as e:
         print(f"  [FEHLER] {aria_label}: {e}")
+        return False
 
 
-def fill_by_partial_aria(page: Page, partial: str, value: str):
+@tracing.traced(attrs=("partial",))
+def fill_by_partial_aria(page: Page, partial: str, value: str) -> bool:
     """Füllt Input per partiellem aria-label."""
     if not value:
-        return
+        return False
     try:
-        page.fill(f'input[aria-label*="{partial}"]', value)
+        page.locator(f'input[aria-label*="{partial}"]').fill(value)
         print(f"  [OK] {partial}")
+        return True
     except Exception as e:
         print(f"  [FEHLER] {partial}: {e}")
+        return False
+
+
+# Setzt die Werte über den nativen value-Setter (sonst ignoriert React die
+# Änderung) und löst input/change aus, wie beim Tippen. Liefert pro Feld
+# "ok", "not_found", "readonly" oder "rejected".
+BATCH_FILL_JS = '''(root, {fields, partial}) => {
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+    const report = {};
+    for (const [label, value] of fields) {
+        const op = partial ? "*=" : "=";
+        const input = document.querySelector(`input[aria-label${op}${JSON.stringify(label)}]`);
+        if (!input) {
+            report[label] = "not_found";
+            continue;
+        }
+        if (input.disabled || input.readOnly) {
+            report[label] = "readonly";
+            continue;
+        }
+        input.focus();
+        setter.call(input, value);
+        input.dispatchEvent(new Event("input", {bubbles: true}));
+        input.dispatchEvent(new Event("change", {bubbles: true}));
+        input.blur();
+        report[label] = input.value === value ? "ok" : "rejected";
+    }
+    return report;
+}'''
+
+
+@tracing.traced()
+def fill_fields_batch(page: Page, fields: list, partial: bool = False) -> dict:
+    """Füllt einfache Textfelder eines Abschnitts mit einem einzigen evaluate().
+
+    fields ist eine Liste von (aria_label, wert), leere Werte werden
+    übersprungen. Felder, die im Browser nicht gesetzt werden konnten,
+    werden einzeln per fill_by_aria/fill_by_partial_aria nachgefüllt.
+
+    Returns:
+        Status pro Feld: "ok", "fallback" (einzeln gefüllt) oder der Fehlerstatus
+    """
+    fields = [(label, str(value)) for label, value in fields if value]
+    fill_single = fill_by_partial_aria if partial else fill_by_aria
+
+    report = {}
+    if BATCH_FILL and fields:
+        try:
+            report = page.locator(":root").evaluate(BATCH_FILL_JS, {"fields": fields, "partial": partial})
+        except Exception as e:
+            print(f"  [WARNUNG] Batch-Füllen fehlgeschlagen, fülle einzeln: {e}")
+
+    status = {}
+    for label, value in fields:
+        if report.get(label) == "ok":
+            print(f"  [OK] {label}")
+            status[label] = "ok"
+        elif fill_single(page, label, value):
+            status[label] = "fallback"
+        else:
+            status[label] = report.get(label, "error")
+    return status
 
 
+@tracing.traced(attrs=("option_text",))
 def click_radio(page: Page, option_text: str):
     """Klickt Radio-Option (für einfache Felder wie Geschlecht)."""
     try:
@@ -149,34 +311,57 @@ def click_radio(page: Page, option_text: str):
             print(f"  [FEHLER] Radio '{option_text}': {e}")
 
 
+# Baut einmal pro Dokument (Seite oder iframe) einen Index Label -> radiogroup
+# und klickt die Antwort direkt im Browser: ein Roundtrip pro Frage statt
+# einem evaluate() pro radiogroup. Ein MutationObserver verwirft den Index,
+# sobald sich das DOM ändert (z.B. wenn eine Antwort neue Fragen einblendet).
+RADIOGROUP_CLICK_JS = '''(root, [question, answer]) => {
+    const normalize = text => (text || "").replace(/\\s+/g, " ").trim().toLowerCase();
+    let index = window.__radiogroupIndex;
+    if (!index) {
+        index = [];
+        for (const group of document.querySelectorAll('[role="radiogroup"]')) {
+            const labelId = group.getAttribute("aria-labelledby");
+            const label = labelId ? document.getElementById(labelId) : null;
+            index.push([normalize(label ? label.innerText : ""), group]);
+        }
+        window.__radiogroupIndex = index;
+        const observer = new MutationObserver(() => {
+            window.__radiogroupIndex = null;
+            observer.disconnect();
+        });
+        observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    }
+
+    const entry = index.find(([label, group]) => group.isConnected && label.includes(normalize(question)));
+    if (!entry) return "not_found";
+
+    const wanted = normalize(answer);
+    const option = [...entry[1].querySelectorAll('[role="radio"]')]
+        .find(radio => normalize(radio.innerText).includes(wanted));
+    if (!option) return "no_option";
+    option.click();
+    return "ok";
+}'''
+
+
+@tracing.traced(attrs=("question_text",))
 def click_radio_for_question(page: Page, question_text: str, answer: str):
     """Klickt Ja/Nein für eine spezifische Frage via radiogroup."""
     try:
-        # Finde die radiogroup deren Label den Fragetext enthält
-        radiogroups = page.locator('[role="radiogroup"]').all()
-        for rg in radiogroups:
-            # Hole das Label per JavaScript
-            label_text = rg.evaluate('''el => {
-                const labelId = el.getAttribute("aria-labelledby");
-                if (labelId) {
-                    const label = document.getElementById(labelId);
-                    return label ? label.innerText : "";
-                }
-                return "";
-            }''')
-
-            if question_text.lower() in label_text.lower():
-                # Gefunden! Klicke die richtige Option
-                option = rg.locator(f'[role="radio"]:has-text("{answer}")').first
-                option.click()
-                print(f"  [OK] {question_text[:40]}... -> {answer}")
-                return
-
-        print(f"  [WARNUNG] Frage '{question_text[:40]}...' nicht gefunden")
+        # page kann Page oder FrameLocator sein, :root ist das jeweilige Dokument
+        status = page.locator(":root").evaluate(RADIOGROUP_CLICK_JS, [question_text, answer])
+        if status == "ok":
+            print(f"  [OK] {question_text[:40]}... -> {answer}")
+        elif status == "no_option":
+            print(f"  [WARNUNG] Option '{answer}' für '{question_text[:40]}...' nicht gefunden")
+        else:
+            print(f"  [WARNUNG] Frage '{question_text[:40]}...' nicht gefunden")
     except Exception as e:
         print(f"  [FEHLER] {question_text[:40]}...: {e}")
 
 
+@tracing.traced(attrs=("aria_label",))
 def select_react_dropdown(page: Page, aria_label: str, option_text: str):
     """Wählt Option in React-Select Dropdown per JavaScript."""
     try:
@@ -193,22 +378,204 @@ def select_react_dropdown(page: Page, aria_label: str, option_text: str):
         print(f"  [FEHLER] Dropdown '{aria_label}': {e}")
 
 
-def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
-    """Füllt das Mitarbeiter-Subformular im iframe aus."""
-    iframe = page.frame_locator('iframe[title="Create record form"]')
-
-    def fill_text(aria_label, key):
+# Textfelder des Mitarbeiter-Subformulars: (Teil des aria-labels, Schlüssel)
+SUBFORM_TEXT_FIELDS = [
+    ("Vorname", "vorname"),
+    ("Nachname", "nachname"),
+    ("Geburtsname", "geburtsname"),
+    ("Geburtsort", "geburtsort"),
+    ("Wie lautet deine Sozialversicherung-Nr.?", "sozialversicherungsnr"),
+    ("Straße", "strasse"),
+    ("Hausnummer", "hausnummer"),
+    ("PLZ", "plz"),
+    ("Ort", "ort"),
+    ("Telefonnummer", "telefon"),
+    ("Email Adresse", "email"),
+    ("Arbeitszeit pro Woche", "arbeitszeit_woche"),
+    ("Arbeitsentgelt", "arbeitsentgelt"),
+    ("Jobtitel", "jobtitel"),
+]
+
+# Löst Teil-Labels auf das vollständige aria-label des ersten passenden Inputs auf
+RESOLVE_LABELS_JS = '''(root, partials) => {
+    const labels = {};
+    for (const partial of partials) {
+        const input = document.querySelector(`input[aria-label*=${JSON.stringify(partial)}]`);
+        labels[partial] = input ? input.getAttribute("aria-label") : null;
+    }
+    return labels;
+}'''
+
+
+class SubformSelectors:
+    """Aufgelöste aria-labels der Textfelder im Mitarbeiter-iframe.
+
+    Das iframe wird für jeden Mitarbeiter neu geladen, die Felder heißen
+    aber immer gleich. Die Teil-Labels werden deshalb einmal aufgelöst und
+    für alle weiteren Mitarbeiter wiederverwendet.
+    """
+
+    def __init__(self):
+        self.labels = {}
+
+    def pending(self) -> list:
+        return [label for label, _ in SUBFORM_TEXT_FIELDS if label not in self.labels]
+
+    def update(self, found: dict):
+        self.labels.update({partial: label for partial, label in found.items() if label})
+
+    def resolve(self, root) -> dict:
+        pending = self.pending()
+        if pending:
+            self.update(root.locator(":root").evaluate(RESOLVE_LABELS_JS, pending))
+        return self.labels
+
+    def forget(self, partial: str):
+        self.labels.pop(partial, None)
+
+
+def split_subform_texts(mitarbeiter: dict, labels: dict):
+    """Teilt die Textfelder in (exaktes Label, Wert, Teil-Label) für den Batch und (Teil-Label, Wert) ohne Auflösung."""
+    batch, single = [], []
+    for partial, key in SUBFORM_TEXT_FIELDS:
         value = mitarbeiter.get(key, "")
-        if value:
+        if not value:
+            continue
+        if labels.get(partial):
+            batch.append((labels[partial], value, partial))
+        else:
+            single.append((partial, value))
+    return batch, single
+
+
+@tracing.traced(attrs=("aria_label",))
+def fill_subform_text(iframe, aria_label: str, value: str):
+    """Füllt ein Textfeld im iframe per (Teil-)aria-label, einzeln über Playwright."""
+    try:
+        el = iframe.locator(f'[aria-label="{aria_label}"], [aria-label*="{aria_label}"]').first
+        el.scroll_into_view_if_needed(timeout=5000)
+        el.fill(value)
+        print(f"    [OK] {aria_label}")
+    except Exception as e:
+        print(f"    [FEHLER] {aria_label}: {e}")
+
+
+@tracing.traced()
+def fill_subform_texts(iframe, mitarbeiter: dict, selectors: SubformSelectors):
+    """Füllt alle Textfelder des Subformulars: aufgelöste Felder in einem evaluate(), der Rest einzeln."""
+    batch, single = split_subform_texts(mitarbeiter, selectors.resolve(iframe))
+    status = fill_fields_batch(iframe, [(label, value) for label, value, _ in batch])
+    for label, value, partial in batch:
+        if status.get(label) not in ("ok", "fallback"):
+            # Aufgelöstes Label passt nicht (mehr): beim nächsten Mal neu suchen
+            selectors.forget(partial)
+            single.append((partial, value))
+    for partial, value in single:
+        fill_subform_text(iframe, partial, value)
+
+
+class PendingUpload:
+    """Datei-Upload im iframe, der läuft, während die übrigen Felder gefüllt werden.
+
+    Die Antwort des Uploads wird per Listener erkannt. Erst vor dem
+    Einreichen wird mit wait() darauf gewartet, falls sie noch aussteht.
+    """
+
+    def __init__(self, page: Page, iframe, path: str):
+        self.page = page
+        self.path = path
+        self.done = not path
+        if path:
+            page.on("response", self._on_response)
             try:
-                # Scroll element into view with timeout
-                el = iframe.locator(f'[aria-label="{aria_label}"], [aria-label*="{aria_label}"]').first
-                el.scroll_into_view_if_needed(timeout=5000)
-                el.fill(value)
-                print(f"    [OK] {aria_label}")
+                self.file_name, self.file_size = os.path.basename(path), os.path.getsize(path)
+                iframe.locator('input[type="file"]').first.set_input_files(path)
+                print(f"    [INFO] Datei-Upload gestartet: {path}")
             except Exception as e:
-                print(f"    [FEHLER] {aria_label}: {e}")
+                print(f"    [FEHLER] Datei-Upload: {e}")
+                self._stop()
+                self.done = True
+                self.path = ""
+
+    def _is_upload(self, response: Response) -> bool:
+        return is_upload_response(response, self.file_name, self.file_size)
+
+    def _on_response(self, response: Response):
+        if self._is_upload(response):
+            self.done = True
+
+    def _stop(self):
+        self.page.remove_listener("response", self._on_response)
+
+    def wait(self, timeout: int = UPLOAD_TIMEOUT_MS):
+        if not self.path:
+            return
+        # Events kommen nur während Playwright-Aufrufen an, zwischen Prüfung
+        # und wait_for_event kann die Antwort also nicht verloren gehen
+        if not self.done:
+            try:
+                self.page.wait_for_event("response", predicate=self._is_upload, timeout=timeout)
+            except Exception:
+                print(f"    [WARNUNG] Upload-Antwort nicht erkannt, warte auf Netzwerk-Ruhe")
+                self.page.wait_for_load_state("networkidle")
+        self._stop()
+        print(f"    [OK] Datei hochgeladen: {self.path}")
+
+
+class PhaseTimer:
+    """Misst die Dauer benannter Abschnitte, z.B. für die Zeiten pro Mitarbeiter."""
+
+    def __init__(self):
+        self.phases = {}
+        self.started = time.monotonic()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.monotonic()
+        try:
+            with tracing.span(name):
+                yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.monotonic() - started
+
+    def total(self) -> float:
+        return time.monotonic() - self.started
+
+
+_timings_lock = threading.Lock()
+
 
+def report_employee_timing(index: int, mitarbeiter: dict, timer: PhaseTimer):
+    """Gibt die Zeiten eines Mitarbeiters sofort aus (und schreibt sie nach EMPLOYEE_TIMINGS_FILE)."""
+    total = timer.total()
+    phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in timer.phases.items())
+    print(f"  [ZEIT] Mitarbeiter {index}: {total:.1f}s ({phases})")
+
+    if EMPLOYEE_TIMINGS_FILE:
+        entry = {
+            "mitarbeiter": index,
+            "email": mitarbeiter.get("email"),
+            "total_s": round(total, 2),
+            **{f"{name}_s": round(seconds, 2) for name, seconds in timer.phases.items()},
+        }
+        with _timings_lock, open(EMPLOYEE_TIMINGS_FILE, "a") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+@tracing.traced()
+def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict, selectors: SubformSelectors = None,
+                             timer: PhaseTimer = None):
+    """Füllt das Mitarbeiter-Subformular im iframe aus.
+
+    Der Upload des Arbeitsvertrags startet zuerst und läuft, während die
+    übrigen Felder gefüllt werden. `selectors` wird über alle Mitarbeiter
+    einer Einreichung geteilt, `timer` sammelt die Zeiten pro Abschnitt.
+    """
+    iframe = page.frame_locator(SUBFORM_IFRAME)
+    selectors = selectors or SubformSelectors()
+    timer = timer or PhaseTimer()
+
+    @tracing.traced(attrs=("aria_label",))
     def fill_date(aria_label, key):
         value = mitarbeiter.get(key, "")
         if value:
@@ -227,6 +594,7 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
             except Exception as e:
                 print(f"    [FEHLER] {aria_label}: {e}")
 
+    @tracing.traced(attrs=("aria_label",))
     def fill_dropdown(aria_label, key):
         """Füllt ein React-Select Dropdown im iframe robust aus (unterstützt Multi-Select)."""
         value = mitarbeiter.get(key, "")
@@ -242,15 +610,15 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
                 for opt in options:
                     # Klick, um Fokus zu setzen und Dropdown zu öffnen
                     input_el.click()
-                    page.wait_for_timeout(500)
-                    
+                    wait_for_signal(iframe.locator('[role="listbox"], [role="option"]').first)
+
                     # Tippe den Wert Buchstabe für Buchstabe
                     page.keyboard.type(opt, delay=50)
-                    page.wait_for_timeout(500)
-                    
+                    # Warte bis die gefilterte Option in der Liste steht
+                    wait_for_signal(iframe.locator('[role="option"]').filter(has_text=opt).first)
+
                     # Mit Enter bestätigen
                     page.keyboard.press("Enter")
-                    page.wait_for_timeout(300)
                 
                 # Schließe das Dropdown (besonders wichtig bei Multi-Select)
                 page.keyboard.press("Escape")
@@ -258,6 +626,7 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
             except Exception as e:
                 print(f"    [FEHLER] Dropdown {aria_label}: {e}")
 
+    @tracing.traced(attrs=("text",))
     def click_radio(text):
         try:
             rb = iframe.locator(f'[role="radio"]:has-text("{text}")').first
@@ -267,6 +636,7 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
         except Exception:
             pass
 
+    @tracing.traced(attrs=("label_text",))
     def select_airtable_option(label_text, value):
         """Spezialisierte Logik für Felder mit '+ Hinzufügen' Button (Airtable-Anbindung)."""
         if not value:
@@ -286,12 +656,12 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
             search_input = iframe.locator('input[placeholder*="Search"]').first
             search_input.wait_for(state="visible", timeout=5000)
             search_input.fill(value)
-            page.wait_for_timeout(1000)
-            
+
             # Klicke das Ergebnis (suche nach dem Textteil, um robust zu sein)
             print(f"    [INFO] Klicke Ergebnis für: {value}")
             result = iframe.locator(f'div:has-text("{value}")').last
-            
+            wait_for_signal(result)
+
             result.scroll_into_view_if_needed()
             result.click()
             print(f"    [OK] Airtable Selection: {label_text} -> {value}")
@@ -304,6 +674,7 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
             except:
                 pass
 
+    @tracing.traced(attrs=("label_text",))
     def select_plus_date(label_text, key):
         """Spezialisierte Logik für Datumsfelder mit '+ Startdatum hinzufügen'."""
         value = mitarbeiter.get(key, "")
@@ -318,7 +689,7 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
                 add_button.click()
 
             # Warte bis die Liste mit Daten geladen ist
-            page.wait_for_timeout(2000)
+            wait_for_signal(iframe.locator('[role="option"], [role="listitem"], .sc-c43922eb-0').first)
 
             # Erstelle verschiedene Datums-Formate zum Suchen
             # Input: "01.03.2026" -> suche nach "1.3.", "01.03.", "1.3.2026", etc.
@@ -361,286 +732,499 @@ def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict):
         except Exception as e:
             print(f"    [FEHLER] Startdatum: {e}")
 
-    # Geschlecht & Familienstand
-    click_radio(mitarbeiter.get("geschlecht", "Herr"))
-    click_radio(mitarbeiter.get("familienstand", "ledig"))
+    # Arbeitsvertrag zuerst: der Upload läuft, während die übrigen Felder gefüllt werden
+    with timer.phase("upload_start"):
+        upload = PendingUpload(page, iframe, mitarbeiter.get("arbeitsvertrag_pfad", ""))
 
-    def upload_file(aria_label, key):
-        """Lädt eine Datei im iframe hoch."""
-        path = mitarbeiter.get(key, "")
-        if path:
-            try:
-                # Suche nach dem Datei-Input. Airtable/React-Formulare nutzen oft ein verstecktes Input.
-                # Wir suchen nach einem Input vom Typ File.
-                file_input = iframe.locator('input[type="file"]').first
-                file_input.set_input_files(path)
-                print(f"    [OK] Datei hochgeladen: {aria_label}")
-            except Exception as e:
-                print(f"    [FEHLER] Datei-Upload {aria_label}: {e}")
-
-    # Textfelder
-    fill_text("Vorname", "vorname")
-    fill_text("Nachname", "nachname")
-    fill_text("Geburtsname", "geburtsname")
-    fill_text("Geburtsort", "geburtsort")
-    fill_text("Wie lautet deine Sozialversicherung-Nr.?", "sozialversicherungsnr")
-    fill_text("Straße", "strasse")
-    fill_text("Hausnummer", "hausnummer")
-    fill_text("PLZ", "plz")
-    fill_text("Ort", "ort")
-    fill_text("Telefonnummer", "telefon")
-    fill_text("Email Adresse", "email")
-    fill_text("Arbeitszeit pro Woche", "arbeitszeit_woche")
-    fill_text("Arbeitsentgelt", "arbeitsentgelt")
-    fill_text("Jobtitel", "jobtitel")
-
-    # Textareas
-    try:
-        taetigkeit = mitarbeiter.get("taetigkeitsbeschreibung", "")
-        if taetigkeit:
-            ta = iframe.locator('textarea[aria-label*="Beschreibe, welche Tätigkeit"]').first
-            ta.scroll_into_view_if_needed()
-            ta.fill(taetigkeit)
-            print("    [OK] Tätigkeitsbeschreibung")
-    except Exception as e:
-        print(f"    [FEHLER] Tätigkeitsbeschreibung: {e}")
-
-    # Dropdown-Felder (React-Select / Combobox)
-    fill_dropdown("Nationalität", "nationalitaet")
-    fill_dropdown("Arbeitstage", "arbeitstage")
-    fill_dropdown("Arbeitszeit 1 von", "arbeitszeit_1_von")
-    fill_dropdown("Arbeitszeit 1 bis", "arbeitszeit_1_bis")
-    fill_dropdown("Arbeitszeit 2 von", "arbeitszeit_2_von")
-    fill_dropdown("Arbeitszeit 2 bis", "arbeitszeit_2_bis")
-    
-    # Airtable & Spezielle Buttons
-    select_airtable_option("Welche Weiterbildung wird der Mitarbeiter besuchen?", mitarbeiter.get("weiterbildung"))
-
-    # Datumsfelder
-    fill_date("Geburtsdatum", "geburtsdatum")
-    fill_date("Beginn des Beschäftigungsverhältnisses (TT.MM.JJJJ)", "beschaeftigung_beginn")
-    select_plus_date("Zu welchem Datum soll der Mitarbeiter in die Förderung gehen?", "foerderung_start")
-
-    # Radio-Buttons (Allgemein)
-    click_radio(mitarbeiter.get("gehaltsform", "Monatsgehalt"))
-    click_radio(mitarbeiter.get("verguetung_ist", "ortsüblich"))
-    click_radio(mitarbeiter.get("kurzarbeitergeld", "Nein"))
-    
-    # Neue Radio-Fragen
-    click_radio_for_question(iframe, "mehr als 4 Jahre", mitarbeiter.get("mehr_als_4_jahre", "Nein"))
-    
-    # Befristete Verhältnisse (Nein aus Screenshot)
-    click_radio_for_question(iframe, "Befristetes Arbeitsverhältnis", mitarbeiter.get("befristet", "Nein"))
-    click_radio_for_question(iframe, "Befristete Arbeitserlaubnis", mitarbeiter.get("befristete_arbeitserlaubnis", "Nein"))
-
-    # Ausbildung
-    click_radio_for_question(iframe, "Abgeschlossene Ausbildung", mitarbeiter.get("ausbildung_vorhanden", "Ja"))
-    if mitarbeiter.get("ausbildung_vorhanden") == "Ja":
-        page.wait_for_timeout(1000) # Warten bis Feld erscheint
-        fill_dropdown("Ausbildung / Studium", "ausbildung")
-        
-    click_radio_for_question(iframe, "Übernahme der Weiterbildungskosten", mitarbeiter.get("kostenuebernahme_dritter", "Nein"))
-    click_radio_for_question(iframe, "fortbestehen", mitarbeiter.get("fortbestand_arbeitsverhaeltnis", "Ja"))
-    click_radio_for_question(iframe, "freigestellt", mitarbeiter.get("freistellung_bescheinigt", "Ja"))
-    click_radio_for_question(iframe, "Bedarfsgemeinschaft", mitarbeiter.get("bedarfsgemeinschaft", "Nein"))
-    click_radio_for_question(iframe, "Bildungsgutschein", mitarbeiter.get("bildungsgutschein", "Nein"))
-    click_radio_for_question(iframe, "Eingliederungszuschuss", mitarbeiter.get("eingliederungszuschuss", "Nein"))
-
-    # Datei hochladen (Arbeitsvertrag)
-    upload_file("Aktueller Arbeitsvertrag", "arbeitsvertrag_pfad")
-
-    # Warte bis der Upload abgeschlossen ist
-    print("    [INFO] Warte auf Datei-Upload...")
-    page.wait_for_timeout(5000)
-
-    # Checkboxen
-    if mitarbeiter.get("schwerbehinderung") == "Ja":
+    with timer.phase("text"):
+        # Geschlecht & Familienstand
+        click_radio(mitarbeiter.get("geschlecht", "Herr"))
+        click_radio(mitarbeiter.get("familienstand", "ledig"))
+
+        # Textfelder (aufgelöste Labels aus dem Cache, ein evaluate für alle)
+        fill_subform_texts(iframe, mitarbeiter, selectors)
+
+        # Textareas
         try:
-            cb = iframe.locator('button[role="checkbox"]').first
-            cb.scroll_into_view_if_needed()
-            cb.click()
-            print("    [OK] Schwerbehinderung")
-        except Exception:
-            pass
+            taetigkeit = mitarbeiter.get("taetigkeitsbeschreibung", "")
+            if taetigkeit:
+                ta = iframe.locator('textarea[aria-label*="Beschreibe, welche Tätigkeit"]').first
+                ta.scroll_into_view_if_needed()
+                ta.fill(taetigkeit)
+                print("    [OK] Tätigkeitsbeschreibung")
+        except Exception as e:
+            print(f"    [FEHLER] Tätigkeitsbeschreibung: {e}")
+
+    with timer.phase("dropdowns"):
+        # Dropdown-Felder (React-Select / Combobox)
+        fill_dropdown("Nationalität", "nationalitaet")
+        fill_dropdown("Arbeitstage", "arbeitstage")
+        fill_dropdown("Arbeitszeit 1 von", "arbeitszeit_1_von")
+        fill_dropdown("Arbeitszeit 1 bis", "arbeitszeit_1_bis")
+        fill_dropdown("Arbeitszeit 2 von", "arbeitszeit_2_von")
+        fill_dropdown("Arbeitszeit 2 bis", "arbeitszeit_2_bis")
+
+        # Airtable & Spezielle Buttons
+        select_airtable_option("Welche Weiterbildung wird der Mitarbeiter besuchen?", mitarbeiter.get("weiterbildung"))
+
+    with timer.phase("dates"):
+        fill_date("Geburtsdatum", "geburtsdatum")
+        fill_date("Beginn des Beschäftigungsverhältnisses (TT.MM.JJJJ)", "beschaeftigung_beginn")
+        select_plus_date("Zu welchem Datum soll der Mitarbeiter in die Förderung gehen?", "foerderung_start")
+
+    with timer.phase("radios"):
+        # Radio-Buttons (Allgemein)
+        click_radio(mitarbeiter.get("gehaltsform", "Monatsgehalt"))
+        click_radio(mitarbeiter.get("verguetung_ist", "ortsüblich"))
+        click_radio(mitarbeiter.get("kurzarbeitergeld", "Nein"))
+
+        # Neue Radio-Fragen
+        click_radio_for_question(iframe, "mehr als 4 Jahre", mitarbeiter.get("mehr_als_4_jahre", "Nein"))
+
+        # Befristete Verhältnisse (Nein aus Screenshot)
+        click_radio_for_question(iframe, "Befristetes Arbeitsverhältnis", mitarbeiter.get("befristet", "Nein"))
+        click_radio_for_question(iframe, "Befristete Arbeitserlaubnis", mitarbeiter.get("befristete_arbeitserlaubnis", "Nein"))
+
+        # Ausbildung
+        click_radio_for_question(iframe, "Abgeschlossene Ausbildung", mitarbeiter.get("ausbildung_vorhanden", "Ja"))
+        if mitarbeiter.get("ausbildung_vorhanden") == "Ja":
+            # Warten bis Feld erscheint
+            wait_for_signal(iframe.locator('input[aria-label*="Ausbildung / Studium"]').first)
+            fill_dropdown("Ausbildung / Studium", "ausbildung")
+
+        click_radio_for_question(iframe, "Übernahme der Weiterbildungskosten", mitarbeiter.get("kostenuebernahme_dritter", "Nein"))
+        click_radio_for_question(iframe, "fortbestehen", mitarbeiter.get("fortbestand_arbeitsverhaeltnis", "Ja"))
+        click_radio_for_question(iframe, "freigestellt", mitarbeiter.get("freistellung_bescheinigt", "Ja"))
+        click_radio_for_question(iframe, "Bedarfsgemeinschaft", mitarbeiter.get("bedarfsgemeinschaft", "Nein"))
+        click_radio_for_question(iframe, "Bildungsgutschein", mitarbeiter.get("bildungsgutschein", "Nein"))
+        click_radio_for_question(iframe, "Eingliederungszuschuss", mitarbeiter.get("eingliederungszuschuss", "Nein"))
+
+        # Checkboxen
+        if mitarbeiter.get("schwerbehinderung") == "Ja":
+            try:
+                cb = iframe.locator('button[role="checkbox"]').first
+                cb.scroll_into_view_if_needed()
+                cb.click()
+                print("    [OK] Schwerbehinderung")
+            except Exception:
+                pass
+
+    # Vor dem Einreichen muss der Upload abgeschlossen sein
+    with timer.phase("upload_wait"):
+        upload.wait()
 
     # Einreichen (mit Retry falls Upload noch nicht fertig war)
-    try:
-        btn = iframe.locator('button:has-text("Einreichen")').first
-        btn.scroll_into_view_if_needed()
-        btn.click()
-        print(f"    [INFO] Erster Klick auf Einreichen...")
-        page.wait_for_timeout(3000)
-
-        # Prüfe ob das Modal noch da ist (z.B. wegen Upload-Fehler)
-        # Falls ja, nochmal klicken
-        if iframe.locator('button:has-text("Einreichen")').count() > 0:
-            print(f"    [INFO] Modal noch offen, versuche erneut...")
+    with timer.phase("submit"):
+        try:
             btn = iframe.locator('button:has-text("Einreichen")').first
+            btn.scroll_into_view_if_needed()
             btn.click()
-            page.wait_for_timeout(2000)
+            print(f"    [INFO] Erster Klick auf Einreichen...")
+
+            # Das Modal schließt sich nach erfolgreichem Einreichen (iframe wird entfernt)
+            closed = wait_for_signal(page.locator(SUBFORM_IFRAME), "detached", SUBMIT_TIMEOUT_MS)
+
+            # Modal noch da (z.B. wegen Upload-Fehler): nochmal klicken
+            if not closed and iframe.locator('button:has-text("Einreichen")').count() > 0:
+                print(f"    [INFO] Modal noch offen, versuche erneut...")
+                iframe.locator('button:has-text("Einreichen")').first.click()
+                closed = wait_for_signal(page.locator(SUBFORM_IFRAME), "detached", SUBMIT_TIMEOUT_MS)
+
+            print(f"    [OK] Mitarbeiter eingereicht")
+            if not closed:
+                page.keyboard.press("Escape")
+                wait_for_signal(page.locator(SUBFORM_IFRAME), "hidden")
+        except Exception as e:
+            print(f"    [FEHLER] Einreichen: {e}")
 
-        print(f"    [OK] Mitarbeiter eingereicht")
+
+# =============================================================================
+# REQUEST-BLOCKING
+# =============================================================================
+
+class RequestBlocker:
+    """Bricht nicht benötigte Requests ab und zählt, was dadurch gespart wird.
+
+    Eine Instanz kann an beliebig viele Kontexte gehängt werden (auch aus
+    mehreren Threads), die Zahlen gelten dann für den ganzen Lauf. Ist das
+    Blocking aus, werden stattdessen die Größen aller geladenen Ressourcen
+    in RESOURCE_SIZES_FILE gemerkt.
+    """
+
+    def __init__(self, enabled: bool = BLOCK_REQUESTS, sizes_file: Path = RESOURCE_SIZES_FILE):
+        self.enabled = enabled
+        self.sizes_file = sizes_file
+        self.sizes = {}
+        if os.path.exists(sizes_file):
+            with open(sizes_file, "r") as f:
+                self.sizes = json.load(f)
+        self.blocked = {}   # resource_type -> [anzahl, bytes]
+        self.allowed = 0
+        self.unknown_size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def size_key(url: str) -> str:
+        # Query-Strings (Cache-Buster) ignorieren
+        return url.split("?", 1)[0]
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        if any(pattern in url for pattern in ALLOW_URL_PATTERNS):
+            return False
+        if resource_type in BLOCK_RESOURCE_TYPES:
+            return True
+        host = urlsplit(url).hostname or ""
+        return any(host == domain or host.endswith("." + domain) for domain in BLOCK_DOMAINS)
+
+    def count(self, request: Request) -> bool:
+        """Entscheidet über einen Request und zählt ihn. True = abbrechen."""
+        block = self.should_block(request.url, request.resource_type)
+        with self._lock:
+            if not block:
+                self.allowed += 1
+                return False
+            entry = self.blocked.setdefault(request.resource_type, [0, 0])
+            entry[0] += 1
+            size = self.sizes.get(self.size_key(request.url))
+            if size is None:
+                self.unknown_size += 1
+            else:
+                entry[1] += size
+        return True
+
+    def handle_route(self, route: Route):
+        if self.count(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    def record_size(self, request: Request):
         try:
-            page.wait_for_selector('iframe[title="Create record form"]', state="hidden", timeout=5000)
+            size = request.sizes()["responseBodySize"]
         except Exception:
-            page.keyboard.press("Escape")
-            page.wait_for_timeout(1000)
+            return
+        with self._lock:
+            self.sizes[self.size_key(request.url)] = size
+
+    def attach(self, context: BrowserContext):
+        """Hängt das Blocking (bzw. die Größenmessung) an einen Kontext."""
+        if self.enabled:
+            context.route("**/*", self.handle_route)
+        else:
+            context.on("requestfinished", self.record_size)
+
+    def save_sizes(self):
+        if self.enabled:
+            return
+        with self._lock, open(self.sizes_file, "w") as f:
+            json.dump(self.sizes, f)
+
+    def print_report(self):
+        print()
+        if not self.enabled:
+            self.save_sizes()
+            print(f"Request-Blocking aus: {len(self.sizes)} Ressourcengrößen in {self.sizes_file} gespeichert")
+            return
+
+        total = sum(count for count, _ in self.blocked.values())
+        saved = sum(size for _, size in self.blocked.values())
+        print(f"Blockierte Requests: {total} (durchgelassen: {self.allowed})")
+        for resource_type, (count, size) in sorted(self.blocked.items()):
+            print(f"  {resource_type:<12} {count:>5} Requests  {size / 1024:>8.0f} KB")
+        print(f"Eingespart (geschätzt): {saved / 1024:.0f} KB")
+        if self.unknown_size:
+            print(f"  {self.unknown_size} Requests ohne bekannte Größe - einmal mit BLOCK_REQUESTS = False "
+                  f"laufen lassen, um {self.sizes_file} zu füllen")
+
+
+# =============================================================================
+# PLAYWRIGHT-TRACE
+# =============================================================================
+
+def start_playwright_trace(context: BrowserContext):
+    if PLAYWRIGHT_TRACE_FILE:
+        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+
+
+def stop_playwright_trace(context: BrowserContext, index: int = None):
+    """Speichert den Playwright-Trace (bei mehreren Szenarien mit Index im Dateinamen)."""
+    if not PLAYWRIGHT_TRACE_FILE:
+        return
+    path = PLAYWRIGHT_TRACE_FILE
+    if index is not None:
+        root, ext = os.path.splitext(path)
+        path = f"{root}_{index}{ext}"
+    try:
+        context.tracing.stop(path=path)
+        print(f"[INFO] Playwright-Trace: {path} (ansehen mit: playwright show-trace {path})")
     except Exception as e:
-        print(f"    [FEHLER] Einreichen: {e}")
+        print(f"[FEHLER] Playwright-Trace: {e}")
 
 
 # =============================================================================
 # HAUPTFUNKTION
 # =============================================================================
 
-def fill_form():
+@tracing.traced()
+def fill_form_page(page: Page, data: dict, form_url: str = FORM_URL) -> bool:
+    """Füllt das Formular auf einer offenen Seite aus und sendet es ab.
+
+    Returns:
+        True wenn nach dem Absenden eine Erfolgsmeldung gefunden wurde
+    """
+    steps = tracing.Steps()
+
+    # Formular laden
+    print("[1/10] Lade Formular...")
+    steps.next("1/10 Lade Formular")
+    page.goto(form_url)
+    page.wait_for_load_state("networkidle")
+
+    # Start klicken
+    print("[2/10] Starte Formular...")
+    steps.next("2/10 Starte Formular")
+    page.click('button:has-text("Start")')
+    page.wait_for_load_state("networkidle")
+
+    # Persönliche Daten
+    print("[3/10] Persönliche Daten...")
+    steps.next("3/10 Persönliche Daten")
+    click_radio(page, data["geschlecht"])
+    fill_fields_batch(page, [
+        ("Vorname Ansprechpartner", data["vorname"]),
+        ("Nachname", data["nachname"]),
+        ("Telefonnummer", data["telefon"]),
+        ("Email-Adresse", data["email"]),
+    ])
+
+    # Geburtsdatum (readonly DatePicker - per Klick + Keyboard)
+    if data.get("geburtsdatum"):
+        try:
+            parts = data["geburtsdatum"].split(".")
+            if len(parts) == 3:
+                us_date = f"{parts[1]}/{parts[0]}/{parts[2]}"
+                date_input = page.locator('input[aria-label="Geburtsdatum"]')
+                date_input.click()
+                page.keyboard.type(us_date)
+                page.keyboard.press("Escape")
+                print(f"  [OK] Geburtsdatum")
+        except Exception as e:
+            print(f"  [FEHLER] Geburtsdatum: {e}")
+
+    # Unternehmensdaten
+    print("[4/10] Unternehmensdaten...")
+    steps.next("4/10 Unternehmensdaten")
+    fill_fields_batch(page, [
+        ("Name des Unternehmens", data["firma"]),
+        ("Straße", data["strasse"]),
+        ("Hausnummer", data["hausnummer"]),
+        ("PLZ", data["plz"]),
+        ("Ort", data["ort"]),
+    ])
+    select_react_dropdown(page, "Unternehmensbranche", data["branche"])
+    select_react_dropdown(page, "Bundesland", data["bundesland"])
+    select_react_dropdown(page, "Rechtsform", data["rechtsform"])
+
+    # Mitarbeiterzahlen
+    print("[5/10] Mitarbeiterzahlen...")
+    steps.next("5/10 Mitarbeiterzahlen")
+    fill_fields_batch(page, [
+        ("10 Stunden pro Woche", data["mitarbeiter_unter_10h"]),
+        ("10-20 Stunden", data["mitarbeiter_10_20h"]),
+        ("20-30 Stunden", data["mitarbeiter_20_30h"]),
+        ("mehr als 30 Stunden", data["mitarbeiter_ueber_30h"]),
+    ], partial=True)
+
+    # Betriebsdaten
+    print("[6/10] Betriebsdaten...")
+    steps.next("6/10 Betriebsdaten")
+    click_radio_for_question(page, "Betriebsnummer vorhanden", data["betriebsnummer_vorhanden"])
+    if data["betriebsnummer_vorhanden"] == "Ja":
+        page.wait_for_selector('input[aria-label*="Betriebsnummer"]', timeout=3000)
+        fill_by_partial_aria(page, "Betriebsnummer", data["betriebsnummer"])
+
+    click_radio_for_question(page, "E-Service Zugang", data["eservice_zugang"])
+    click_radio_for_question(page, "Betriebsvereinbarung", data["betriebsvereinbarung"])
+
+    # Bankdaten
+    print("[7/10] Bankdaten...")
+    steps.next("7/10 Bankdaten")
+    fill_fields_batch(page, [
+        ("IBAN", data["iban"]),
+        ("BIC", data["bic"]),
+        ("Kreditinstitut", data["bank_name"]),
+    ], partial=True)
+
+    # Mitarbeiter-Subformular
+    print("[8/10] Mitarbeiter anlegen...")
+    steps.next("8/10 Mitarbeiter anlegen")
+    if data.get("mitarbeiter"):
+        # Aufgelöste Feld-Labels gelten für alle Mitarbeiter dieser Einreichung
+        selectors = SubformSelectors()
+        for i, mitarbeiter in enumerate(data["mitarbeiter"]):
+            print(f"  Mitarbeiter {i+1}:")
+            timer = PhaseTimer()
+            with tracing.span("mitarbeiter", index=i + 1):
+                with timer.phase("iframe"):
+                    # Scroll und klicke "Mitarbeiter anlegen"
+                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    page.click('button:has-text("Mitarbeiter anlegen")')
+
+                    # Warte bis das iframe eingehängt ist und sein Formular angezeigt wird
+                    page.wait_for_selector(SUBFORM_IFRAME, state="attached", timeout=IFRAME_TIMEOUT_MS)
+                    wait_for_signal(
+                        page.frame_locator(SUBFORM_IFRAME).locator("input, textarea").first,
+                        timeout=IFRAME_TIMEOUT_MS
+                    )
+
+                # Fülle das Subformular
+                fill_mitarbeiter_subform(page, mitarbeiter, selectors, timer)
+
+                # Stelle sicher, dass das Modal geschlossen ist
+                with timer.phase("close"):
+                    if not wait_for_signal(page.locator('[role="dialog"]').first, "hidden", SUBMIT_TIMEOUT_MS):
+                        page.keyboard.press("Escape")
+                        wait_for_signal(page.locator('[role="dialog"]').first, "hidden")
+
+            report_employee_timing(i + 1, mitarbeiter, timer)
+
+    # AGB (ist ein Button mit role="checkbox", kein normales Input)
+    print("[9/10] AGB...")
+    steps.next("9/10 AGB")
+    if data.get("agb_akzeptiert"):
+        try:
+            # Scroll zum AGB-Bereich
+            page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            # AGB-Checkbox ist ein Button mit role="checkbox"
+            agb_checkbox = page.locator('button[role="checkbox"]').first
+            agb_checkbox.click()
+            print("  [OK] AGB akzeptiert")
+        except Exception as e:
+            print(f"  [FEHLER] AGB: {e}")
+
+    # Scroll nach unten zum Absenden-Button
+    print("[10/10] Absenden...")
+    steps.next("10/10 Absenden")
+    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+    absenden_btn = page.locator('button:has-text("Absenden")').first
+    if wait_for_signal(absenden_btn):
+        absenden_btn.scroll_into_view_if_needed()
+        absenden_btn.click()
+        print("  [INFO] Klick auf Absenden...")
+    else:
+        print("  [FEHLER] Absenden-Button nicht gefunden!")
+
+    # Warte auf Bestätigung (bis die Erfolgsmeldung erscheint)
+    print("  [INFO] Warte auf Bestätigung...")
+    if wait_for_signal(page.get_by_text(SUCCESS_TEXT).first, timeout=CONFIRMATION_TIMEOUT_MS):
+        print("  [OK] Erfolgsmeldung gefunden!")
+        return True
+
+    print("  [WARNUNG] Keine Erfolgsmeldung gefunden. Prüfe manuell.")
+    return False
+
+
+def fill_form(data: dict = TEST_DATA):
     print("=" * 50)
     print("FORMULAR-AUSFÜLLER")
     print("=" * 50)
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=HEADLESS)
-        context = browser.new_context(viewport={"width": 1400, "height": 900}, locale="de-DE")
+        context = browser.new_context(**CONTEXT_OPTIONS)
+        blocker = RequestBlocker()
+        blocker.attach(context)
+        start_playwright_trace(context)
         page = context.new_page()
 
-        # Formular laden
-        print("[1/10] Lade Formular...")
-        page.goto(FORM_URL)
-        page.wait_for_load_state("networkidle")
-
-        # Start klicken
-        print("[2/10] Starte Formular...")
-        page.click('button:has-text("Start")')
-        page.wait_for_load_state("networkidle")
-
-        # Persönliche Daten
-        print("[3/10] Persönliche Daten...")
-        click_radio(page, TEST_DATA["geschlecht"])
-        fill_by_aria(page, "Vorname Ansprechpartner", TEST_DATA["vorname"])
-        fill_by_aria(page, "Nachname", TEST_DATA["nachname"])
-        fill_by_aria(page, "Telefonnummer", TEST_DATA["telefon"])
-        fill_by_aria(page, "Email-Adresse", TEST_DATA["email"])
-
-        # Geburtsdatum (readonly DatePicker - per Klick + Keyboard)
-        if TEST_DATA.get("geburtsdatum"):
+        try:
+            fill_form_page(page, data)
+        finally:
+            stop_playwright_trace(context)
+        blocker.print_report()
+
+        print()
+        print("=" * 50)
+        print("FERTIG!")
+        print("=" * 50)
+
+        if not HEADLESS and KEEP_OPEN_MS:
+            # Damit man sehen kann was passiert ist - endet sofort, wenn das Fenster geschlossen wird
+            print(f"Formular wurde verarbeitet. Browser bleibt bis zu {KEEP_OPEN_MS // 1000} Sekunden offen...")
             try:
-                parts = TEST_DATA["geburtsdatum"].split(".")
-                if len(parts) == 3:
-                    us_date = f"{parts[1]}/{parts[0]}/{parts[2]}"
-                    date_input = page.locator('input[aria-label="Geburtsdatum"]')
-                    date_input.click()
-                    page.keyboard.type(us_date)
-                    page.keyboard.press("Escape")
-                    print(f"  [OK] Geburtsdatum")
-            except Exception as e:
-                print(f"  [FEHLER] Geburtsdatum: {e}")
-
-        # Unternehmensdaten
-        print("[4/10] Unternehmensdaten...")
-        fill_by_aria(page, "Name des Unternehmens", TEST_DATA["firma"])
-        select_react_dropdown(page, "Unternehmensbranche", TEST_DATA["branche"])
-        fill_by_aria(page, "Straße", TEST_DATA["strasse"])
-        fill_by_aria(page, "Hausnummer", TEST_DATA["hausnummer"])
-        fill_by_aria(page, "PLZ", TEST_DATA["plz"])
-        fill_by_aria(page, "Ort", TEST_DATA["ort"])
-        select_react_dropdown(page, "Bundesland", TEST_DATA["bundesland"])
-        select_react_dropdown(page, "Rechtsform", TEST_DATA["rechtsform"])
-
-        # Mitarbeiterzahlen
-        print("[5/10] Mitarbeiterzahlen...")
-        fill_by_partial_aria(page, "10 Stunden pro Woche", TEST_DATA["mitarbeiter_unter_10h"])
-        fill_by_partial_aria(page, "10-20 Stunden", TEST_DATA["mitarbeiter_10_20h"])
-        fill_by_partial_aria(page, "20-30 Stunden", TEST_DATA["mitarbeiter_20_30h"])
-        fill_by_partial_aria(page, "mehr als 30 Stunden", TEST_DATA["mitarbeiter_ueber_30h"])
-
-        # Betriebsdaten
-        print("[6/10] Betriebsdaten...")
-        click_radio_for_question(page, "Betriebsnummer vorhanden", TEST_DATA["betriebsnummer_vorhanden"])
-        if TEST_DATA["betriebsnummer_vorhanden"] == "Ja":
-            page.wait_for_selector('input[aria-label*="Betriebsnummer"]', timeout=3000)
-            fill_by_partial_aria(page, "Betriebsnummer", TEST_DATA["betriebsnummer"])
-
-        click_radio_for_question(page, "E-Service Zugang", TEST_DATA["eservice_zugang"])
-        click_radio_for_question(page, "Betriebsvereinbarung", TEST_DATA["betriebsvereinbarung"])
-
-        # Bankdaten
-        print("[7/10] Bankdaten...")
-        fill_by_partial_aria(page, "IBAN", TEST_DATA["iban"])
-        fill_by_partial_aria(page, "BIC", TEST_DATA["bic"])
-        fill_by_partial_aria(page, "Kreditinstitut", TEST_DATA["bank_name"])
-
-        # Mitarbeiter-Subformular
-        print("[8/10] Mitarbeiter anlegen...")
-        if TEST_DATA.get("mitarbeiter"):
-            for i, mitarbeiter in enumerate(TEST_DATA["mitarbeiter"]):
-                print(f"  Mitarbeiter {i+1}:")
-                # Scroll und klicke "Mitarbeiter anlegen"
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                page.click('button:has-text("Mitarbeiter anlegen")')
-                page.wait_for_timeout(3000)  # Warte auf iframe
+                page.wait_for_event("close", timeout=KEEP_OPEN_MS)
+            except Exception:
+                pass
 
-                # Fülle das Subformular
-                fill_mitarbeiter_subform(page, mitarbeiter)
+        browser.close()
 
-                # Warte auf Schließen des Modals
-                page.wait_for_timeout(3000)
-                # Stelle sicher, dass das Modal geschlossen ist
-                try:
-                    page.wait_for_selector('[role="dialog"]', state="hidden", timeout=5000)
-                except Exception:
-                    page.keyboard.press("Escape")
-                    page.wait_for_timeout(1000)
 
-        # AGB (ist ein Button mit role="checkbox", kein normales Input)
-        print("[9/10] AGB...")
-        if TEST_DATA.get("agb_akzeptiert"):
-            try:
-                # Scroll zum AGB-Bereich
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                # AGB-Checkbox ist ein Button mit role="checkbox"
-                agb_checkbox = page.locator('button[role="checkbox"]').first
-                agb_checkbox.click()
-                print("  [OK] AGB akzeptiert")
-            except Exception as e:
-                print(f"  [FEHLER] AGB: {e}")
-
-        # Scroll nach unten zum Absenden-Button
-        print("[10/10] Absenden...")
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(1000)
-
-        absenden_btn = page.locator('button:has-text("Absenden")').first
-        if absenden_btn.count() > 0:
-            absenden_btn.scroll_into_view_if_needed()
-            absenden_btn.click()
-            print("  [INFO] Klick auf Absenden...")
-        else:
-            print("  [FEHLER] Absenden-Button nicht gefunden!")
+def fill_scenarios(path: str, strict: bool = False):
+    """Füllt alle Szenarien einer JSONL-Datei nacheinander aus.
 
-        # Warte auf Bestätigung
-        print("  [INFO] Warte auf Bestätigung...")
-        page.wait_for_timeout(5000)
+    Die Datei wird zeilenweise gelesen (siehe scenarios.py). Der Browser
+    läuft einmal, jedes Szenario bekommt einen frischen Kontext.
+    """
+    # scenarios importiert TEST_DATA aus diesem Modul
+    from scenarios import load_scenarios
 
-        # Prüfe ob eine Erfolgsmeldung erscheint
-        page_content = page.content()
-        if "Vielen Dank" in page_content or "erfolgreich" in page_content.lower() or "Thank you" in page_content:
-            print("  [OK] Erfolgsmeldung gefunden!")
-        else:
-            print("  [WARNUNG] Keine Erfolgsmeldung gefunden. Prüfe manuell.")
-            # Warte noch länger, damit man sehen kann was passiert ist
-            page.wait_for_timeout(5000)
+    print("=" * 50)
+    print(f"FORMULAR-AUSFÜLLER (Szenarien aus {path})")
+    print("=" * 50)
 
-        print()
-        print("=" * 50)
-        print("FERTIG!")
-        print("=" * 50)
+    counts = {"ok": 0, "no_confirmation": 0, "error": 0}
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=HEADLESS)
+        blocker = RequestBlocker()
 
-        if not HEADLESS:
-            print("Formular wurde verarbeitet. Browser bleibt 10 Sekunden offen...")
-            page.wait_for_timeout(10000)
+        for index, scenario in enumerate(load_scenarios(path, strict), 1):
+            print(f"\n--- Szenario {index}: {scenario.get('scenario', scenario['firma'])} ---")
+            context = browser.new_context(**CONTEXT_OPTIONS)
+            try:
+                blocker.attach(context)
+                start_playwright_trace(context)
+                page = context.new_page()
+                with tracing.span("scenario", index=index, scenario=scenario.get("scenario")):
+                    success = fill_form_page(page, scenario, scenario.get("form_url", FORM_URL))
+                counts["ok" if success else "no_confirmation"] += 1
+            except Exception as e:
+                print(f"[FEHLER] Szenario {index}: {e}")
+                counts["error"] += 1
+            finally:
+                stop_playwright_trace(context, index)
+                context.close()
 
         browser.close()
 
+    blocker.print_report()
+    print()
+    print(f"Szenarien: {sum(counts.values())}, erfolgreich: {counts['ok']}, "
+          f"ohne Bestätigung: {counts['no_confirmation']}, Fehler: {counts['error']}")
+
 
 if __name__ == "__main__":
-    fill_form()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Füllt das Datenerfassungsformular aus.")
+    parser.add_argument("--scenarios", help="JSONL-Datei mit Szenarien (ohne: einmal TEST_DATA)")
+    parser.add_argument("--strict", action="store_true", help="Bei ungültigen Szenarien abbrechen")
+    parser.add_argument("--employee-timings", help="Zeiten pro Mitarbeiter als JSONL in diese Datei schreiben")
+    parser.add_argument("--trace", default=TRACE_FILE, help="Spans aller Schritte und Felder als JSONL schreiben")
+    parser.add_argument("--chrome-trace", default=CHROME_TRACE_FILE,
+                        help="Spans zusätzlich als Chrome-Trace (chrome://tracing, Perfetto) schreiben")
+    parser.add_argument("--playwright-trace", default=PLAYWRIGHT_TRACE_FILE,
+                        help="Playwright-Trace (ZIP) aufzeichnen, bei --scenarios eine Datei pro Szenario")
+    args = parser.parse_args()
+    EMPLOYEE_TIMINGS_FILE = args.employee_timings
+    PLAYWRIGHT_TRACE_FILE = args.playwright_trace
+
+    if args.trace or args.chrome_trace:
+        tracing.start(args.trace, args.chrome_trace)
+    try:
+        if args.scenarios:
+            fill_scenarios(args.scenarios, args.strict)
+        else:
+            fill_form()
+    finally:
+        tracing.stop()
@@ -0,0 +1,907 @@
+"""
+Async-Engine für fill_form.py: viele Formular-Sessions in einem Prozess.
+
+Verwendung:
+    python fill_form_async.py --generate 20 --concurrency 8
+    python fill_form_async.py --input einreichungen.jsonl --concurrency 8 --results ergebnisse.jsonl
+
+Gleiche Ablauf-Logik wie fill_form.py, aber auf Basis von async_playwright.
+Ein asyncio-Scheduler lässt bis zu --concurrency Sessions gleichzeitig
+laufen, jede in einem eigenen Browser-Kontext desselben Browsers. Während
+eine Session auf die Seite wartet, arbeiten die anderen weiter - das bringt
+deutlich mehr Einreichungen pro CPU-Kern als ein Prozess pro Lauf.
+
+Konfiguration, Testdaten und Wartezeiten kommen aus fill_form.py.
+
+Voraussetzungen:
+    pip install playwright
+    playwright install chromium
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+from playwright.async_api import async_playwright, BrowserContext, Page, Locator, Request, Route
+
+import fill_form
+import tracing
+from fill_form import (
+    BLOCK_REQUESTS,
+    BATCH_FILL,
+    BATCH_FILL_JS,
+    CONFIRMATION_TIMEOUT_MS,
+    CONTEXT_OPTIONS,
+    FORM_URL,
+    IFRAME_TIMEOUT_MS,
+    OPTIONS_TIMEOUT_MS,
+    PhaseTimer,
+    RequestBlocker,
+    RADIOGROUP_CLICK_JS,
+    RESOLVE_LABELS_JS,
+    SUBFORM_IFRAME,
+    SubformSelectors,
+    SUBMIT_TIMEOUT_MS,
+    SUCCESS_TEXT,
+    UPLOAD_TIMEOUT_MS,
+    is_upload_response,
+    report_employee_timing,
+    split_subform_texts,
+)
+from fill_form_parallel import RESULTS_FILE, generate_submissions, load_submissions, print_summary
+
+# =============================================================================
+# KONFIGURATION
+# =============================================================================
+
+DEFAULT_CONCURRENCY = 8
+
+# Browser-Pool: so viele Kontexte werden höchstens gleichzeitig vorgehalten,
+# und nach so vielen Einreichungen wird ein Kontext verworfen und neu erzeugt
+MAX_POOL_SIZE = 32
+DEFAULT_MAX_USES = 20
+
+# Löscht localStorage, sessionStorage und IndexedDB eines Frames
+# (Cookies löscht context.clear_cookies())
+CLEAR_STORAGE_JS = """async () => {
+    localStorage.clear();
+    sessionStorage.clear();
+    if (indexedDB.databases) {
+        for (const db of await indexedDB.databases()) indexedDB.deleteDatabase(db.name);
+    }
+}"""
+
+
+# =============================================================================
+# HILFSFUNKTIONEN
+# =============================================================================
+
+async def wait_for_signal(locator: Locator, state: str = "visible", timeout: int = OPTIONS_TIMEOUT_MS) -> bool:
+    """Wartet bis der Locator den Zustand erreicht. False bei Timeout statt Exception."""
+    try:
+        await locator.wait_for(state=state, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+@tracing.traced(attrs=("aria_label",))
+async def fill_by_aria(page: Page, aria_label: str, value: str) -> bool:
+    """Füllt Input per aria-label."""
+    if not value:
+        return False
+    try:
+        await page.locator(f'input[aria-label="{aria_label}"]').fill(value)
+        print(f"  [OK] {aria_label}")
+        return True
+    except Exception as e:
+        print(f"  [FEHLER] {aria_label}: {e}")
+        return False
+
+
+@tracing.traced(attrs=("partial",))
+async def fill_by_partial_aria(page: Page, partial: str, value: str) -> bool:
+    """Füllt Input per partiellem aria-label."""
+    if not value:
+        return False
+    try:
+        await page.locator(f'input[aria-label*="{partial}"]').fill(value)
+        print(f"  [OK] {partial}")
+        return True
+    except Exception as e:
+        print(f"  [FEHLER] {partial}: {e}")
+        return False
+
+
+@tracing.traced()
+async def fill_fields_batch(page: Page, fields: list, partial: bool = False) -> dict:
+    """Füllt einfache Textfelder eines Abschnitts mit einem einzigen evaluate().
+
+    Wie fill_form.fill_fields_batch: nicht gesetzte Felder werden einzeln
+    nachgefüllt, Rückgabe ist der Status pro Feld.
+    """
+    fields = [(label, str(value)) for label, value in fields if value]
+    fill_single = fill_by_partial_aria if partial else fill_by_aria
+
+    report = {}
+    if BATCH_FILL and fields:
+        try:
+            report = await page.locator(":root").evaluate(BATCH_FILL_JS, {"fields": fields, "partial": partial})
+        except Exception as e:
+            print(f"  [WARNUNG] Batch-Füllen fehlgeschlagen, fülle einzeln: {e}")
+
+    status = {}
+    for label, value in fields:
+        if report.get(label) == "ok":
+            print(f"  [OK] {label}")
+            status[label] = "ok"
+        elif await fill_single(page, label, value):
+            status[label] = "fallback"
+        else:
+            status[label] = report.get(label, "error")
+    return status
+
+
+@tracing.traced(attrs=("option_text",))
+async def click_radio(page: Page, option_text: str):
+    """Klickt Radio-Option (für einfache Felder wie Geschlecht)."""
+    try:
+        await page.locator(f'[role="radio"]:has-text("{option_text}"), label:has-text("{option_text}")').first.click()
+        print(f"  [OK] Radio: {option_text}")
+    except Exception:
+        try:
+            await page.locator(f'div:text-is("{option_text}"), span:text-is("{option_text}")').first.click()
+            print(f"  [OK] Radio: {option_text}")
+        except Exception as e:
+            print(f"  [FEHLER] Radio '{option_text}': {e}")
+
+
+@tracing.traced(attrs=("question_text",))
+async def click_radio_for_question(page, question_text: str, answer: str):
+    """Klickt Ja/Nein für eine spezifische Frage via radiogroup."""
+    try:
+        status = await page.locator(":root").evaluate(RADIOGROUP_CLICK_JS, [question_text, answer])
+        if status == "ok":
+            print(f"  [OK] {question_text[:40]}... -> {answer}")
+        elif status == "no_option":
+            print(f"  [WARNUNG] Option '{answer}' für '{question_text[:40]}...' nicht gefunden")
+        else:
+            print(f"  [WARNUNG] Frage '{question_text[:40]}...' nicht gefunden")
+    except Exception as e:
+        print(f"  [FEHLER] {question_text[:40]}...: {e}")
+
+
+@tracing.traced(attrs=("aria_label",))
+async def select_react_dropdown(page: Page, aria_label: str, option_text: str):
+    """Wählt Option in React-Select Dropdown."""
+    try:
+        input_selector = f'input[aria-label="{aria_label}"]'
+        await page.click(input_selector)
+
+        # Tippe die Option und drücke Enter
+        await page.fill(input_selector, option_text)
+        await page.keyboard.press("ArrowDown")
+        await page.keyboard.press("Enter")
+        print(f"  [OK] Dropdown: {aria_label}")
+    except Exception as e:
+        print(f"  [FEHLER] Dropdown '{aria_label}': {e}")
+
+
+@tracing.traced(attrs=("aria_label",))
+async def fill_date(page: Page, root, aria_label: str, value: str, indent: str = "    "):
+    """Füllt einen readonly DatePicker per Klick + Keyboard (TT.MM.JJJJ)."""
+    if not value:
+        return
+    try:
+        parts = value.split(".")
+        if len(parts) == 3:
+            us_date = f"{parts[1]}/{parts[0]}/{parts[2]}"
+            date_input = root.locator(f'input[aria-label*="{aria_label}"]').first
+            await date_input.wait_for(state="visible", timeout=3000)
+            await date_input.scroll_into_view_if_needed()
+            await date_input.click()
+            await page.keyboard.type(us_date)
+            await page.keyboard.press("Escape")
+            print(f"{indent}[OK] {aria_label}")
+    except Exception as e:
+        print(f"{indent}[FEHLER] {aria_label}: {e}")
+
+
+class AsyncSubformSelectors(SubformSelectors):
+    """SubformSelectors für die async API."""
+
+    async def resolve(self, root) -> dict:
+        pending = self.pending()
+        if pending:
+            self.update(await root.locator(":root").evaluate(RESOLVE_LABELS_JS, pending))
+        return self.labels
+
+
+@tracing.traced(attrs=("aria_label",))
+async def fill_subform_text(iframe, aria_label: str, value: str):
+    """Füllt ein Textfeld im iframe per (Teil-)aria-label, einzeln über Playwright."""
+    try:
+        el = iframe.locator(f'[aria-label="{aria_label}"], [aria-label*="{aria_label}"]').first
+        await el.scroll_into_view_if_needed(timeout=5000)
+        await el.fill(value)
+        print(f"    [OK] {aria_label}")
+    except Exception as e:
+        print(f"    [FEHLER] {aria_label}: {e}")
+
+
+@tracing.traced()
+async def fill_subform_texts(iframe, mitarbeiter: dict, selectors: AsyncSubformSelectors):
+    """Füllt alle Textfelder des Subformulars: aufgelöste Felder in einem evaluate(), der Rest einzeln."""
+    batch, single = split_subform_texts(mitarbeiter, await selectors.resolve(iframe))
+    status = await fill_fields_batch(iframe, [(label, value) for label, value, _ in batch])
+    for label, value, partial in batch:
+        if status.get(label) not in ("ok", "fallback"):
+            selectors.forget(partial)
+            single.append((partial, value))
+    for partial, value in single:
+        await fill_subform_text(iframe, partial, value)
+
+
+class AsyncPendingUpload:
+    """Wie fill_form.PendingUpload: Upload starten, erst vor dem Einreichen warten."""
+
+    def __init__(self, page: Page, path: str):
+        self.page = page
+        self.path = path
+        self.done = not path
+
+    async def start(self, iframe):
+        if not self.path:
+            return self
+        self.page.on("response", self._on_response)
+        try:
+            self.file_name, self.file_size = os.path.basename(self.path), os.path.getsize(self.path)
+            await iframe.locator('input[type="file"]').first.set_input_files(self.path)
+            print(f"    [INFO] Datei-Upload gestartet: {self.path}")
+        except Exception as e:
+            print(f"    [FEHLER] Datei-Upload: {e}")
+            self._stop()
+            self.done = True
+            self.path = ""
+        return self
+
+    def _is_upload(self, response) -> bool:
+        return is_upload_response(response, self.file_name, self.file_size)
+
+    def _on_response(self, response):
+        if self._is_upload(response):
+            self.done = True
+
+    def _stop(self):
+        self.page.remove_listener("response", self._on_response)
+
+    async def wait(self, timeout: int = UPLOAD_TIMEOUT_MS):
+        if not self.path:
+            return
+        # Zwischen Prüfung und wait_for_event liegt kein await, die Antwort geht also nicht verloren
+        if not self.done:
+            try:
+                await self.page.wait_for_event("response", predicate=self._is_upload, timeout=timeout)
+            except Exception:
+                print(f"    [WARNUNG] Upload-Antwort nicht erkannt, warte auf Netzwerk-Ruhe")
+                await self.page.wait_for_load_state("networkidle")
+        self._stop()
+        print(f"    [OK] Datei hochgeladen: {self.path}")
+
+
+@tracing.traced()
+async def fill_mitarbeiter_subform(page: Page, mitarbeiter: dict, selectors: AsyncSubformSelectors = None,
+                                   timer: PhaseTimer = None):
+    """Füllt das Mitarbeiter-Subformular im iframe aus (Ablauf wie in fill_form.py)."""
+    iframe = page.frame_locator(SUBFORM_IFRAME)
+    selectors = selectors or AsyncSubformSelectors()
+    timer = timer or PhaseTimer()
+
+    @tracing.traced(attrs=("aria_label",))
+    async def fill_dropdown(aria_label, key):
+        """Füllt ein React-Select Dropdown im iframe aus (unterstützt Multi-Select)."""
+        value = mitarbeiter.get(key, "")
+        if value:
+            try:
+                input_el = iframe.locator(f'input[aria-label*="{aria_label}"]').first
+                await input_el.scroll_into_view_if_needed()
+
+                for opt in [o.strip() for o in value.split(",")]:
+                    await input_el.click()
+                    await wait_for_signal(iframe.locator('[role="listbox"], [role="option"]').first)
+                    await page.keyboard.type(opt, delay=50)
+                    await wait_for_signal(iframe.locator('[role="option"]').filter(has_text=opt).first)
+                    await page.keyboard.press("Enter")
+
+                await page.keyboard.press("Escape")
+                print(f"    [OK] Dropdown: {aria_label}")
+            except Exception as e:
+                print(f"    [FEHLER] Dropdown {aria_label}: {e}")
+
+    @tracing.traced(attrs=("text",))
+    async def click_radio_sub(text):
+        try:
+            rb = iframe.locator(f'[role="radio"]:has-text("{text}")').first
+            await rb.scroll_into_view_if_needed()
+            await rb.click()
+            print(f"    [OK] Radio: {text}")
+        except Exception:
+            pass
+
+    @tracing.traced(attrs=("label_text",))
+    async def select_airtable_option(label_text, value):
+        """Felder mit '+ Hinzufügen' Button (Airtable-Anbindung)."""
+        if not value:
+            return
+        try:
+            print(f"    [INFO] Suche Airtable-Option: {value}")
+            add_button = iframe.locator(f'div:has(> p:has-text("{label_text}")) >> button:has-text("Hinzufügen")').first
+            if not await add_button.count():
+                add_button = iframe.locator('button:has-text("Hinzufügen")').first
+
+            await add_button.scroll_into_view_if_needed()
+            await add_button.click()
+
+            search_input = iframe.locator('input[placeholder*="Search"]').first
+            await search_input.wait_for(state="visible", timeout=5000)
+            await search_input.fill(value)
+
+            print(f"    [INFO] Klicke Ergebnis für: {value}")
+            result = iframe.locator(f'div:has-text("{value}")').last
+            await wait_for_signal(result)
+            await result.scroll_into_view_if_needed()
+            await result.click()
+            print(f"    [OK] Airtable Selection: {label_text} -> {value}")
+        except Exception as e:
+            print(f"    [FEHLER] Airtable Selection {label_text}: {e}")
+            try:
+                await iframe.locator('.sc-c43922eb-0').first.click()
+                print(f"    [OK] Fallback: Erste verfügbare Option gewählt")
+            except Exception:
+                pass
+
+    @tracing.traced(attrs=("label_text",))
+    async def select_plus_date(label_text, key):
+        """Datumsfelder mit '+ Startdatum hinzufügen'."""
+        value = mitarbeiter.get(key, "")
+        if not value:
+            return
+        try:
+            print(f"    [INFO] Suche Startdatum: {value}")
+            add_button = iframe.locator('button:has-text("Startdatum hinzufügen")').first
+            if await add_button.count() > 0:
+                await add_button.scroll_into_view_if_needed()
+                await add_button.click()
+
+            await wait_for_signal(iframe.locator('[role="option"], [role="listitem"], .sc-c43922eb-0').first)
+
+            parts = value.split(".")
+            if len(parts) == 3:
+                day = parts[0].lstrip("0") or "0"
+                month = parts[1].lstrip("0") or "0"
+                date_formats = [f"{day}.{month}.", f"{day}.{month}.{parts[2]}", f"{parts[0]}.{parts[1]}.", value]
+            else:
+                date_formats = [value]
+
+            for date_format in date_formats:
+                result = iframe.locator(f'div:has-text("{date_format}")').last
+                if await result.count() > 0:
+                    await result.scroll_into_view_if_needed()
+                    await result.click()
+                    print(f"    [OK] Startdatum: {date_format}")
+                    return
+
+            print(f"    [WARNUNG] Datum nicht gefunden, wähle erstes verfügbares")
+            first_option = iframe.locator('[role="option"], [role="listitem"], .sc-c43922eb-0').first
+            if await first_option.count() > 0:
+                await first_option.click()
+                print(f"    [OK] Erstes verfügbares Datum gewählt")
+        except Exception as e:
+            print(f"    [FEHLER] Startdatum: {e}")
+
+    with timer.phase("upload_start"):
+        upload = await AsyncPendingUpload(page, mitarbeiter.get("arbeitsvertrag_pfad", "")).start(iframe)
+
+    with timer.phase("text"):
+        # Geschlecht & Familienstand
+        await click_radio_sub(mitarbeiter.get("geschlecht", "Herr"))
+        await click_radio_sub(mitarbeiter.get("familienstand", "ledig"))
+
+        # Textfelder
+        await fill_subform_texts(iframe, mitarbeiter, selectors)
+
+        # Textareas
+        try:
+            taetigkeit = mitarbeiter.get("taetigkeitsbeschreibung", "")
+            if taetigkeit:
+                ta = iframe.locator('textarea[aria-label*="Beschreibe, welche Tätigkeit"]').first
+                await ta.scroll_into_view_if_needed()
+                await ta.fill(taetigkeit)
+                print("    [OK] Tätigkeitsbeschreibung")
+        except Exception as e:
+            print(f"    [FEHLER] Tätigkeitsbeschreibung: {e}")
+
+    with timer.phase("dropdowns"):
+        # Dropdown-Felder (React-Select / Combobox)
+        await fill_dropdown("Nationalität", "nationalitaet")
+        await fill_dropdown("Arbeitstage", "arbeitstage")
+        await fill_dropdown("Arbeitszeit 1 von", "arbeitszeit_1_von")
+        await fill_dropdown("Arbeitszeit 1 bis", "arbeitszeit_1_bis")
+        await fill_dropdown("Arbeitszeit 2 von", "arbeitszeit_2_von")
+        await fill_dropdown("Arbeitszeit 2 bis", "arbeitszeit_2_bis")
+
+        # Airtable & Spezielle Buttons
+        await select_airtable_option("Welche Weiterbildung wird der Mitarbeiter besuchen?", mitarbeiter.get("weiterbildung"))
+
+    with timer.phase("dates"):
+        await fill_date(page, iframe, "Geburtsdatum", mitarbeiter.get("geburtsdatum", ""))
+        await fill_date(page, iframe, "Beginn des Beschäftigungsverhältnisses (TT.MM.JJJJ)", mitarbeiter.get("beschaeftigung_beginn", ""))
+        await select_plus_date("Zu welchem Datum soll der Mitarbeiter in die Förderung gehen?", "foerderung_start")
+
+    with timer.phase("radios"):
+        # Radio-Buttons (Allgemein)
+        await click_radio_sub(mitarbeiter.get("gehaltsform", "Monatsgehalt"))
+        await click_radio_sub(mitarbeiter.get("verguetung_ist", "ortsüblich"))
+        await click_radio_sub(mitarbeiter.get("kurzarbeitergeld", "Nein"))
+
+        # Ja/Nein-Fragen
+        await click_radio_for_question(iframe, "mehr als 4 Jahre", mitarbeiter.get("mehr_als_4_jahre", "Nein"))
+        await click_radio_for_question(iframe, "Befristetes Arbeitsverhältnis", mitarbeiter.get("befristet", "Nein"))
+        await click_radio_for_question(iframe, "Befristete Arbeitserlaubnis", mitarbeiter.get("befristete_arbeitserlaubnis", "Nein"))
+
+        await click_radio_for_question(iframe, "Abgeschlossene Ausbildung", mitarbeiter.get("ausbildung_vorhanden", "Ja"))
+        if mitarbeiter.get("ausbildung_vorhanden") == "Ja":
+            await wait_for_signal(iframe.locator('input[aria-label*="Ausbildung / Studium"]').first)
+            await fill_dropdown("Ausbildung / Studium", "ausbildung")
+
+        await click_radio_for_question(iframe, "Übernahme der Weiterbildungskosten", mitarbeiter.get("kostenuebernahme_dritter", "Nein"))
+        await click_radio_for_question(iframe, "fortbestehen", mitarbeiter.get("fortbestand_arbeitsverhaeltnis", "Ja"))
+        await click_radio_for_question(iframe, "freigestellt", mitarbeiter.get("freistellung_bescheinigt", "Ja"))
+        await click_radio_for_question(iframe, "Bedarfsgemeinschaft", mitarbeiter.get("bedarfsgemeinschaft", "Nein"))
+        await click_radio_for_question(iframe, "Bildungsgutschein", mitarbeiter.get("bildungsgutschein", "Nein"))
+        await click_radio_for_question(iframe, "Eingliederungszuschuss", mitarbeiter.get("eingliederungszuschuss", "Nein"))
+
+        # Checkboxen
+        if mitarbeiter.get("schwerbehinderung") == "Ja":
+            try:
+                cb = iframe.locator('button[role="checkbox"]').first
+                await cb.scroll_into_view_if_needed()
+                await cb.click()
+                print("    [OK] Schwerbehinderung")
+            except Exception:
+                pass
+
+    with timer.phase("upload_wait"):
+        await upload.wait()
+
+    # Einreichen (mit Retry falls Upload noch nicht fertig war)
+    with timer.phase("submit"):
+        try:
+            btn = iframe.locator('button:has-text("Einreichen")').first
+            await btn.scroll_into_view_if_needed()
+            await btn.click()
+            print(f"    [INFO] Erster Klick auf Einreichen...")
+
+            closed = await wait_for_signal(page.locator(SUBFORM_IFRAME), "detached", SUBMIT_TIMEOUT_MS)
+            if not closed and await iframe.locator('button:has-text("Einreichen")').count() > 0:
+                print(f"    [INFO] Modal noch offen, versuche erneut...")
+                await iframe.locator('button:has-text("Einreichen")').first.click()
+                closed = await wait_for_signal(page.locator(SUBFORM_IFRAME), "detached", SUBMIT_TIMEOUT_MS)
+
+            print(f"    [OK] Mitarbeiter eingereicht")
+            if not closed:
+                await page.keyboard.press("Escape")
+                await wait_for_signal(page.locator(SUBFORM_IFRAME), "hidden")
+        except Exception as e:
+            print(f"    [FEHLER] Einreichen: {e}")
+
+
+# =============================================================================
+# HAUPTFUNKTION
+# =============================================================================
+
+@tracing.traced()
+async def open_form(page: Page, form_url: str = FORM_URL):
+    """Lädt das Formular und klickt "Start" (bis vor den ersten Formularschritt)."""
+    await page.goto(form_url)
+    await page.wait_for_load_state("networkidle")
+    await page.click('button:has-text("Start")')
+    await page.wait_for_load_state("networkidle")
+
+
+@tracing.traced()
+async def fill_form_page(page: Page, data: dict, form_url: str = FORM_URL, opened: bool = False) -> bool:
+    """Füllt das Formular auf einer offenen Seite aus und sendet es ab.
+
+    Mit opened=True steht die Seite schon auf dem ersten Formularschritt
+    (vorgewärmt aus dem BrowserPool), Laden und Start entfallen.
+
+    Returns:
+        True wenn nach dem Absenden eine Erfolgsmeldung gefunden wurde
+    """
+    steps = tracing.Steps()
+    if opened:
+        print("[1-2/10] Formular vorgeladen")
+    else:
+        print("[1-2/10] Lade und starte Formular...")
+        steps.next("1-2/10 Lade und starte Formular")
+        await open_form(page, form_url)
+
+    print("[3/10] Persönliche Daten...")
+    steps.next("3/10 Persönliche Daten")
+    await click_radio(page, data["geschlecht"])
+    await fill_fields_batch(page, [
+        ("Vorname Ansprechpartner", data["vorname"]),
+        ("Nachname", data["nachname"]),
+        ("Telefonnummer", data["telefon"]),
+        ("Email-Adresse", data["email"]),
+    ])
+    await fill_date(page, page, "Geburtsdatum", data.get("geburtsdatum", ""), indent="  ")
+
+    print("[4/10] Unternehmensdaten...")
+    steps.next("4/10 Unternehmensdaten")
+    await fill_fields_batch(page, [
+        ("Name des Unternehmens", data["firma"]),
+        ("Straße", data["strasse"]),
+        ("Hausnummer", data["hausnummer"]),
+        ("PLZ", data["plz"]),
+        ("Ort", data["ort"]),
+    ])
+    await select_react_dropdown(page, "Unternehmensbranche", data["branche"])
+    await select_react_dropdown(page, "Bundesland", data["bundesland"])
+    await select_react_dropdown(page, "Rechtsform", data["rechtsform"])
+
+    print("[5/10] Mitarbeiterzahlen...")
+    steps.next("5/10 Mitarbeiterzahlen")
+    await fill_fields_batch(page, [
+        ("10 Stunden pro Woche", data["mitarbeiter_unter_10h"]),
+        ("10-20 Stunden", data["mitarbeiter_10_20h"]),
+        ("20-30 Stunden", data["mitarbeiter_20_30h"]),
+        ("mehr als 30 Stunden", data["mitarbeiter_ueber_30h"]),
+    ], partial=True)
+
+    print("[6/10] Betriebsdaten...")
+    steps.next("6/10 Betriebsdaten")
+    await click_radio_for_question(page, "Betriebsnummer vorhanden", data["betriebsnummer_vorhanden"])
+    if data["betriebsnummer_vorhanden"] == "Ja":
+        await page.wait_for_selector('input[aria-label*="Betriebsnummer"]', timeout=3000)
+        await fill_by_partial_aria(page, "Betriebsnummer", data["betriebsnummer"])
+
+    await click_radio_for_question(page, "E-Service Zugang", data["eservice_zugang"])
+    await click_radio_for_question(page, "Betriebsvereinbarung", data["betriebsvereinbarung"])
+
+    print("[7/10] Bankdaten...")
+    steps.next("7/10 Bankdaten")
+    await fill_fields_batch(page, [
+        ("IBAN", data["iban"]),
+        ("BIC", data["bic"]),
+        ("Kreditinstitut", data["bank_name"]),
+    ], partial=True)
+
+    print("[8/10] Mitarbeiter anlegen...")
+    steps.next("8/10 Mitarbeiter anlegen")
+    selectors = AsyncSubformSelectors()
+    for i, mitarbeiter in enumerate(data.get("mitarbeiter") or []):
+        print(f"  Mitarbeiter {i+1}:")
+        timer = PhaseTimer()
+        with tracing.span("mitarbeiter", index=i + 1):
+            with timer.phase("iframe"):
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                await page.click('button:has-text("Mitarbeiter anlegen")')
+
+                await page.wait_for_selector(SUBFORM_IFRAME, state="attached", timeout=IFRAME_TIMEOUT_MS)
+                await wait_for_signal(
+                    page.frame_locator(SUBFORM_IFRAME).locator("input, textarea").first,
+                    timeout=IFRAME_TIMEOUT_MS
+                )
+
+            await fill_mitarbeiter_subform(page, mitarbeiter, selectors, timer)
+
+            with timer.phase("close"):
+                if not await wait_for_signal(page.locator('[role="dialog"]').first, "hidden", SUBMIT_TIMEOUT_MS):
+                    await page.keyboard.press("Escape")
+                    await wait_for_signal(page.locator('[role="dialog"]').first, "hidden")
+
+        report_employee_timing(i + 1, mitarbeiter, timer)
+
+    print("[9/10] AGB...")
+    steps.next("9/10 AGB")
+    if data.get("agb_akzeptiert"):
+        try:
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await page.locator('button[role="checkbox"]').first.click()
+            print("  [OK] AGB akzeptiert")
+        except Exception as e:
+            print(f"  [FEHLER] AGB: {e}")
+
+    print("[10/10] Absenden...")
+    steps.next("10/10 Absenden")
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+
+    absenden_btn = page.locator('button:has-text("Absenden")').first
+    if await wait_for_signal(absenden_btn):
+        await absenden_btn.scroll_into_view_if_needed()
+        await absenden_btn.click()
+        print("  [INFO] Klick auf Absenden...")
+    else:
+        print("  [FEHLER] Absenden-Button nicht gefunden!")
+
+    print("  [INFO] Warte auf Bestätigung...")
+    if await wait_for_signal(page.get_by_text(SUCCESS_TEXT).first, timeout=CONFIRMATION_TIMEOUT_MS):
+        print("  [OK] Erfolgsmeldung gefunden!")
+        return True
+
+    print("  [WARNUNG] Keine Erfolgsmeldung gefunden. Prüfe manuell.")
+    return False
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+class AsyncRequestBlocker(RequestBlocker):
+    """RequestBlocker für die async API (gleiche Regeln und Bericht)."""
+
+    async def handle_route(self, route: Route):
+        if self.count(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    async def record_size(self, request: Request):
+        try:
+            size = (await request.sizes())["responseBodySize"]
+        except Exception:
+            return
+        self.sizes[self.size_key(request.url)] = size
+
+    async def attach(self, context: BrowserContext):
+        if self.enabled:
+            await context.route("**/*", self.handle_route)
+        else:
+            context.on("requestfinished", self.record_size)
+
+
+class PooledPage:
+    """Ein Kontext des Pools mit seiner (vorgewärmten) Seite."""
+
+    def __init__(self, context: BrowserContext = None, page: Page = None, uses: int = 0, warm: bool = False):
+        self.context = context
+        self.page = page
+        self.uses = uses
+        self.warm = warm
+
+
+class BrowserPool:
+    """Hält Kontexte mit vorgeladenen Seiten bereit, damit Einreichungen ohne Kaltstart beginnen.
+
+    Jeder Kontext lädt FORM_URL und klickt "Start", bevor er vergeben wird.
+    Nach einer Einreichung werden Cookies und Storage gelöscht und im
+    Hintergrund eine neue Seite vorgewärmt. Nach `max_uses` Einreichungen
+    wird der Kontext geschlossen und durch einen neuen ersetzt, damit
+    Speicherlecks der Seite begrenzt bleiben.
+    """
+
+    def __init__(self, browser, size: int = DEFAULT_CONCURRENCY, max_uses: int = DEFAULT_MAX_USES,
+                 form_url: str = FORM_URL, blocker: "AsyncRequestBlocker" = None):
+        if not 1 <= size <= MAX_POOL_SIZE:
+            raise ValueError(f"Pool-Größe muss zwischen 1 und {MAX_POOL_SIZE} liegen, nicht {size}")
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.form_url = form_url
+        self.blocker = blocker
+        self.stats = {"warmed": 0, "warm_failed": 0, "recycled": 0}
+        self._ready = asyncio.Queue()
+        self._warming = set()
+        self._closed = False
+
+    async def start(self):
+        for _ in range(self.size):
+            self._spawn(PooledPage())
+
+    def _spawn(self, slot: PooledPage):
+        task = asyncio.create_task(self._warm(slot))
+        self._warming.add(task)
+        task.add_done_callback(self._warming.discard)
+
+    async def _warm(self, slot: PooledPage):
+        try:
+            if slot.context is None:
+                slot.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+                slot.uses = 0
+                if self.blocker:
+                    await self.blocker.attach(slot.context)
+            slot.page = await slot.context.new_page()
+            await open_form(slot.page, self.form_url)
+            slot.warm = True
+            self.stats["warmed"] += 1
+        except Exception as e:
+            # Der Slot geht trotzdem in den Pool, die Einreichung lädt dann selbst
+            print(f"[POOL] Vorwärmen fehlgeschlagen: {e}")
+            slot.warm = False
+            self.stats["warm_failed"] += 1
+        await self._ready.put(slot)
+
+    async def acquire(self) -> PooledPage:
+        """Wartet auf einen freien Kontext (möglichst mit vorgeladener Seite)."""
+        slot = await self._ready.get()
+        if slot.context is None:
+            slot.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+            if self.blocker:
+                await self.blocker.attach(slot.context)
+        if slot.page is None or slot.page.is_closed():
+            slot.page = await slot.context.new_page()
+            slot.warm = False
+        slot.uses += 1
+        return slot
+
+    async def release(self, slot: PooledPage):
+        """Setzt den Kontext zurück (oder ersetzt ihn) und wärmt ihn neu vor."""
+        if slot.uses >= self.max_uses:
+            await self._discard(slot)
+            self.stats["recycled"] += 1
+        else:
+            try:
+                for frame in slot.page.frames:
+                    try:
+                        await frame.evaluate(CLEAR_STORAGE_JS)
+                    except Exception:
+                        pass  # z.B. about:blank oder Frame ohne Storage-Zugriff
+                await slot.context.clear_cookies()
+                await slot.page.close()
+            except Exception:
+                await self._discard(slot)
+
+        slot.page = None
+        slot.warm = False
+        if self._closed:
+            await self._discard(slot)
+        else:
+            self._spawn(slot)
+
+    async def _discard(self, slot: PooledPage):
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+        slot.context = None
+
+    async def close(self):
+        self._closed = True
+        for task in list(self._warming):
+            task.cancel()
+        await asyncio.gather(*self._warming, return_exceptions=True)
+        while not self._ready.empty():
+            await self._discard(self._ready.get_nowait())
+
+    def print_stats(self):
+        print(f"Browser-Pool: {self.stats['warmed']} Seiten vorgewärmt, "
+              f"{self.stats['warm_failed']} fehlgeschlagen, {self.stats['recycled']} Kontexte recycelt")
+
+
+async def run_submission(pool: BrowserPool, index: int, submission: dict) -> dict:
+    """Füllt eine Einreichung auf einer Seite aus dem Pool aus.
+
+    Die Dauer zählt ab der Übernahme der (vorgeladenen) Seite.
+    """
+    result = {
+        "index": index,
+        "scenario": submission.get("scenario"),
+        "email": submission.get("email"),
+        "firma": submission.get("firma"),
+        "started_at": datetime.now().isoformat(),
+    }
+    slot = await pool.acquire()
+    started = time.monotonic()
+    try:
+        form_url = submission.get("form_url", FORM_URL)
+        opened = slot.warm and form_url == pool.form_url
+        result["warm"] = opened
+        with tracing.span("submission", index=index, scenario=submission.get("scenario"), warm=opened):
+            success = await fill_form_page(slot.page, submission, form_url, opened=opened)
+        result["status"] = "ok" if success else "no_confirmation"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        result["duration_s"] = round(time.monotonic() - started, 2)
+        await pool.release(slot)
+    return result
+
+
+async def run_many(submissions, concurrency: int = DEFAULT_CONCURRENCY, results_file: str = RESULTS_FILE,
+                   headless: bool = True, blocker: "AsyncRequestBlocker" = None,
+                   max_uses: int = DEFAULT_MAX_USES) -> list:
+    """Füllt alle Einreichungen mit höchstens `concurrency` gleichzeitigen Sessions aus.
+
+    `concurrency` Sessions ziehen sich die Einreichungen nacheinander aus
+    dem Iterator, er wird also nie komplett in den Speicher gelesen. Jede
+    Session bekommt ihre Seite aus einem BrowserPool mit `concurrency`
+    vorgewärmten Kontexten, höchstens MAX_POOL_SIZE. Weitere Sessions warten
+    in acquire(), bis ein Kontext frei wird.
+    """
+    blocker = blocker or AsyncRequestBlocker()
+    results = []
+    submissions = enumerate(submissions, 1)
+
+    with open(results_file, "w") as out:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=headless)
+            pool_size = min(concurrency, MAX_POOL_SIZE)
+            if pool_size < concurrency:
+                print(f"[INFO] Pool auf {pool_size} Kontexte begrenzt, {concurrency - pool_size} Sessions warten jeweils")
+            pool = BrowserPool(browser, pool_size, max_uses, blocker=blocker)
+            await pool.start()
+
+            async def session(session_id):
+                # Der Iterator wird nur zwischen zwei awaits benutzt, daher ohne Lock
+                for index, submission in submissions:
+                    print(f"[S{session_id}] Einreichung {index} startet...")
+                    result = await run_submission(pool, index, submission)
+                    result["session"] = session_id
+                    print(f"[S{session_id}] Einreichung {index}: {result['status']} ({result['duration_s']}s)")
+                    results.append(result)
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.flush()
+
+            await asyncio.gather(*(session(i + 1) for i in range(concurrency)))
+            await pool.close()
+            pool.print_stats()
+            await browser.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Füllt viele Formulare mit async Playwright aus.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL-Datei mit einer Einreichung pro Zeile")
+    source.add_argument("--generate", type=int, help="Anzahl Einreichungen aus TEST_DATA generieren")
+    parser.add_argument("--strict", action="store_true", help="Bei ungültigen Zeilen in --input abbrechen")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Gleichzeitige Sessions, Pool höchstens {MAX_POOL_SIZE} Kontexte (Default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--max-uses", type=int, default=DEFAULT_MAX_USES,
+                        help=f"Einreichungen pro Kontext, danach wird er neu erzeugt (Default: {DEFAULT_MAX_USES})")
+    parser.add_argument("--results", default=RESULTS_FILE, help=f"Ergebnis-Datei (Default: {RESULTS_FILE})")
+    parser.add_argument("--headed", action="store_true", help="Browser sichtbar starten")
+    parser.add_argument("--no-block", action="store_true",
+                        help="Kein Request-Blocking, stattdessen Ressourcengrößen messen")
+    parser.add_argument("--employee-timings", help="Zeiten pro Mitarbeiter als JSONL in diese Datei schreiben")
+    parser.add_argument("--trace", help="Spans aller Schritte und Felder als JSONL schreiben")
+    parser.add_argument("--chrome-trace", help="Spans zusätzlich als Chrome-Trace (chrome://tracing, Perfetto) schreiben")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    if args.max_uses < 1:
+        parser.error("--max-uses muss mindestens 1 sein")
+    if args.generate is not None and args.generate < 1:
+        parser.error("--generate muss mindestens 1 sein")
+    fill_form.EMPLOYEE_TIMINGS_FILE = args.employee_timings
+
+    submissions = load_submissions(args.input, args.strict) if args.input else generate_submissions(args.generate)
+
+    print("=" * 50)
+    print(f"FORMULAR-AUSFÜLLER (async, {args.concurrency} Sessions)")
+    print("=" * 50)
+
+    blocker = AsyncRequestBlocker(enabled=BLOCK_REQUESTS and not args.no_block)
+    if args.trace or args.chrome_trace:
+        tracing.start(args.trace, args.chrome_trace)
+    started = time.monotonic()
+    try:
+        results = asyncio.run(run_many(submissions, args.concurrency, args.results,
+                                       headless=not args.headed, blocker=blocker, max_uses=args.max_uses))
+    finally:
+        tracing.stop()
+    print_summary(results, time.monotonic() - started)
+    blocker.print_report()
+    print(f"Ergebnisse: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""
+Füllt viele Formulare parallel aus: ein Chromium, mehrere isolierte Browser-Kontexte.
+
+Verwendung:
+    # Einreichungen aus einer JSONL-Datei (eine Einreichung pro Zeile)
+    python fill_form_parallel.py --input einreichungen.jsonl --workers 4
+
+    # N Einreichungen aus TEST_DATA generieren (eindeutige Namen/E-Mails)
+    python fill_form_parallel.py --generate 20 --workers 4 --results ergebnisse.jsonl
+
+Jede JSONL-Zeile ist ein Szenario (siehe scenarios.py): Struktur von
+TEST_DATA in fill_form.py, fehlende Schlüssel werden aus TEST_DATA
+übernommen, ungültige Zeilen werden übersprungen. Optional kann eine Zeile
+einen Namen ("scenario") und eine eigene "form_url" enthalten.
+
+Der Browser wird einmal gestartet. Jeder Worker-Thread verbindet sich per
+CDP mit diesem Browser (Playwright ist nicht thread-safe, daher eine
+Playwright-Instanz pro Thread) und bekommt pro Einreichung einen frischen
+Kontext (eigene Cookies und Storage). Pro Einreichung wird ein Ergebnis
+als JSON-Zeile geschrieben.
+
+Voraussetzungen:
+    pip install playwright
+    playwright install chromium
+"""
+
+import argparse
+import json
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from playwright.sync_api import sync_playwright
+
+import fill_form
+import tracing
+from fill_form import BLOCK_REQUESTS, CONTEXT_OPTIONS, FORM_URL, TEST_DATA, RequestBlocker, fill_form_page
+from scenarios import load_scenarios
+
+# =============================================================================
+# KONFIGURATION
+# =============================================================================
+
+DEFAULT_WORKERS = 4
+QUEUE_PUT_TIMEOUT_SECONDS = 1  # Wie oft beim Nachladen geprüft wird, ob noch Worker laufen
+
+RESULTS_FILE = "fill_form_results.jsonl"
+
+
+# =============================================================================
+# EINREICHUNGEN
+# =============================================================================
+
+def load_submissions(path: str, strict: bool = False):
+    """Liest Einreichungen zeilenweise aus einer JSONL-Datei und prüft sie."""
+    return load_scenarios(path, strict)
+
+
+def generate_submissions(count: int):
+    """Erzeugt `count` Kopien von TEST_DATA mit eindeutigen Namen und E-Mails."""
+    domain = TEST_DATA["email"].split("@")[-1]
+    for n in range(1, count + 1):
+        submission = json.loads(json.dumps(TEST_DATA))
+        submission["nachname"] = f"{TEST_DATA['nachname']} {n}"
+        submission["email"] = f"{uuid.uuid4()}@{domain}"
+        submission["firma"] = f"{TEST_DATA['firma']} {n}"
+        for mitarbeiter in submission.get("mitarbeiter", []):
+            mitarbeiter["nachname"] = f"{mitarbeiter['nachname']} {n}"
+            mitarbeiter["email"] = f"{uuid.uuid4()}@{domain}"
+        yield submission
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def new_result(index: int, submission: dict, worker_id: int) -> dict:
+    return {
+        "index": index,
+        "worker": worker_id,
+        "scenario": submission.get("scenario"),
+        "email": submission.get("email"),
+        "firma": submission.get("firma"),
+        "started_at": datetime.now().isoformat(),
+    }
+
+
+def failed_result(index: int, submission: dict, worker_id: int, error: Exception) -> dict:
+    """Ergebnis für eine Einreichung, die nicht ausgefüllt werden konnte."""
+    result = new_result(index, submission, worker_id)
+    result.update(status="error", error=str(error), duration_s=0.0)
+    return result
+
+
+def run_submission(browser, index: int, submission: dict, worker_id: int, blocker: RequestBlocker) -> dict:
+    """Füllt eine Einreichung in einem frischen Kontext aus."""
+    result = new_result(index, submission, worker_id)
+    started = time.monotonic()
+    context = None
+    try:
+        context = browser.new_context(**CONTEXT_OPTIONS)
+        blocker.attach(context)
+        page = context.new_page()
+        with tracing.span("submission", index=index, worker=worker_id, scenario=submission.get("scenario")):
+            success = fill_form_page(page, submission, submission.get("form_url", FORM_URL))
+        result["status"] = "ok" if success else "no_confirmation"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+    finally:
+        if context is not None:
+            context.close()
+    result["duration_s"] = round(time.monotonic() - started, 2)
+    return result
+
+
+def worker(worker_id: int, cdp_endpoint: str, tasks: queue.Queue, on_result, blocker: RequestBlocker):
+    """Arbeitet Einreichungen aus der Queue ab, bis None kommt.
+
+    Fällt der Browser weg (Verbindung oder Kontext schlägt fehl), leert der
+    Worker die Queue trotzdem weiter und meldet die restlichen Einreichungen
+    als Fehler, damit run_parallel beim Nachladen nicht hängen bleibt.
+    """
+    finished = False
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.connect_over_cdp(cdp_endpoint)
+            while True:
+                task = tasks.get()
+                if task is None:
+                    finished = True
+                    break
+                index, submission = task
+                print(f"[W{worker_id}] Einreichung {index} startet...")
+                try:
+                    result = run_submission(browser, index, submission, worker_id, blocker)
+                except Exception as e:
+                    result = failed_result(index, submission, worker_id, e)
+                print(f"[W{worker_id}] Einreichung {index}: {result['status']} ({result['duration_s']}s)")
+                on_result(result)
+    except Exception as e:
+        print(f"[FEHLER] W{worker_id}: {e}")
+        if finished:
+            return
+        print(f"[FEHLER] W{worker_id}: Restliche Einreichungen werden als Fehler gemeldet")
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, submission = task
+            on_result(failed_result(index, submission, worker_id, e))
+
+
+def run_parallel(submissions, workers: int = DEFAULT_WORKERS, results_file: str = RESULTS_FILE,
+                 headless: bool = True, blocker: RequestBlocker = None) -> list:
+    """Füllt alle Einreichungen mit `workers` parallelen Kontexten aus.
+
+    Die Einreichungen werden über eine begrenzte Queue nachgeladen, ein
+    Iterator wird also nie komplett in den Speicher gelesen. Alle Kontexte
+    teilen sich einen RequestBlocker, dessen Bericht den ganzen Lauf abdeckt.
+    """
+    blocker = blocker or RequestBlocker()
+    results = []
+    lock = threading.Lock()
+    tasks = queue.Queue(maxsize=workers * 2)
+
+    with open(results_file, "w") as out:
+        def on_result(result):
+            with lock:
+                results.append(result)
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+
+        with sync_playwright() as p:
+            port = free_port()
+            browser = p.chromium.launch(headless=headless, args=[f"--remote-debugging-port={port}"])
+            cdp_endpoint = f"http://127.0.0.1:{port}"
+
+            threads = [
+                threading.Thread(target=worker, args=(i + 1, cdp_endpoint, tasks, on_result, blocker), daemon=True)
+                for i in range(workers)
+            ]
+            for thread in threads:
+                thread.start()
+
+            def put(task) -> bool:
+                """Legt `task` in die Queue, False wenn kein Worker mehr läuft."""
+                while True:
+                    try:
+                        tasks.put(task, timeout=QUEUE_PUT_TIMEOUT_SECONDS)
+                        return True
+                    except queue.Full:
+                        if not any(thread.is_alive() for thread in threads):
+                            return False
+
+            for index, submission in enumerate(submissions, 1):
+                if not put((index, submission)):
+                    print(f"[FEHLER] Keine Worker mehr aktiv, Einreichung {index} wird als Fehler gemeldet")
+                    on_result(failed_result(index, submission, 0, RuntimeError("Keine Worker mehr aktiv")))
+            for _ in threads:
+                if not put(None):
+                    break
+
+            for thread in threads:
+                thread.join()
+
+            browser.close()
+
+    return results
+
+
+def print_summary(results: list, duration: float):
+    ok = sum(1 for r in results if r["status"] == "ok")
+    durations = sorted(r["duration_s"] for r in results)
+
+    print()
+    print("=" * 50)
+    print("ZUSAMMENFASSUNG")
+    print("=" * 50)
+    print(f"Einreichungen:      {len(results)}")
+    print(f"Erfolgreich:        {ok}")
+    print(f"Ohne Bestätigung:   {sum(1 for r in results if r['status'] == 'no_confirmation')}")
+    print(f"Fehler:             {sum(1 for r in results if r['status'] == 'error')}")
+    if durations:
+        print(f"Dauer pro Formular: min {durations[0]}s, median {durations[len(durations) // 2]}s, max {durations[-1]}s")
+    print(f"Gesamtdauer:        {duration:.1f}s")
+    if duration > 0:
+        print(f"Durchsatz:          {len(results) / duration * 60:.1f} Formulare/min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Füllt viele Formulare parallel aus.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL-Datei mit einer Einreichung pro Zeile")
+    source.add_argument("--generate", type=int, help="Anzahl Einreichungen aus TEST_DATA generieren")
+    parser.add_argument("--strict", action="store_true", help="Bei ungültigen Zeilen in --input abbrechen")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Parallele Kontexte (Default: {DEFAULT_WORKERS})")
+    parser.add_argument("--results", default=RESULTS_FILE, help=f"Ergebnis-Datei (Default: {RESULTS_FILE})")
+    parser.add_argument("--headed", action="store_true", help="Browser sichtbar starten")
+    parser.add_argument("--no-block", action="store_true",
+                        help="Kein Request-Blocking, stattdessen Ressourcengrößen messen")
+    parser.add_argument("--employee-timings", help="Zeiten pro Mitarbeiter als JSONL in diese Datei schreiben")
+    parser.add_argument("--trace", help="Spans aller Schritte und Felder als JSONL schreiben")
+    parser.add_argument("--chrome-trace", help="Spans zusätzlich als Chrome-Trace (chrome://tracing, Perfetto) schreiben")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers muss mindestens 1 sein")
+    if args.generate is not None and args.generate < 1:
+        parser.error("--generate muss mindestens 1 sein")
+    fill_form.EMPLOYEE_TIMINGS_FILE = args.employee_timings
+
+    submissions = load_submissions(args.input, args.strict) if args.input else generate_submissions(args.generate)
+
+    print("=" * 50)
+    print(f"FORMULAR-AUSFÜLLER (parallel, {args.workers} Worker)")
+    print("=" * 50)
+
+    blocker = RequestBlocker(enabled=BLOCK_REQUESTS and not args.no_block)
+    if args.trace or args.chrome_trace:
+        tracing.start(args.trace, args.chrome_trace)
+    started = time.monotonic()
+    try:
+        results = run_parallel(submissions, args.workers, args.results, headless=not args.headed, blocker=blocker)
+    finally:
+        tracing.stop()
+    print_summary(results, time.monotonic() - started)
+    blocker.print_report()
+    print(f"Ergebnisse: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
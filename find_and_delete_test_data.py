@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Find test data in Airtable and delete it including all linked records.
+
+Usage:
+    python scripts/tests/find_and_delete_test_data.py
+    python scripts/tests/find_and_delete_test_data.py --delete
+
+This script searches the applications table for records whose name
+contains "Test" and collects the linked documents, employees_students,
+deals and businesses_clients from the application's link fields.
+
+Only the name and link fields are requested (fields[]), the scan follows
+Airtable's offset pagination and no linked record is fetched on its own,
+so it stays fast on bases with tens of thousands of rows. Without --delete
+the findings are only listed.
+"""
+
+import os
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+from airtable_client import AirtableClient
+from delete_test_data import delete_tables_bulk, DEFAULT_WORKERS
+
+# ============================================================
+# CONFIGURATION - Edit these values as needed
+# ============================================================
+
+# Applications whose name contains this text are treated as test data
+SEARCH_TEXT = "Test"
+
+# ============================================================
+# DO NOT EDIT BELOW THIS LINE
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+
+# Load environment variables from .env.local in project root
+load_dotenv(PROJECT_ROOT / '.env.local', override=True)
+
+AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN')
+AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
+
+client = AirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID)
+
+APPLICATION_NAME_FIELD = 'application_name'
+
+# Link fields on applications: (field, table, label), in deletion order
+LINK_FIELDS = [
+    ('documents', 'documents', 'Documents'),
+    ('link_to_students', 'employees_students', 'Employees/Students'),
+    ('link_to_deals', 'deals', 'Deals'),
+    ('businesses_clients', 'businesses_clients', 'Business Clients'),
+]
+
+
+def search_formula(search_text):
+    """Build the filterByFormula expression for the application name."""
+    escaped = search_text.replace('\\', '\\\\').replace("'", "\\'")
+    return f"FIND('{escaped}', {{{APPLICATION_NAME_FIELD}}})"
+
+
+def find_test_data(search_text=SEARCH_TEXT):
+    """Scan applications and collect the linked record IDs per table.
+
+    Returns (applications, linked) where applications is a list of
+    (id, name) and linked maps each table name to a list of record IDs.
+    """
+    fields = [APPLICATION_NAME_FIELD] + [field for field, _, _ in LINK_FIELDS]
+
+    applications = []
+    linked = {table_name: {} for _, table_name, _ in LINK_FIELDS}
+
+    for record in client.list_records('applications', search_formula(search_text), fields):
+        record_fields = record.get('fields', {})
+        applications.append((record['id'], record_fields.get(APPLICATION_NAME_FIELD, '')))
+
+        for field, table_name, _ in LINK_FIELDS:
+            for record_id in record_fields.get(field, []):
+                # dict keeps the first-seen order and drops duplicates
+                linked[table_name][record_id] = None
+
+    return applications, {table_name: list(ids) for table_name, ids in linked.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find and delete test data in Airtable.")
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Delete the records that were found"
+    )
+    parser.add_argument(
+        "--search",
+        default=SEARCH_TEXT,
+        help=f"Text to search for in {APPLICATION_NAME_FIELD} (default: {SEARCH_TEXT!r})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Parallel batch requests per table (default: {DEFAULT_WORKERS})"
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    print(f"Searching applications with {args.search!r} in {APPLICATION_NAME_FIELD}...")
+    applications, linked = find_test_data(args.search)
+
+    if not applications:
+        print("No test data found.")
+        return
+
+    print(f"\nApplications: {len(applications)}")
+    for record_id, name in applications[:20]:
+        print(f"   {record_id}  {name}")
+    if len(applications) > 20:
+        print(f"   ... and {len(applications) - 20} more")
+
+    for _, table_name, label in LINK_FIELDS:
+        print(f"{label}: {len(linked[table_name])}")
+
+    if not args.delete:
+        print("\nNothing deleted. Run with --delete to delete these records.")
+        return
+
+    grouped = [('applications', 'Applications', [record_id for record_id, _ in applications])]
+    grouped += [(table_name, label, linked[table_name]) for _, table_name, label in LINK_FIELDS]
+
+    failed_ids = delete_tables_bulk(grouped, workers=args.workers)
+
+    print("\n" + "="*50)
+    if failed_ids:
+        print(f"{len(failed_ids)} record(s) could not be deleted, run again to retry.")
+    else:
+        print("Test data cleanup complete!")
+    print("="*50)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+"""
+Erzeugt synthetische deutsche Testdaten für Formular- und Airtable-Tests.
+
+Verwendung:
+    # 1000 Firmen mit je einem Mitarbeiter, reproduzierbar über --seed
+    python generate_test_data.py --count 1000 --seed 42 --output testdaten.jsonl
+
+    # Mehrere Mitarbeiter pro Firma
+    python generate_test_data.py --count 100 --employees 3 --output testdaten.jsonl
+
+    # Direkt weiterverwenden
+    python fill_form_async.py --input testdaten.jsonl
+    python create_test_data.py --fixtures testdaten.jsonl
+
+Jede Zeile ist ein Szenario mit der Struktur von TEST_DATA in fill_form.py
+(siehe scenarios.py). Die Identitäten sind in sich stimmig:
+- IBAN mit gültiger Prüfziffer zu einer echten Bankleitzahl, passende BIC
+- PLZ, Ort und Bundesland passen zusammen
+- Sozialversicherungsnummer aus Geburtsdatum, Geburtsname und Geschlecht
+  mit gültiger Prüfziffer
+- Beschäftigungsbeginn nach dem 18. Geburtstag, Förderstart in der Zukunft
+
+Felder, die im Formular Auswahllisten mit festen Optionen sind (Branche,
+Rechtsform, Weiterbildung, Ausbildung, ...), werden nicht erzeugt und
+kommen beim Laden aus TEST_DATA.
+
+Gleicher Seed und gleiches --today ergeben dieselben Daten.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+
+# =============================================================================
+# KONFIGURATION
+# =============================================================================
+
+EMAIL_DOMAIN = "mailslurp.biz"
+
+DEFAULT_COUNT = 10
+DEFAULT_EMPLOYEES = 1
+
+# =============================================================================
+# STAMMDATEN
+# =============================================================================
+
+FIRST_NAMES = {
+    "Herr": [
+        "Alexander", "Andreas", "Benjamin", "Christian", "Daniel", "David", "Felix", "Florian",
+        "Jan", "Jonas", "Julian", "Kai", "Lukas", "Marco", "Markus", "Matthias", "Maximilian",
+        "Michael", "Niklas", "Patrick", "Paul", "Philipp", "Sebastian", "Simon", "Stefan",
+        "Thomas", "Tim", "Tobias",
+    ],
+    "Frau": [
+        "Anna", "Carolin", "Christina", "Elena", "Hannah", "Jana", "Jessica", "Julia", "Katharina",
+        "Laura", "Lea", "Lena", "Lisa", "Maria", "Marie", "Melanie", "Nadine", "Nina", "Sabine",
+        "Sandra", "Sarah", "Sophie", "Stefanie", "Vanessa", "Yvonne",
+    ],
+}
+
+LAST_NAMES = [
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz",
+    "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann",
+    "Schwarz", "Zimmermann", "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt",
+    "Werner", "Schmitz", "Krause", "Meier", "Lehmann", "Schmid", "Schulze", "Maier", "Köhler",
+    "Herrmann", "König", "Walter", "Mayer", "Huber", "Kaiser", "Fuchs", "Peters", "Lang",
+    "Scholz", "Möller", "Weiß", "Jung", "Hahn", "Vogel", "Friedrich", "Keller", "Günther",
+    "Frank", "Berger", "Winkler", "Roth", "Beck", "Lorenz", "Baumann", "Franke", "Albrecht",
+]
+
+STREETS = [
+    "Hauptstraße", "Schulstraße", "Gartenstraße", "Bahnhofstraße", "Dorfstraße", "Bergstraße",
+    "Birkenweg", "Lindenstraße", "Kirchstraße", "Waldstraße", "Ringstraße", "Schillerstraße",
+    "Goethestraße", "Jahnstraße", "Wiesenweg", "Am Markt", "Mühlenweg", "Rosenstraße",
+    "Feldstraße", "Friedhofstraße", "Poststraße", "Industriestraße", "Parkstraße", "Eichenweg",
+]
+
+# (PLZ, Ort, Bundesland)
+LOCATIONS = [
+    ("10115", "Berlin", "Berlin"),
+    ("10245", "Berlin", "Berlin"),
+    ("12043", "Berlin", "Berlin"),
+    ("20095", "Hamburg", "Hamburg"),
+    ("22765", "Hamburg", "Hamburg"),
+    ("80331", "München", "Bayern"),
+    ("81667", "München", "Bayern"),
+    ("90402", "Nürnberg", "Bayern"),
+    ("86150", "Augsburg", "Bayern"),
+    ("50667", "Köln", "Nordrhein-Westfalen"),
+    ("40213", "Düsseldorf", "Nordrhein-Westfalen"),
+    ("44135", "Dortmund", "Nordrhein-Westfalen"),
+    ("45127", "Essen", "Nordrhein-Westfalen"),
+    ("48143", "Münster", "Nordrhein-Westfalen"),
+    ("60311", "Frankfurt am Main", "Hessen"),
+    ("65183", "Wiesbaden", "Hessen"),
+    ("34117", "Kassel", "Hessen"),
+    ("70173", "Stuttgart", "Baden-Württemberg"),
+    ("68159", "Mannheim", "Baden-Württemberg"),
+    ("79098", "Freiburg im Breisgau", "Baden-Württemberg"),
+    ("76133", "Karlsruhe", "Baden-Württemberg"),
+    ("30159", "Hannover", "Niedersachsen"),
+    ("38100", "Braunschweig", "Niedersachsen"),
+    ("26122", "Oldenburg", "Niedersachsen"),
+    ("28195", "Bremen", "Bremen"),
+    ("01067", "Dresden", "Sachsen"),
+    ("04109", "Leipzig", "Sachsen"),
+    ("09111", "Chemnitz", "Sachsen"),
+    ("39104", "Magdeburg", "Sachsen-Anhalt"),
+    ("06108", "Halle (Saale)", "Sachsen-Anhalt"),
+    ("99084", "Erfurt", "Thüringen"),
+    ("07743", "Jena", "Thüringen"),
+    ("14467", "Potsdam", "Brandenburg"),
+    ("03046", "Cottbus", "Brandenburg"),
+    ("18055", "Rostock", "Mecklenburg-Vorpommern"),
+    ("19053", "Schwerin", "Mecklenburg-Vorpommern"),
+    ("24103", "Kiel", "Schleswig-Holstein"),
+    ("23552", "Lübeck", "Schleswig-Holstein"),
+    ("55116", "Mainz", "Rheinland-Pfalz"),
+    ("54290", "Trier", "Rheinland-Pfalz"),
+    ("66111", "Saarbrücken", "Saarland"),
+]
+
+# (Bankleitzahl, BIC, Name)
+BANKS = [
+    ("10010010", "PBNKDEFFXXX", "Postbank Berlin"),
+    ("10020890", "HYVEDEMM488", "UniCredit Bank - HypoVereinsbank Berlin"),
+    ("10040000", "COBADEBBXXX", "Commerzbank Berlin"),
+    ("10050000", "BELADEBEXXX", "Berliner Sparkasse"),
+    ("10070000", "DEUTDEBBXXX", "Deutsche Bank Berlin"),
+    ("12030000", "BYLADEM1001", "Deutsche Kreditbank Berlin"),
+    ("20050550", "HASPDEHHXXX", "Hamburger Sparkasse"),
+    ("37040044", "COBADEFFXXX", "Commerzbank Köln"),
+    ("37050198", "COLSDE33XXX", "Sparkasse KölnBonn"),
+    ("50010517", "INGDDEFFXXX", "ING-DiBa"),
+    ("50040000", "COBADEFFXXX", "Commerzbank Frankfurt"),
+    ("60050101", "SOLADEST600", "Baden-Württembergische Bank"),
+    ("70020270", "HYVEDEMMXXX", "UniCredit Bank - HypoVereinsbank"),
+    ("70150000", "SSKMDEMMXXX", "Stadtsparkasse München"),
+    ("86055592", "WELADE8LXXX", "Sparkasse Leipzig"),
+]
+
+# Bereichsnummern der Rentenversicherungsträger (Auswahl)
+SVNR_AREAS = ["02", "03", "04", "08", "09", "10", "11", "12", "13", "14", "15", "16", "17", "18",
+              "19", "20", "21", "23", "24", "25", "26", "28", "29", "38", "39", "40", "42", "43",
+              "44", "45", "46", "47", "48", "49", "50", "51", "52", "53", "54", "55", "56", "57",
+              "58", "59", "60", "61", "62", "63", "64", "65", "66", "67", "68", "69", "70"]
+
+SVNR_WEIGHTS = [2, 1, 2, 5, 7, 1, 2, 1, 2, 1, 2, 1]
+
+# Jobtitel mit passender Tätigkeitsbeschreibung
+JOBS = [
+    ("Softwareentwickler", "Entwicklung und Wartung von Webanwendungen und internen Tools."),
+    ("Finanzbuchhalter", "Laufende Buchhaltung, Monatsabschlüsse und Abstimmung der Konten."),
+    ("Industriekaufmann", "Einkauf, Auftragsabwicklung und Abstimmung mit Lieferanten."),
+    ("Lagerlogistiker", "Warenannahme, Kommissionierung und Bestandsführung im Lager."),
+    ("Vertriebsmitarbeiter", "Betreuung von Bestandskunden und Akquise neuer Kunden."),
+    ("Personalreferent", "Recruiting, Onboarding und Betreuung der Mitarbeitenden."),
+    ("Mechatroniker", "Wartung und Instandsetzung von Produktionsanlagen."),
+    ("Kaufmann für Büromanagement", "Organisation des Büros, Terminplanung und Korrespondenz."),
+    ("Projektmanager", "Planung und Steuerung von Kundenprojekten inklusive Budget."),
+    ("Kundenservicemitarbeiter", "Bearbeitung von Kundenanfragen per Telefon und E-Mail."),
+    ("Elektroniker", "Installation und Prüfung elektrischer Anlagen beim Kunden."),
+    ("Marketingmanager", "Planung von Kampagnen und Betreuung der Online-Kanäle."),
+    ("Pflegefachkraft", "Grund- und Behandlungspflege sowie Dokumentation."),
+    ("Steuerfachangestellter", "Erstellung von Lohnabrechnungen und Steuererklärungen."),
+]
+
+COMPANY_SUFFIXES = ["GmbH", "GmbH & Co. KG", "AG", "KG", "e.K.", "UG (haftungsbeschränkt)"]
+COMPANY_WORDS = ["Technik", "Logistik", "Service", "Consulting", "Handel", "Bau", "Solutions", "Systeme"]
+
+WEEKDAYS = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag"]
+
+# Ä/Ö/Ü zählen für die Sozialversicherungsnummer wie A/O/U
+UMLAUTS = str.maketrans("ÄÖÜ", "AOU")
+
+
+# =============================================================================
+# PRÜFZIFFERN
+# =============================================================================
+
+def iban_for(blz: str, account: str, country: str = "DE") -> str:
+    """Baut eine IBAN mit Prüfziffer (ISO 13616, Modulo 97)."""
+    bban = blz + account.zfill(10)
+    digits = "".join(str(int(c, 36)) for c in bban + country + "00")
+    return f"{country}{98 - int(digits) % 97:02d}{bban}"
+
+
+def svnr_check_digit(number: str) -> int:
+    """Prüfziffer der Sozialversicherungsnummer.
+
+    number sind die ersten 11 Stellen (Bereich, Geburtsdatum TTMMJJ,
+    Buchstabe, Seriennummer). Der Buchstabe zählt als zweistellige
+    Position im Alphabet, die Quersummen der gewichteten Stellen werden
+    addiert, die Prüfziffer ist die letzte Stelle der Summe.
+    """
+    digits = number[:8] + f"{ord(number[8]) - ord('A') + 1:02d}" + number[9:11]
+    total = sum(sum(divmod(int(d) * w, 10)) for d, w in zip(digits, SVNR_WEIGHTS))
+    return total % 10
+
+
+def svnr_for(birth_date: date, birth_name: str, gender: str, rng: random.Random) -> str:
+    """Sozialversicherungsnummer im Format "12 100590 M 003"."""
+    area = rng.choice(SVNR_AREAS)
+    letter = birth_name[0].upper().translate(UMLAUTS)
+    # Seriennummer 00-49 für Männer, 50-99 für Frauen
+    serial = rng.randint(50, 99) if gender == "Frau" else rng.randint(0, 49)
+    number = f"{area}{birth_date:%d%m%y}{letter}{serial:02d}"
+    return f"{area} {birth_date:%d%m%y} {letter} {serial:02d}{svnr_check_digit(number)}"
+
+
+# =============================================================================
+# GENERATOR
+# =============================================================================
+
+def add_years(day: date, years: int) -> date:
+    """Verschiebt ein Datum um ganze Jahre (29.02. wird in Nicht-Schaltjahren zum 28.02.)."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+class GermanDataGenerator:
+    """Erzeugt reproduzierbare deutsche Identitäten (Ansprechpartner, Firma, Mitarbeiter)."""
+
+    def __init__(self, seed: int = None, today: date = None, email_domain: str = EMAIL_DOMAIN):
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.email_domain = email_domain
+
+    def email(self) -> str:
+        return f"{uuid.UUID(int=self.rng.getrandbits(128), version=4)}@{self.email_domain}"
+
+    def phone(self) -> str:
+        # Mobilnummer ohne führende 0, wie im Formular erwartet
+        return f"1{self.rng.choice('567')}{self.rng.randint(0, 9)}{self.rng.randint(1000000, 9999999)}"
+
+    def person(self) -> dict:
+        gender = self.rng.choice(("Herr", "Frau"))
+        return {
+            "geschlecht": gender,
+            "vorname": self.rng.choice(FIRST_NAMES[gender]),
+            "nachname": self.rng.choice(LAST_NAMES),
+        }
+
+    def birth_date(self, min_age: int = 18, max_age: int = 64) -> date:
+        oldest = add_years(self.today, -max_age - 1) + timedelta(days=1)
+        youngest = add_years(self.today, -min_age)
+        return oldest + timedelta(days=self.rng.randint(0, (youngest - oldest).days))
+
+    def address(self) -> dict:
+        plz, ort, bundesland = self.rng.choice(LOCATIONS)
+        return {
+            "strasse": self.rng.choice(STREETS),
+            "hausnummer": str(self.rng.randint(1, 199)),
+            "plz": plz,
+            "ort": ort,
+            "bundesland": bundesland,
+        }
+
+    def bank(self) -> dict:
+        blz, bic, name = self.rng.choice(BANKS)
+        return {
+            "iban": iban_for(blz, str(self.rng.randint(10 ** 6, 10 ** 10 - 1))),
+            "bic": bic,
+            "bank_name": name,
+        }
+
+    def employee(self) -> dict:
+        person = self.person()
+        birth = self.birth_date()
+        # Geburtsname weicht bei einem Teil der Frauen vom Nachnamen ab
+        birth_name = ""
+        if person["geschlecht"] == "Frau" and self.rng.random() < 0.3:
+            birth_name = self.rng.choice(LAST_NAMES)
+        _, geburtsort, _ = self.rng.choice(LOCATIONS)
+
+        adult = add_years(birth, 18)
+        start = adult + timedelta(days=self.rng.randint(0, max(0, (self.today - adult).days)))
+        # Förderstart: Monatserster in 1-6 Monaten
+        month = self.today.month - 1 + self.rng.randint(1, 6)
+        foerderung_start = date(self.today.year + month // 12, month % 12 + 1, 1)
+
+        hours = self.rng.choice((20, 25, 30, 35, 38, 40))
+        days = WEEKDAYS[:5] if hours >= 30 else sorted(self.rng.sample(WEEKDAYS, 3), key=WEEKDAYS.index)
+        begin = self.rng.choice((7, 8, 9))
+        # Vier Stunden vor der Pause, der Rest danach
+        daily = round(hours / len(days))
+        job, description = self.rng.choice(JOBS)
+        address = self.address()
+        del address["bundesland"]
+
+        return {
+            **person,
+            "geburtsname": birth_name,
+            "geburtsort": geburtsort,
+            "geburtsdatum": f"{birth:%d.%m.%Y}",
+            "nationalitaet": "Deutschland",
+            "sozialversicherungsnr": svnr_for(birth, birth_name or person["nachname"], person["geschlecht"], self.rng),
+            **address,
+            "telefon": self.phone(),
+            "email": self.email(),
+            "beschaeftigung_beginn": f"{start:%d.%m.%Y}",
+            "arbeitszeit_woche": str(hours),
+            "arbeitstage": ", ".join(days),
+            "arbeitszeit_1_von": f"{begin:02d}:00",
+            "arbeitszeit_1_bis": f"{begin + 4:02d}:00",
+            "arbeitszeit_2_von": f"{begin + 5:02d}:00",
+            "arbeitszeit_2_bis": f"{begin + 1 + daily:02d}:00",
+            "arbeitsentgelt": str(self.rng.randrange(2200, 6500, 50)),
+            "jobtitel": job,
+            "taetigkeitsbeschreibung": description,
+            "foerderung_start": f"{foerderung_start:%d.%m.%Y}",
+        }
+
+    def scenario(self, employees: int = DEFAULT_EMPLOYEES) -> dict:
+        """Ein Szenario im Format von TEST_DATA (Ansprechpartner, Firma, Mitarbeiter)."""
+        contact = self.person()
+        company = f"{contact['nachname']} {self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_SUFFIXES)}"
+        counts = [self.rng.randint(0, 20) for _ in range(4)]
+        return {
+            **contact,
+            "telefon": self.phone(),
+            "email": self.email(),
+            "geburtsdatum": f"{self.birth_date(25, 64):%d.%m.%Y}",
+            "firma": company,
+            **self.address(),
+            "mitarbeiter_unter_10h": str(counts[0]),
+            "mitarbeiter_10_20h": str(counts[1]),
+            "mitarbeiter_20_30h": str(counts[2]),
+            "mitarbeiter_ueber_30h": str(counts[3] + employees),
+            **self.bank(),
+            "mitarbeiter": [self.employee() for _ in range(employees)],
+        }
+
+    def scenarios(self, count: int, employees: int = DEFAULT_EMPLOYEES):
+        for _ in range(count):
+            yield self.scenario(employees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt synthetische deutsche Testdaten als JSONL.")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help=f"Anzahl Szenarien (Default: {DEFAULT_COUNT})")
+    parser.add_argument("--employees", type=int, default=DEFAULT_EMPLOYEES,
+                        help=f"Mitarbeiter pro Szenario (Default: {DEFAULT_EMPLOYEES})")
+    parser.add_argument("--seed", type=int, help="Seed für reproduzierbare Daten")
+    parser.add_argument("--today", type=date.fromisoformat,
+                        help="Stichtag JJJJ-MM-TT für Alter und Förderstart (Default: heute)")
+    parser.add_argument("--output", help="Ausgabedatei (Default: stdout)")
+    args = parser.parse_args()
+
+    generator = GermanDataGenerator(args.seed, args.today)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    started = time.monotonic()
+    try:
+        for scenario in generator.scenarios(args.count, args.employees):
+            out.write(json.dumps(scenario, ensure_ascii=False) + "\n")
+    finally:
+        if args.output:
+            out.close()
+    duration = time.monotonic() - started
+
+    if args.output:
+        rate = args.count / duration if duration > 0 else float("inf")
+        print(f"{args.count} Szenarien in {duration:.2f}s ({rate:.0f}/s) nach {args.output} geschrieben")
+
+
+if __name__ == "__main__":
+    main()
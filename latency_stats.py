@@ -0,0 +1,94 @@
+"""
+Latency percentiles and error rates for the load and benchmark scripts.
+
+Usage:
+    from latency_stats import summarize, print_latency_summary, print_histogram
+
+    summary = summarize(results, duration)
+    print_latency_summary(summary, 'Webhook load test')
+    print_histogram([r['latency_s'] for r in results])
+
+`results` is a list of dicts with at least 'latency_s' (float) and 'ok'
+(bool), as written per request by the load generators. Percentiles use the
+nearest-rank method on the successful requests, so a burst of fast errors
+(e.g. 502 from a proxy) does not make the latency look better.
+"""
+
+import math
+
+# Upper bounds (seconds) of the histogram buckets, the last bucket is open
+DEFAULT_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600]
+HISTOGRAM_WIDTH = 40
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile (0 < p <= 100) of an ascending list, None if empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(results, duration=None, latency_key='latency_s'):
+    """Count, error rate and latency percentiles of a list of per-request results."""
+    latencies = sorted(r[latency_key] for r in results if r.get('ok') and r.get(latency_key) is not None)
+    count = len(results)
+    errors = sum(1 for r in results if not r.get('ok'))
+
+    summary = {
+        'count': count,
+        'ok': count - errors,
+        'errors': errors,
+        'error_rate': errors / count if count else 0.0,
+        'mean_s': sum(latencies) / len(latencies) if latencies else None,
+        'p50_s': percentile(latencies, 50),
+        'p95_s': percentile(latencies, 95),
+        'p99_s': percentile(latencies, 99),
+        'max_s': latencies[-1] if latencies else None,
+    }
+    if duration:
+        summary['duration_s'] = duration
+        summary['throughput_per_s'] = count / duration
+    return summary
+
+
+def format_seconds(value):
+    return '-' if value is None else f'{value:.3f}s'
+
+
+def print_latency_summary(summary, title='Latency'):
+    print("\n" + "="*50)
+    print(title)
+    print("="*50)
+    print(f"Requests:    {summary['count']} ({summary['ok']} ok, {summary['errors']} errors)")
+    print(f"Error rate:  {summary['error_rate']:.1%}")
+    print(f"Latency:     p50 {format_seconds(summary['p50_s'])}, p95 {format_seconds(summary['p95_s'])}, "
+          f"p99 {format_seconds(summary['p99_s'])}, max {format_seconds(summary['max_s'])}")
+    if 'throughput_per_s' in summary:
+        print(f"Throughput:  {summary['throughput_per_s']:.2f} requests/s over {summary['duration_s']:.1f}s")
+
+
+def histogram(values, buckets=DEFAULT_BUCKETS):
+    """Count values per bucket: [(label, count), ...], empty leading/trailing buckets dropped."""
+    counts = [0] * (len(buckets) + 1)
+    for value in values:
+        index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+        counts[index] += 1
+
+    labels = [f"<= {bound:g}s" for bound in buckets] + [f"> {buckets[-1]:g}s"]
+    rows = list(zip(labels, counts))
+    used = [i for i, count in enumerate(counts) if count]
+    if not used:
+        return []
+    return rows[used[0]:used[-1] + 1]
+
+
+def print_histogram(values, buckets=DEFAULT_BUCKETS, title='Latency distribution'):
+    rows = histogram(values, buckets)
+    if not rows:
+        return
+    largest = max(count for _, count in rows)
+    print(f"\n{title} ({len(values)} values):")
+    for label, count in rows:
+        bar = '#' * max(1 if count else 0, round(count / largest * HISTOGRAM_WIDTH))
+        print(f"  {label:>9} {count:6}  {bar}")
@@ -1,23 +1,237 @@
 #!/usr/bin/env python3
 """
 Make Queue Webhook Rerun - Sendet JSON-Payload an eine Webhook-URL.
+
+Verwendung:
+    python make_queue_webhook_rerun.py
+    python make_queue_webhook_rerun.py --replay payloads.jsonl
+    python make_queue_webhook_rerun.py --replay payloads.jsonl --concurrency 8 --rate 5
+
+Ohne Parameter wird webhook_payload.json einmal gesendet.
+
+Mit --replay wird eine JSONL-Datei (ein Payload pro Zeile) zeilenweise
+gelesen und gesendet: höchstens --concurrency Requests gleichzeitig,
+höchstens --rate Requests pro Sekunde, über eine Session mit Keep-Alive.
+429/5xx und Verbindungsfehler werden mit Backoff wiederholt.
+
+Ein Checkpoint (Default: <datei>.checkpoint.json) hält fest, welche Zeilen
+erledigt sind. Nach einem Abbruch (Strg+C) setzt derselbe Befehl dort
+fort. Pro Payload landet eine Ergebniszeile in webhook_replay_results.jsonl,
+fehlgeschlagene Payloads zusätzlich in webhook_replay_failed.jsonl (kann
+direkt wieder mit --replay gesendet werden).
 """
 
+import os
 import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
+from airtable_client import RateLimiter
+from latency_stats import print_latency_summary, summarize
+from webhooks import MAX_RETRIES, create_session, post_with_retries, webhook_url
+
 WEBHOOK_URL = "HIER_DEINE_WEBHOOK_URL_EINFUEGEN"
 PAYLOAD_FILE = "webhook_payload.json"
 
+# Replay
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5  # Requests pro Sekunde
+RESULTS_FILE = "webhook_replay_results.jsonl"
+FAILED_FILE = "webhook_replay_failed.jsonl"
+
 
 def send_webhook():
     with open(PAYLOAD_FILE, "r") as f:
         payload = json.load(f)
 
-    response = requests.post(WEBHOOK_URL, json=payload)
+    response = requests.post(webhook_url(WEBHOOK_URL), json=payload)
     print(f"Status: {response.status_code}")
     print(f"Response: {response.text}")
 
 
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+class Checkpoint:
+    """Erledigte Zeilen einer Replay-Datei.
+
+    Gespeichert werden die erste noch offene Zeile (alles davor ist erledigt)
+    und die erledigten Zeilen dahinter, die bei parallelen Requests vorher
+    fertig wurden. Die Datei wird nach jeder Zeile atomar ersetzt.
+    """
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.first_open = 1
+        self.done = set()
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Stand aus der Datei übernehmen. Gibt False zurück, wenn es keinen passenden gibt."""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        if state.get("source") != self.source:
+            print(f"[WARNUNG] Checkpoint {self.path} gehört zu {state.get('source')}, wird ignoriert")
+            return False
+        self.first_open = state["first_open"]
+        self.done = set(state["done"])
+        return True
+
+    def is_done(self, line_number):
+        return line_number < self.first_open or line_number in self.done
+
+    def mark(self, line_number):
+        with self.lock:
+            self.done.add(line_number)
+            while self.first_open in self.done:
+                self.done.remove(self.first_open)
+                self.first_open += 1
+            self.save()
+
+    def save(self):
+        state = {"source": self.source, "first_open": self.first_open, "done": sorted(self.done)}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+def read_payloads(path, checkpoint):
+    """(Zeilennummer, Payload-Text) für jede offene, nicht leere Zeile, ohne die Datei ganz zu laden."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line and not checkpoint.is_done(line_number):
+                yield line_number, line
+
+
+def replay(path, url, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, max_retries=MAX_RETRIES,
+           checkpoint=None, results_file=RESULTS_FILE, failed_file=FAILED_FILE):
+    """Sendet alle offenen Payloads aus `path` und gibt die Ergebnisse zurück."""
+    session = create_session(concurrency)
+    limiter = RateLimiter(rate, capacity=1) if rate else None
+    # Nur so viele Zeilen im Voraus lesen, wie gleich gesendet werden
+    slots = threading.BoundedSemaphore(concurrency * 2)
+    lock = threading.Lock()
+    results = []
+
+    def send(line_number, line):
+        try:
+            result = {"line": line_number}
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as e:
+                result.update(ok=False, status=None, attempts=0, latency_s=None, error=f"Ungültiges JSON: {e}")
+            else:
+                started = time.monotonic()
+                response, error, attempts = post_with_retries(session, url, payload, max_retries=max_retries)
+                result.update(
+                    ok=error is None,
+                    status=response.status_code if response is not None else None,
+                    attempts=attempts,
+                    latency_s=round(time.monotonic() - started, 3),
+                )
+                if error:
+                    result["error"] = error
+
+            with lock:
+                results.append(result)
+                results_out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                results_out.flush()
+                if not result["ok"]:
+                    failed_out.write(line + "\n")
+                    failed_out.flush()
+                if len(results) % 50 == 0:
+                    print(f"   {len(results)} Payloads gesendet")
+            checkpoint.mark(line_number)
+        finally:
+            slots.release()
+
+    with open(results_file, "a", encoding="utf-8") as results_out, \
+            open(failed_file, "a", encoding="utf-8") as failed_out, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        try:
+            for line_number, line in read_payloads(path, checkpoint):
+                slots.acquire()
+                if limiter:
+                    limiter.acquire()
+                executor.submit(send, line_number, line)
+        except KeyboardInterrupt:
+            print("\n[INFO] Abbruch - laufende Requests werden noch abgeschlossen...")
+        executor.shutdown(wait=True)
+
+    session.close()
+    return results
+
+
+def main_replay(args):
+    if os.path.abspath(args.failed) == os.path.abspath(args.replay):
+        print(f"[FEHLER] --failed darf nicht die Replay-Datei sein, z.B. --failed {args.replay}.failed.jsonl")
+        return
+
+    checkpoint = Checkpoint(args.checkpoint or f"{args.replay}.checkpoint.json", args.replay)
+    if not args.restart and checkpoint.load():
+        print(f"[INFO] Setze fort: Zeilen bis {checkpoint.first_open - 1} "
+              f"(+{len(checkpoint.done)} weitere) sind laut {checkpoint.path} erledigt")
+
+    url = webhook_url(args.url or WEBHOOK_URL)
+    print(f"URL: {url}")
+    print(f"Datei: {args.replay}, gleichzeitig: {args.concurrency}, Rate: {args.rate or 'unbegrenzt'}/s")
+
+    started = time.monotonic()
+    results = replay(args.replay, url, args.concurrency, args.rate, args.retries,
+                     checkpoint, args.results, args.failed)
+    duration = time.monotonic() - started
+
+    if not results:
+        print("[INFO] Keine offenen Payloads")
+        return
+
+    print_latency_summary(summarize(results, duration), "REPLAY")
+    retried = sum(1 for r in results if r["attempts"] > 1)
+    print(f"Wiederholt:  {retried} Payload(s)")
+    print(f"\nErgebnisse: {args.results}")
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        print(f"[FEHLER] {len(failed)} Payload(s) fehlgeschlagen, gespeichert in {args.failed}")
+    print(f"Checkpoint: {checkpoint.path} (--restart sendet alles erneut)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sendet JSON-Payloads an eine Webhook-URL.")
+    parser.add_argument("--replay", help="JSONL-Datei mit einem Payload pro Zeile")
+    parser.add_argument("--url", help="Ziel-URL (Default: WEBHOOK_URL)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximal gleichzeitige Requests (Default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help=f"Maximal Requests pro Sekunde, 0 = unbegrenzt (Default: {DEFAULT_RATE})")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES,
+                        help=f"Wiederholungen bei 429/5xx und Verbindungsfehlern (Default: {MAX_RETRIES})")
+    parser.add_argument("--checkpoint", help="Checkpoint-Datei (Default: <replay-datei>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Checkpoint ignorieren und von vorne beginnen")
+    parser.add_argument("--results", default=RESULTS_FILE, help=f"Ergebnis pro Payload (Default: {RESULTS_FILE})")
+    parser.add_argument("--failed", default=FAILED_FILE, help=f"Fehlgeschlagene Payloads (Default: {FAILED_FILE})")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    if args.rate < 0:
+        parser.error("--rate darf nicht negativ sein (0 = unbegrenzt)")
+    if args.retries < 0:
+        parser.error("--retries darf nicht negativ sein")
+
+    if args.replay:
+        main_replay(args)
+    else:
+        send_webhook()
+
+
 if __name__ == "__main__":
-    send_webhook()
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Run the whole test flow end to end for many independent lanes.
+
+Usage:
+    python scripts/tests/run_pipeline.py --lanes 4
+    python scripts/tests/run_pipeline.py --lanes 20 --skip form --workers wait=40,seed=4
+    python scripts/tests/run_pipeline.py --lanes 2 --keep
+    python scripts/tests/run_pipeline.py --lanes 4 --with sign --sign-files drive_ids.txt
+
+Each lane is one fixture that goes through the documented flow:
+
+    seed     create_test_data.py            (Airtable records)
+    form     fill_form.py                   (browser, form URL of the lane)
+    trigger  trigger_document_creation.py   (n8n webhook)
+    wait     document status 'done'         (n8n queue worker)
+    sign     simulate_pandadoc_signed.py    (Make webhook, optional)
+    unlock   schalte_kurse_frei.py          (Make webhook)
+    cleanup  delete_test_data.py            (only the records of the lane)
+
+Every stage has its own thread pool, and a lane moves on to the next
+stage as soon as it is done with the current one. The stages are thus
+pipelined: lane 2 is seeded while lane 1 fills the form or waits for its
+document. A lane that fails a stage skips the rest and is cleaned up
+(unless --keep).
+
+The sign stage only runs with --with sign: it needs its own Google Drive
+file per lane (--sign-files, one file ID per line) and sends the email of
+the lane's submission, so no two lanes sign the same document.
+
+Lanes do not share test_data_ids.json. Each lane writes its own state file
+(same flat format plus the stage timings) to pipeline_runs/<run>/, and the
+run ends with a timing summary per lane and per stage.
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+import create_test_data
+import delete_test_data
+import schalte_kurse_frei
+import simulate_pandadoc_signed
+import trigger_document_creation
+from latency_stats import format_seconds, summarize
+
+# ============================================================
+# CONFIGURATION - Edit these values as needed
+# ============================================================
+
+ALL_STAGES = ['seed', 'form', 'trigger', 'wait', 'sign', 'unlock']
+
+# 'sign' is opt-in (--with sign --sign-files ...): the signature webhook
+# needs a Google Drive file per lane, there is none in the test data and
+# sharing one file would sign the same (production) document N times.
+STAGES = ['seed', 'form', 'trigger', 'wait', 'unlock']
+OPTIONAL_STAGES = ['sign']
+
+# Threads per stage. The form stage starts one browser per thread, the
+# wait stage mostly sleeps and can run many lanes at once.
+STAGE_WORKERS = {
+    'seed': 2,
+    'form': 2,
+    'trigger': 4,
+    'wait': 20,
+    'sign': 4,
+    'unlock': 4,
+    'cleanup': 2,
+}
+
+# Waiting for the n8n queue worker to process the document
+WAIT_TIMEOUT_SECONDS = 600
+WAIT_INTERVAL_SECONDS = 5
+WAIT_DONE_STATUSES = {'done'}
+WAIT_FAILED_STATUSES = {'error'}
+
+# ============================================================
+# DO NOT EDIT BELOW THIS LINE
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+RUNS_DIR = SCRIPT_DIR / 'pipeline_runs'
+
+
+class Lane:
+    """State of one fixture on its way through the stages."""
+
+    def __init__(self, number, run_dir, formular_key, submission=None, sign_file_id=None):
+        self.number = number
+        self.formular_key = formular_key
+        self.submission = submission
+        self.sign_file_id = sign_file_id
+        self.ids = {}
+        self.timings = []
+        self.status = 'running'
+        self.state_file = run_dir / f'lane_{number:03d}.json'
+        self.started = time.monotonic()
+        self.finished = None
+
+    def record(self, stage, queued, started, finished, error=None):
+        self.timings.append({
+            'stage': stage,
+            'queue_s': round(started - queued, 3),
+            'duration_s': round(finished - started, 3),
+            'ok': error is None,
+            **({'error': error} if error else {}),
+        })
+
+    def save(self):
+        with open(self.state_file, 'w') as f:
+            json.dump({
+                **self.ids,
+                'lane': self.number,
+                'status': self.status,
+                'timings': self.timings,
+                'created_at': datetime.now().isoformat(),
+            }, f, indent=2)
+
+    def summary_line(self):
+        total = (self.finished or time.monotonic()) - self.started
+        stages = ', '.join(
+            f"{t['stage']} {t['duration_s']:.1f}s" + (f" (+{t['queue_s']:.1f}s queued)" if t['queue_s'] >= 0.1 else '')
+            + ('' if t['ok'] else ' FAILED')
+            for t in self.timings
+        )
+        return f"[Lane {self.number}] {self.status} in {total:.1f}s: {stages}"
+
+
+# ============================================================
+# STAGES
+# ============================================================
+
+def stage_seed(lane, suffix):
+    document_status = create_test_data.DOCUMENT_STATUSES[create_test_data.SELECTED_STATUS]
+    formular = create_test_data.FORMULARE[lane.formular_key]
+    fixture = create_test_data.build_fixture(document_status, formular, suffix)
+
+    lane.ids = create_test_data.create_fixtures_bulk([fixture], workers=1)[0]
+    if 'application_id' not in lane.ids:
+        raise RuntimeError("fixture is incomplete")
+
+
+def form_url_for(form_url, ids):
+    """The form URL with the deal and application of the lane."""
+    query = urlencode({'deal_id': ids['deal_id'], 'id': ids['application_id']})
+    return urlunsplit(urlsplit(form_url)._replace(query=query))
+
+
+def stage_form(lane):
+    # Only needed (and only installed) when the form stage runs
+    from playwright.sync_api import sync_playwright
+    import fill_form
+
+    url = form_url_for(fill_form.FORM_URL, lane.ids)
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            context = browser.new_context(**fill_form.CONTEXT_OPTIONS)
+            fill_form.RequestBlocker().attach(context)
+            success = fill_form.fill_form_page(context.new_page(), lane.submission, url)
+        finally:
+            browser.close()
+
+    if not success:
+        raise RuntimeError("no confirmation after submitting the form")
+
+
+def stage_trigger(lane, formular_key):
+    response = trigger_document_creation.trigger_document(
+        lane.ids['document_id'], lane.ids['employee_student_id'], formular_key
+    )
+    if not response.ok:
+        raise RuntimeError(f"webhook returned {response.status_code}: {response.text[:200]}")
+
+
+def document_status(document_id):
+    records = create_test_data.client.list_records(
+        'documents', formula=f"RECORD_ID()='{document_id}'", fields=['status']
+    )
+    for record in records:
+        return record['fields'].get('status')
+    return None
+
+
+def stage_wait(lane):
+    deadline = time.monotonic() + WAIT_TIMEOUT_SECONDS
+    while True:
+        status = document_status(lane.ids['document_id'])
+        if status in WAIT_DONE_STATUSES:
+            return
+        if status in WAIT_FAILED_STATUSES:
+            raise RuntimeError(f"document status is '{status}'")
+        if time.monotonic() + WAIT_INTERVAL_SECONDS > deadline:
+            raise RuntimeError(f"document still '{status}' after {WAIT_TIMEOUT_SECONDS}s")
+        time.sleep(WAIT_INTERVAL_SECONDS)
+
+
+def lane_email(lane, run_tag):
+    """Email of the lane's submission, or a plus-address of EMAIL unique to the lane."""
+    if lane.submission and lane.submission.get('email'):
+        return lane.submission['email']
+    local, _, domain = simulate_pandadoc_signed.EMAIL.partition('@')
+    return f"{local}+lane-{run_tag}-{lane.number:04d}@{domain}"
+
+
+def stage_sign(lane, run_tag):
+    response = simulate_pandadoc_signed.simulate_signed(email=lane_email(lane, run_tag), file_id=lane.sign_file_id)
+    if not response.ok:
+        raise RuntimeError(f"webhook returned {response.status_code}: {response.text[:200]}")
+
+
+def stage_unlock(lane):
+    if not schalte_kurse_frei.schalte_kurse_frei(lane.ids['employee_student_id']):
+        raise RuntimeError("unlocking the courses failed")
+
+
+def stage_cleanup(lane):
+    grouped = delete_test_data.group_ids_by_table([lane.ids])
+    failed_ids = delete_test_data.delete_tables_bulk(grouped, workers=1)
+    if failed_ids:
+        lane.ids = {key: value for key, value in lane.ids.items() if value in failed_ids}
+        raise RuntimeError(f"{len(failed_ids)} record(s) could not be deleted")
+    lane.ids = {}
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+class Pipeline:
+    """Runs lanes through the stages, one thread pool per stage."""
+
+    def __init__(self, stages, workers, run_tag, formular_key, keep=False):
+        self.stages = stages
+        self.run_tag = run_tag
+        self.formular_key = formular_key
+        self.keep = keep
+        self.executors = {
+            name: ThreadPoolExecutor(max_workers=workers[name], thread_name_prefix=name)
+            for name in stages + ['cleanup']
+        }
+        self.functions = {
+            'seed': lambda lane: stage_seed(lane, f' {run_tag}-{lane.number:04d}'),
+            'form': stage_form,
+            'trigger': lambda lane: stage_trigger(lane, formular_key),
+            'wait': stage_wait,
+            'sign': lambda lane: stage_sign(lane, run_tag),
+            'unlock': stage_unlock,
+            'cleanup': stage_cleanup,
+        }
+        self.lanes = []
+        self.pending = 0
+        self.all_done = threading.Condition()
+
+    def run(self, lanes):
+        self.lanes = lanes
+        self.pending = len(lanes)
+        for lane in lanes:
+            self.submit(lane, self.stages[0])
+
+        with self.all_done:
+            self.all_done.wait_for(lambda: self.pending == 0)
+        for executor in self.executors.values():
+            executor.shutdown()
+
+    def submit(self, lane, stage):
+        self.executors[stage].submit(self.run_stage, lane, stage, time.monotonic())
+
+    def run_stage(self, lane, stage, queued):
+        started = time.monotonic()
+        print(f"[Lane {lane.number}] {stage}...")
+        error = None
+        try:
+            self.functions[stage](lane)
+        except Exception as e:
+            error = f"{e.__class__.__name__}: {e}"
+            print(f"[Lane {lane.number}] {stage} failed: {error}")
+        lane.record(stage, queued, started, time.monotonic(), error)
+
+        if error and stage != 'cleanup':
+            lane.status = f'failed in {stage}'
+        elif error:
+            lane.status = 'cleanup failed'
+        lane.save()
+
+        next_stage = self.next_stage(lane, stage, failed=error is not None)
+        if next_stage:
+            self.submit(lane, next_stage)
+        else:
+            self.finish(lane)
+
+    def next_stage(self, lane, stage, failed):
+        if stage == 'cleanup':
+            return None
+        if not failed:
+            index = self.stages.index(stage) + 1
+            if index < len(self.stages):
+                return self.stages[index]
+        if self.keep or not lane.ids:
+            return None
+        return 'cleanup'
+
+    def finish(self, lane):
+        if lane.status == 'running':
+            lane.status = 'done'
+        lane.finished = time.monotonic()
+        lane.save()
+        print(lane.summary_line())
+        with self.all_done:
+            self.pending -= 1
+            self.all_done.notify_all()
+
+
+def print_stage_summary(lanes, stages, duration):
+    print("\n" + "="*50)
+    print("PIPELINE SUMMARY")
+    print("="*50)
+
+    done = sum(1 for lane in lanes if lane.status == 'done')
+    print(f"Lanes: {len(lanes)} ({done} done, {len(lanes) - done} failed)")
+    print(f"\n{'stage':>8} {'runs':>5} {'failed':>6} {'p50':>8} {'p95':>8} {'max':>8} {'queued p95':>11}")
+    for stage in stages + ['cleanup']:
+        timings = [t for lane in lanes for t in lane.timings if t['stage'] == stage]
+        if not timings:
+            continue
+        summary = summarize(timings, latency_key='duration_s')
+        queued = summarize([{**t, 'ok': True} for t in timings], latency_key='queue_s')
+        print(f"{stage:>8} {summary['count']:5} {summary['errors']:6} {format_seconds(summary['p50_s']):>8} "
+              f"{format_seconds(summary['p95_s']):>8} {format_seconds(summary['max_s']):>8} "
+              f"{format_seconds(queued['p95_s']):>11}")
+
+    sequential = sum(t['duration_s'] for lane in lanes for t in lane.timings)
+    print(f"\nWall time:       {duration:.1f}s")
+    print(f"Sum of stages:   {sequential:.1f}s (one lane after the other)")
+    if duration > 0:
+        print(f"Throughput:      {len(lanes) / duration * 60:.1f} lanes/min")
+
+
+def parse_workers(value):
+    """Parse "wait=40,seed=4" into a dict. Raises ValueError for unknown stages and counts below 1."""
+    workers = {}
+    for part in value.split(','):
+        name, _, count = part.partition('=')
+        name = name.strip()
+        if name not in ALL_STAGES + ['cleanup']:
+            raise ValueError(f"unknown stage {name!r} in {part!r}")
+        try:
+            workers[name] = int(count)
+        except ValueError:
+            raise ValueError(f"thread count in {part!r} is not an integer") from None
+        if workers[name] < 1:
+            raise ValueError(f"thread count in {part!r} must be at least 1")
+    return workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the whole test flow for many lanes in parallel.')
+    parser.add_argument('--lanes', type=int, default=1, help='Number of independent lanes (default: 1)')
+    parser.add_argument('--skip', default='', help=f'Comma-separated stages to skip ({", ".join(STAGES)})')
+    parser.add_argument('--with', dest='extra', default='', help=f'Comma-separated optional stages to add ({", ".join(OPTIONAL_STAGES)})')
+    parser.add_argument('--sign-files', help='File with one Google Drive file ID per lane (required for the sign stage)')
+    parser.add_argument('--workers', default='', help='Threads per stage, e.g. "wait=40,form=4"')
+    parser.add_argument('--formular', type=int, default=trigger_document_creation.SELECTED_FORMULAR,
+                        help=f'Formular of the document creation webhook (default: {trigger_document_creation.SELECTED_FORMULAR})')
+    parser.add_argument('--keep', action='store_true', help='Keep the Airtable records (no cleanup stage)')
+    args = parser.parse_args()
+    if args.lanes < 1:
+        parser.error("--lanes must be at least 1")
+    try:
+        worker_overrides = parse_workers(args.workers) if args.workers else {}
+    except ValueError as e:
+        parser.error(f"--workers: {e}")
+
+    skip = {name.strip() for name in args.skip.split(',') if name.strip()}
+    extra = {name.strip() for name in args.extra.split(',') if name.strip()}
+    unknown = (skip - set(ALL_STAGES)) | (extra - set(OPTIONAL_STAGES))
+    if unknown:
+        print(f"Error: Unknown stage(s) {sorted(unknown)}, available: {', '.join(STAGES)}, "
+              f"optional: {', '.join(OPTIONAL_STAGES)}")
+        return
+    stages = [stage for stage in ALL_STAGES if (stage in STAGES or stage in extra) and stage not in skip]
+    if 'seed' not in stages:
+        print("Error: The seed stage cannot be skipped, every lane needs its own records.")
+        return
+    workers = {**STAGE_WORKERS, **worker_overrides}
+
+    run_tag = datetime.now().strftime('%Y%m%d%H%M%S')
+    run_dir = RUNS_DIR / run_tag
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    sign_file_ids = [None] * args.lanes
+    if 'sign' in stages:
+        if not args.sign_files:
+            print("Error: The sign stage needs --sign-files with one Google Drive file ID per lane.")
+            return
+        with open(args.sign_files, 'r') as f:
+            file_ids = [line.strip() for line in f if line.strip()]
+        if len(file_ids) < args.lanes:
+            print(f"Error: {args.sign_files} has {len(file_ids)} file ID(s) for {args.lanes} lane(s).")
+            return
+        sign_file_ids = file_ids[:args.lanes]
+
+    submissions = [None] * args.lanes
+    if 'form' in stages:
+        from fill_form_parallel import generate_submissions
+        submissions = list(generate_submissions(args.lanes))
+
+    # Spread the fixtures across the Formulare like create_test_data.py --count N
+    formular_keys = sorted(create_test_data.FORMULARE)
+    lanes = [
+        Lane(n + 1, run_dir, formular_keys[n % len(formular_keys)], submissions[n], sign_file_ids[n])
+        for n in range(args.lanes)
+    ]
+
+    print(f"Pipeline run {run_tag}: {args.lanes} lane(s)")
+    print(f"Stages: {' -> '.join(stages)}{'' if args.keep else ' -> cleanup'}")
+    print(f"Threads: {', '.join(f'{name}={workers[name]}' for name in stages + ['cleanup'])}")
+
+    started = time.monotonic()
+    Pipeline(stages, workers, run_tag, args.formular, keep=args.keep).run(lanes)
+    duration = time.monotonic() - started
+
+    print_stage_summary(lanes, stages, duration)
+    create_test_data.client.print_stats()
+    print(f"\nLane state files: {run_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+Testszenarien für die Formular-Ausfüller aus einer JSONL-Datei.
+
+Verwendung:
+    from scenarios import load_scenarios
+
+    for scenario in load_scenarios("szenarien.jsonl"):
+        fill_form_page(page, scenario)
+
+    # Datei nur prüfen
+    python scenarios.py szenarien.jsonl
+
+Jede Zeile ist ein Szenario mit der Struktur von TEST_DATA in fill_form.py.
+Fehlende Schlüssel werden aus TEST_DATA übernommen, jeder Eintrag in
+"mitarbeiter" wird über den Standard-Mitarbeiter aus TEST_DATA gelegt.
+Optional sind "scenario" (Name für Logs) und "form_url".
+
+Die Datei wird zeilenweise gelesen, auch sehr große Dateien brauchen also
+nur Speicher für ein Szenario. Ungültige Zeilen werden mit Begründung
+übersprungen (oder brechen mit strict=True den Lauf ab).
+"""
+
+import argparse
+import json
+import re
+from datetime import datetime
+
+from fill_form import TEST_DATA
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+DEFAULT_EMPLOYEE = TEST_DATA["mitarbeiter"][0]
+
+# Zusätzliche Schlüssel, die es in TEST_DATA nicht gibt
+EXTRA_KEYS = {"scenario": str, "form_url": str}
+
+JA_NEIN = {"Ja", "Nein"}
+GESCHLECHT = {"Herr", "Frau", "divers, keine Angaben"}
+
+CHOICES = {
+    "geschlecht": GESCHLECHT,
+    "betriebsnummer_vorhanden": JA_NEIN,
+    "eservice_zugang": JA_NEIN,
+    "betriebsvereinbarung": JA_NEIN,
+}
+
+EMPLOYEE_CHOICES = {
+    "geschlecht": GESCHLECHT,
+    "schwerbehinderung": JA_NEIN,
+    "kurzarbeitergeld": JA_NEIN,
+    "befristet": JA_NEIN,
+    "befristete_arbeitserlaubnis": JA_NEIN,
+    "mehr_als_4_jahre": JA_NEIN,
+    "ausbildung_vorhanden": JA_NEIN,
+    "kostenuebernahme_dritter": JA_NEIN,
+    "fortbestand_arbeitsverhaeltnis": JA_NEIN,
+    "freistellung_bescheinigt": JA_NEIN,
+    "bedarfsgemeinschaft": JA_NEIN,
+    "bildungsgutschein": JA_NEIN,
+    "eingliederungszuschuss": JA_NEIN,
+}
+
+DATE_FIELDS = {"geburtsdatum"}
+EMPLOYEE_DATE_FIELDS = {"geburtsdatum", "beschaeftigung_beginn", "foerderung_start"}
+
+# Felder, die nur aus Ziffern bestehen dürfen (leer ist erlaubt)
+DIGIT_FIELDS = {
+    "telefon", "plz",
+    "mitarbeiter_unter_10h", "mitarbeiter_10_20h", "mitarbeiter_20_30h", "mitarbeiter_ueber_30h",
+}
+EMPLOYEE_DIGIT_FIELDS = {"telefon", "plz", "arbeitszeit_woche", "arbeitsentgelt"}
+
+TIME_PATTERN = re.compile(r"^\d{2}:\d{2}$")
+EMPLOYEE_TIME_FIELDS = {"arbeitszeit_1_von", "arbeitszeit_1_bis", "arbeitszeit_2_von", "arbeitszeit_2_bis"}
+
+
+class ScenarioError(ValueError):
+    """Ein Szenario entspricht nicht dem Schema."""
+
+
+def iban_is_valid(iban: str) -> bool:
+    """Prüft Format und Prüfziffer (ISO 13616, Modulo 97) einer IBAN."""
+    iban = iban.replace(" ", "").upper()
+    if not re.fullmatch(r"[A-Z]{2}\d{2}[A-Z0-9]{11,30}", iban):
+        return False
+    digits = "".join(str(int(c, 36)) for c in iban[4:] + iban[:4])
+    return int(digits) % 97 == 1
+
+
+def is_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%d.%m.%Y")
+        return True
+    except ValueError:
+        return False
+
+
+def check_fields(data: dict, defaults: dict, extra: dict, choices: dict, dates: set, digits: set,
+                 prefix: str = "") -> list:
+    """Prüft Schlüssel, Typen und Werte eines (Mitarbeiter-)Dicts gegen die Defaults."""
+    errors = []
+    for key, value in data.items():
+        expected = defaults.get(key)
+        if expected is None and key not in extra:
+            errors.append(f"{prefix}{key}: unbekanntes Feld")
+            continue
+        expected_type = extra[key] if key in extra else type(expected)
+        if not isinstance(value, expected_type):
+            errors.append(f"{prefix}{key}: {expected_type.__name__} erwartet, nicht {type(value).__name__}")
+            continue
+        if key in choices and value not in choices[key]:
+            errors.append(f"{prefix}{key}: {value!r} nicht in {sorted(choices[key])}")
+        elif key in dates and value and not is_date(value):
+            errors.append(f"{prefix}{key}: {value!r} ist kein Datum TT.MM.JJJJ")
+        elif key in digits and value and not value.isdigit():
+            errors.append(f"{prefix}{key}: {value!r} enthält nicht nur Ziffern")
+    return errors
+
+
+def validate_scenario(scenario: dict) -> list:
+    """Prüft ein (mit den Defaults zusammengeführtes) Szenario.
+
+    Returns:
+        Liste der Fehler, leer wenn das Szenario gültig ist
+    """
+    errors = check_fields(
+        {k: v for k, v in scenario.items() if k != "mitarbeiter"},
+        TEST_DATA, EXTRA_KEYS, CHOICES, DATE_FIELDS, DIGIT_FIELDS
+    )
+
+    if scenario.get("betriebsnummer_vorhanden") == "Ja" and not scenario.get("betriebsnummer"):
+        errors.append("betriebsnummer: Pflicht, wenn betriebsnummer_vorhanden = Ja")
+    if scenario.get("email") and "@" not in scenario["email"]:
+        errors.append(f"email: {scenario['email']!r} ist keine E-Mail-Adresse")
+    if scenario.get("iban") and not iban_is_valid(scenario["iban"]):
+        errors.append(f"iban: {scenario['iban']!r} hat ein falsches Format oder eine falsche Prüfziffer")
+
+    employees = scenario.get("mitarbeiter")
+    if not isinstance(employees, list) or not employees:
+        errors.append("mitarbeiter: Liste mit mindestens einem Mitarbeiter erwartet")
+        return errors
+
+    for i, employee in enumerate(employees, 1):
+        prefix = f"mitarbeiter[{i}]."
+        if not isinstance(employee, dict):
+            errors.append(f"{prefix[:-1]}: Objekt erwartet")
+            continue
+        errors += check_fields(employee, DEFAULT_EMPLOYEE, {}, EMPLOYEE_CHOICES,
+                               EMPLOYEE_DATE_FIELDS, EMPLOYEE_DIGIT_FIELDS, prefix)
+        for key in EMPLOYEE_TIME_FIELDS:
+            value = employee.get(key)
+            if isinstance(value, str) and value and not TIME_PATTERN.match(value):
+                errors.append(f"{prefix}{key}: {value!r} ist keine Uhrzeit HH:MM")
+        if employee.get("email") and "@" not in str(employee["email"]):
+            errors.append(f"{prefix}email: {employee['email']!r} ist keine E-Mail-Adresse")
+
+    return errors
+
+
+def merge_scenario(raw: dict) -> dict:
+    """Legt ein Szenario über TEST_DATA (Mitarbeiter einzeln über den Standard-Mitarbeiter)."""
+    # Flache Kopien reichen: außer "mitarbeiter" sind alle Werte unveränderlich
+    scenario = {**TEST_DATA, **raw}
+    employees = raw.get("mitarbeiter", TEST_DATA["mitarbeiter"])
+    if isinstance(employees, list):
+        scenario["mitarbeiter"] = [
+            {**DEFAULT_EMPLOYEE, **employee} if isinstance(employee, dict) else employee
+            for employee in employees
+        ]
+    return scenario
+
+
+# =============================================================================
+# LADEN
+# =============================================================================
+
+def load_scenarios(path: str, strict: bool = False):
+    """Liest Szenarien zeilenweise, prüft sie und liefert sie einzeln.
+
+    Args:
+        path: JSONL-Datei mit einem Szenario pro Zeile
+        strict: True = ScenarioError bei der ersten ungültigen Zeile,
+            False = ungültige Zeilen mit Warnung überspringen
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors = [f"kein gültiges JSON ({e})"]
+            else:
+                if isinstance(raw, dict):
+                    scenario = merge_scenario(raw)
+                    errors = validate_scenario(scenario)
+                else:
+                    errors = ["Objekt erwartet"]
+
+            if errors:
+                message = f"{path}:{line_no}: " + "; ".join(errors)
+                if strict:
+                    raise ScenarioError(message)
+                print(f"[WARNUNG] Szenario übersprungen - {message}")
+                continue
+
+            yield scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prüft eine JSONL-Datei mit Testszenarien.")
+    parser.add_argument("path", help="JSONL-Datei mit einem Szenario pro Zeile")
+    args = parser.parse_args()
+
+    valid = 0
+    employees = 0
+    for scenario in load_scenarios(args.path):
+        valid += 1
+        employees += len(scenario["mitarbeiter"])
+
+    print(f"Gültige Szenarien: {valid} ({employees} Mitarbeiter)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,31 @@ Verwendung:
 
     2. Oder ID als Parameter übergeben:
        python schalte_kurse_frei.py rec123ABC456
+
+    3. Viele Studenten auf einmal (Batch):
+       python schalte_kurse_frei.py --datei kohorte.txt
+       cat kohorte.txt | python schalte_kurse_frei.py --datei -
+       python schalte_kurse_frei.py --view "Kursstart heute"
+       python schalte_kurse_frei.py --formel "IS_SAME({start_date}, TODAY(), 'day')"
+
+Im Batch-Modus laufen bis zu --concurrency Anfragen gleichzeitig über eine
+Session mit Keep-Alive. 429/5xx und Verbindungsfehler werden mit Backoff
+wiederholt. Am Ende steht eine Zusammenfassung, fehlgeschlagene IDs landen
+in kurse_frei_fehler.txt (wieder mit --datei nutzbar).
 """
 
+import os
 import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import requests
 
+from latency_stats import format_seconds, percentile
+from webhooks import MAX_RETRIES, create_session, post_with_retries, webhook_url
+
 # =============================================================================
 # KONFIGURATION
 # =============================================================================
@@ -20,6 +40,11 @@ MAKE_WEBHOOK_URL = "https://hook.eu1.make.com/nh9qkxqofgmcfrah8ntk6ka676ur7480"
 
 STUDENT_RECORD_ID = "reczDH8zu7N5O4y1M"  # Hier die Student-ID eintragen
 
+# Batch
+DEFAULT_CONCURRENCY = 10
+STUDENTS_TABLE = "employees_students"
+FAILED_FILE = "kurse_frei_fehler.txt"
+
 
 # =============================================================================
 # HAUPTFUNKTION
@@ -42,7 +67,7 @@ def schalte_kurse_frei(student_record_id: str) -> bool:
     }
 
     try:
-        response = requests.post(MAKE_WEBHOOK_URL, json=payload, timeout=30)
+        response = requests.post(webhook_url(MAKE_WEBHOOK_URL), json=payload, timeout=30)
 
         if response.ok:
             print(f"[OK] Kurse freigeschaltet (Status: {response.status_code})")
@@ -61,12 +86,141 @@ def schalte_kurse_frei(student_record_id: str) -> bool:
         return False
 
 
-if __name__ == "__main__":
-    # Nimm ID aus Kommandozeile oder aus der Konfiguration
-    if len(sys.argv) >= 2:
-        student_id = sys.argv[1]
+# =============================================================================
+# BATCH
+# =============================================================================
+
+def lese_ids(pfad: str) -> list:
+    """Record-IDs aus einer Datei (eine pro Zeile, '-' = stdin), ohne Leerzeilen, Kommentare und Duplikate."""
+    if pfad == "-":
+        zeilen = sys.stdin.read().splitlines()
+    else:
+        with open(pfad, "r", encoding="utf-8") as f:
+            zeilen = f.read().splitlines()
+    ids = [zeile.split("#", 1)[0].strip() for zeile in zeilen]
+    return list(dict.fromkeys(record_id for record_id in ids if record_id))
+
+
+def ids_aus_airtable(view: str = None, formel: str = None) -> list:
+    """Record-IDs der Studenten aus einer Airtable-View und/oder per Formel."""
+    from dotenv import load_dotenv
+    from airtable_client import AirtableClient
+
+    project_root = Path(__file__).parent.parent.parent
+    load_dotenv(project_root / '.env.local', override=True)
+    client = AirtableClient(os.getenv('AIRTABLE_TOKEN'), os.getenv('AIRTABLE_BASE_ID'))
+
+    # Nur die IDs werden gebraucht, ein beliebiges Feld hält die Antwort klein
+    records = client.list_records(STUDENTS_TABLE, formula=formel, fields=["first_name"], view=view)
+    return [record["id"] for record in records]
+
+
+def schalte_kurse_frei_batch(student_ids: list, concurrency: int = DEFAULT_CONCURRENCY,
+                             max_retries: int = MAX_RETRIES) -> list:
+    """
+    Sendet alle Student-IDs parallel an den Make.com Webhook.
+
+    Returns:
+        Ein Ergebnis pro Student (student_record_id, ok, status, attempts, latency_s, error)
+    """
+    url = webhook_url(MAKE_WEBHOOK_URL)
+    session = create_session(concurrency)
+
+    def senden(student_record_id):
+        started = time.monotonic()
+        response, error, attempts = post_with_retries(
+            session, url, {"student_record_id": student_record_id}, max_retries=max_retries
+        )
+        ergebnis = {
+            "student_record_id": student_record_id,
+            "ok": error is None,
+            "status": response.status_code if response is not None else None,
+            "attempts": attempts,
+            "latency_s": round(time.monotonic() - started, 3),
+        }
+        if error:
+            ergebnis["error"] = error
+            print(f"[FEHLER] {student_record_id}: {error}")
+        else:
+            print(f"[OK] {student_record_id}" + (f" ({attempts} Versuche)" if attempts > 1 else ""))
+        return ergebnis
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        ergebnisse = list(executor.map(senden, student_ids))
+    session.close()
+    return ergebnisse
+
+
+def zusammenfassung(ergebnisse: list, dauer: float, fehler_datei: str = FAILED_FILE):
+    """Gibt die Zusammenfassung aus und schreibt die fehlgeschlagenen IDs in eine Datei."""
+    ok = [e for e in ergebnisse if e["ok"]]
+    fehler = [e for e in ergebnisse if not e["ok"]]
+    latenzen = sorted(e["latency_s"] for e in ok)
+
+    print("\n" + "=" * 50)
+    print("ZUSAMMENFASSUNG")
+    print("=" * 50)
+    print(f"Studenten:   {len(ergebnisse)} in {dauer:.1f}s")
+    print(f"Erfolgreich: {len(ok)}")
+    print(f"Fehler:      {len(fehler)}")
+    print(f"Wiederholt:  {sum(1 for e in ergebnisse if e['attempts'] > 1)}")
+    print(f"Latenz:      p50 {format_seconds(percentile(latenzen, 50))}, "
+          f"p95 {format_seconds(percentile(latenzen, 95))}")
+
+    if fehler:
+        with open(fehler_datei, "w", encoding="utf-8") as f:
+            for e in fehler:
+                f.write(f"{e['student_record_id']}  # {e.get('error', '')[:100]}\n")
+        print(f"\n[FEHLER] Fehlgeschlagene IDs gespeichert in {fehler_datei}")
+        print(f"Erneut versuchen: python schalte_kurse_frei.py --datei {fehler_datei}")
+    elif os.path.exists(fehler_datei):
+        # Fehler eines früheren Laufs sind erledigt
+        os.remove(fehler_datei)
+
+
+def main_batch(args) -> bool:
+    if args.datei:
+        student_ids = lese_ids(args.datei)
     else:
-        student_id = STUDENT_RECORD_ID
+        print(f"Lade Studenten aus Airtable ({STUDENTS_TABLE})...")
+        student_ids = ids_aus_airtable(args.view, args.formel)
+
+    if not student_ids:
+        print("[INFO] Keine Studenten gefunden")
+        return True
+
+    print(f"Schalte Kurse für {len(student_ids)} Studenten frei ({args.concurrency} gleichzeitig)...")
+    started = time.monotonic()
+    ergebnisse = schalte_kurse_frei_batch(student_ids, args.concurrency, args.retries)
+    zusammenfassung(ergebnisse, time.monotonic() - started, args.fehler)
+    return all(e["ok"] for e in ergebnisse)
 
-    success = schalte_kurse_frei(student_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Schaltet Kurse für Studenten frei via Make.com Webhook.")
+    parser.add_argument("student_id", nargs="?", default=STUDENT_RECORD_ID,
+                        help="Student-ID (Default: STUDENT_RECORD_ID)")
+    quelle = parser.add_mutually_exclusive_group()
+    quelle.add_argument("--datei", help="Datei mit einer Student-ID pro Zeile ('-' = stdin)")
+    quelle.add_argument("--view", help=f"Alle Studenten dieser Airtable-View ({STUDENTS_TABLE})")
+    parser.add_argument("--formel", help="Airtable-Formel für die Studenten (allein oder zusätzlich zu --view)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximal gleichzeitige Anfragen (Default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--retries", type=int, default=MAX_RETRIES,
+                        help=f"Wiederholungen bei 429/5xx und Verbindungsfehlern (Default: {MAX_RETRIES})")
+    parser.add_argument("--fehler", default=FAILED_FILE, help=f"Datei für fehlgeschlagene IDs (Default: {FAILED_FILE})")
+    args = parser.parse_args()
+
+    if args.datei and args.formel:
+        parser.error("--formel geht nur allein oder mit --view")
+    if args.concurrency < 1:
+        parser.error("--concurrency muss mindestens 1 sein")
+    if args.retries < 0:
+        parser.error("--retries darf nicht negativ sein")
+
+    if args.datei or args.view or args.formel:
+        success = main_batch(args)
+    else:
+        # Nimm ID aus Kommandozeile oder aus der Konfiguration
+        success = schalte_kurse_frei(args.student_id)
     sys.exit(0 if success else 1)
@@ -11,6 +11,8 @@ Usage:
 
 import requests
 
+from webhooks import webhook_url
+
 # ============================================================
 # CONFIGURATION - Edit these values as needed
 # ============================================================
@@ -37,19 +39,23 @@ WEBHOOK_URL = "https://hook.eu1.make.com/j7poahnr90vxqm1yqo1fknl5cnfftaxb"
 # ============================================================
 
 
-def main():
+def simulate_signed(email=EMAIL, file_id=FILE_ID):
+    """Send the signature webhook and return the response."""
     payload = {
-        "email": EMAIL,
-        "file_id": FILE_ID
+        "email": email,
+        "file_id": file_id
     }
+    return requests.post(webhook_url(WEBHOOK_URL), json=payload, timeout=30)
 
+
+def main():
     print(f"Calling Make webhook...")
-    print(f"URL: {WEBHOOK_URL}")
+    print(f"URL: {webhook_url(WEBHOOK_URL)}")
     print(f"Email: {EMAIL}")
     print(f"File ID: {FILE_ID or '(empty)'}")
 
     print("\nSending POST request...")
-    response = requests.post(WEBHOOK_URL, json=payload)
+    response = simulate_signed()
 
     print(f"\nStatus: {response.status_code}")
     print(f"Response: {response.text}")
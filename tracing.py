@@ -0,0 +1,327 @@
+"""
+Zeitmessung in Spans für die Formular-Ausfüller, Export als JSONL und Chrome-Trace.
+
+Verwendung:
+    import tracing
+
+    tracing.start("trace.jsonl", chrome_file="trace.json")
+
+    with tracing.span("submission", index=1):
+        ...
+
+    @tracing.traced(attrs=("aria_label",))
+    def fill_by_aria(page, aria_label, value):
+        ...
+
+    tracing.stop()   # schreibt den Chrome-Trace und gibt die Zusammenfassung aus
+
+    # Trace auswerten bzw. mit einem älteren Lauf vergleichen
+    python tracing.py trace.jsonl
+    python tracing.py trace.jsonl --baseline trace_alt.jsonl
+
+Spans verschachteln sich automatisch (über contextvars, also auch in
+Threads und asyncio-Tasks). Jeder Span ohne Eltern-Span eröffnet eine
+eigene Spur ("lane"), im Chrome-Trace erscheint jede Einreichung so in
+einer eigenen Zeile. Ohne start() ist das Tracing aus und kostet nur
+einen Funktionsaufruf.
+
+Die Chrome-Trace-Datei lässt sich in chrome://tracing oder
+https://ui.perfetto.dev öffnen.
+"""
+
+import argparse
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import threading
+import time
+
+_current = contextvars.ContextVar("tracing_span", default=None)
+
+
+# =============================================================================
+# SPANS
+# =============================================================================
+
+class Span:
+    """Ein gemessener Abschnitt. Als Kontextmanager oder über Steps nutzbar."""
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.id = None
+        self.parent = None
+        self.steps = []
+
+    def __enter__(self):
+        self.parent = _current.get()
+        self.id = next(self.tracer.ids)
+        self.lane = self.parent.lane if self.parent else self.id
+        self.started = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Offene Schritte (z.B. nach einer Exception) mit abschließen
+        for step in reversed(self.steps):
+            step.__exit__(exc_type, exc, tb)
+        self.steps = []
+
+        duration = time.perf_counter() - self.started
+        _current.reset(self._token)
+        self.tracer.record({
+            "name": self.name,
+            "span_id": self.id,
+            "parent_id": self.parent.id if self.parent else None,
+            "lane": self.lane,
+            "start_s": round(self.started - self.tracer.started, 6),
+            "duration_s": round(duration, 6),
+            "status": "error" if exc_type else "ok",
+            **({"error": f"{exc_type.__name__}: {exc}"} if exc_type else {}),
+            "attrs": self.attrs,
+        })
+        return False
+
+
+class _NoSpan:
+    """Platzhalter, wenn das Tracing aus ist."""
+
+    steps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class Steps:
+    """Aufeinanderfolgende Schritte ohne Einrückung, z.B. [3/10] ... [10/10].
+
+        steps = tracing.Steps()
+        steps.next("3/10 Persönliche Daten")
+        ...
+        steps.next("4/10 Unternehmensdaten")
+        ...
+        steps.end()
+
+    next() beendet den vorigen Schritt und startet den nächsten. Endet der
+    umgebende Span vorher (z.B. durch eine Exception), werden offene
+    Schritte dort mit abgeschlossen.
+    """
+
+    def __init__(self):
+        self.current = None
+
+    def next(self, name: str, **attrs):
+        self.end()
+        parent = _current.get()
+        self.current = span(name, **attrs).__enter__()
+        if self.current is not NO_SPAN and parent is not None:
+            parent.steps.append(self.current)
+
+    def end(self):
+        step, self.current = self.current, None
+        if step is None or step is NO_SPAN:
+            return
+        if step.parent is not None and step in step.parent.steps:
+            step.parent.steps.remove(step)
+        step.__exit__(None, None, None)
+
+
+# =============================================================================
+# TRACER
+# =============================================================================
+
+class Tracer:
+    """Sammelt Spans und schreibt sie als JSON-Zeilen (sofort) und als Chrome-Trace (bei close)."""
+
+    def __init__(self, jsonl_file: str = None, chrome_file: str = None):
+        self.jsonl_file = jsonl_file
+        self.chrome_file = chrome_file
+        self.started = time.perf_counter()
+        self.ids = itertools.count(1)
+        self.records = []
+        self.lock = threading.Lock()
+        self.out = open(jsonl_file, "w", encoding="utf-8") if jsonl_file else None
+
+    def record(self, entry: dict):
+        with self.lock:
+            self.records.append(entry)
+            if self.out:
+                self.out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.out.flush()
+
+    def close(self):
+        if self.out:
+            self.out.close()
+            self.out = None
+        if self.chrome_file:
+            write_chrome_trace(self.records, self.chrome_file)
+
+
+_tracer = None
+
+
+def start(jsonl_file: str = None, chrome_file: str = None) -> Tracer:
+    """Schaltet das Tracing ein. Ohne Dateien werden die Spans nur im Speicher gesammelt."""
+    global _tracer
+    _tracer = Tracer(jsonl_file, chrome_file)
+    return _tracer
+
+
+def stop(summary: bool = True):
+    """Schaltet das Tracing aus, schreibt den Chrome-Trace und gibt die Zusammenfassung aus."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.close()
+    if summary:
+        print_summary(tracer.records)
+    if tracer.jsonl_file:
+        print(f"Trace (JSONL): {tracer.jsonl_file}")
+    if tracer.chrome_file:
+        print(f"Trace (Chrome/Perfetto): {tracer.chrome_file}")
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **attrs):
+    """Kontextmanager für einen Span (ohne aktives Tracing ein No-op)."""
+    if _tracer is None:
+        return NO_SPAN
+    return Span(_tracer, name, attrs)
+
+
+def traced(name: str = None, attrs: tuple = ()):
+    """Dekorator: misst jeden Aufruf als Span (sync und async).
+
+    Args:
+        name: Name des Spans (Default: Funktionsname)
+        attrs: Parameter, deren Werte als Attribute am Span landen
+    """
+    def decorate(func):
+        span_name = name or func.__name__
+        signature = inspect.signature(func)
+
+        def span_for(args, kwargs):
+            if not attrs:
+                return span(span_name)
+            bound = signature.bind_partial(*args, **kwargs)
+            return span(span_name, **{key: bound.arguments.get(key) for key in attrs})
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with span_for(args, kwargs):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with span_for(args, kwargs):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+# =============================================================================
+# EXPORT & AUSWERTUNG
+# =============================================================================
+
+def write_chrome_trace(records: list, path: str):
+    """Schreibt Spans im Chrome Trace Event Format (eine Zeile pro Spur)."""
+    events = [
+        {
+            "name": r["name"],
+            "cat": r["status"],
+            "ph": "X",
+            "ts": round(r["start_s"] * 1e6),
+            "dur": round(r["duration_s"] * 1e6),
+            "pid": 1,
+            "tid": r["lane"],
+            "args": {**r["attrs"], **({"error": r["error"]} if "error" in r else {})},
+        }
+        for r in records
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+
+
+def load_records(path: str) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def span_key(record: dict) -> str:
+    """Gruppiert nach Name, bei Feld-Helfern zusätzlich nach Label."""
+    attrs = record.get("attrs") or {}
+    label = next((attrs[k] for k in ("aria_label", "partial", "label_text", "question_text", "option_text", "text") if attrs.get(k)), None)
+    return f"{record['name']} [{label}]" if label else record["name"]
+
+
+def aggregate(records: list) -> dict:
+    """Anzahl, Summe und Maximum der Dauer pro Span-Schlüssel."""
+    stats = {}
+    for record in records:
+        entry = stats.setdefault(span_key(record), {"count": 0, "total_s": 0.0, "max_s": 0.0, "errors": 0})
+        entry["count"] += 1
+        entry["total_s"] += record["duration_s"]
+        entry["max_s"] = max(entry["max_s"], record["duration_s"])
+        entry["errors"] += record["status"] == "error"
+    return stats
+
+
+def print_summary(records: list, top: int = 25, baseline: list = None):
+    """Gibt die Spans mit der größten Gesamtdauer aus (optional mit Vergleich zu einem älteren Lauf)."""
+    if not records:
+        return
+    stats = aggregate(records)
+    before = aggregate(baseline) if baseline else {}
+
+    print()
+    print("=" * 50)
+    print(f"TRACE ({len(records)} Spans, längste Gesamtdauer zuerst)")
+    print("=" * 50)
+    for key, entry in sorted(stats.items(), key=lambda item: -item[1]["total_s"])[:top]:
+        mean = entry["total_s"] / entry["count"]
+        line = f"{entry['total_s']:9.2f}s  {entry['count']:5}x  Ø {mean:6.2f}s  max {entry['max_s']:6.2f}s  {key}"
+        if entry["errors"]:
+            line += f"  ({entry['errors']} Fehler)"
+        if key in before:
+            old_mean = before[key]["total_s"] / before[key]["count"]
+            line += f"  [Ø vorher {old_mean:.2f}s, {mean - old_mean:+.2f}s]"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wertet einen JSONL-Trace aus.")
+    parser.add_argument("path", help="JSONL-Trace (z.B. aus fill_form.py --trace)")
+    parser.add_argument("--baseline", help="Älterer Trace zum Vergleich der Durchschnittsdauern")
+    parser.add_argument("--top", type=int, default=25, help="Anzahl der ausgegebenen Spans (Default: 25)")
+    parser.add_argument("--chrome", help="Zusätzlich als Chrome-Trace in diese Datei schreiben")
+    args = parser.parse_args()
+
+    records = load_records(args.path)
+    print_summary(records, args.top, load_records(args.baseline) if args.baseline else None)
+    if args.chrome:
+        write_chrome_trace(records, args.chrome)
+        print(f"Trace (Chrome/Perfetto): {args.chrome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,35 @@ It creates documents and business data so that documents can be generated.
 
 Usage:
     python scripts/tests/trigger_document_creation.py
+
+    # Load test: fire the payloads of all fixtures at a target rate
+    python scripts/tests/trigger_document_creation.py --load --rate 2 --duration 60
+    python scripts/tests/trigger_document_creation.py --load --rate 1,2,4,8 --duration 30 --formulare 1,2
+    python scripts/tests/trigger_document_creation.py --load --concurrency 10 --requests 200 --fixtures a.json b.json
+
+In load mode the fixtures come from one or more test_data_ids.json files
+(single or multi-fixture, see create_test_data.py --count N) and are used
+round-robin. With --rate the requests are sent open-loop on a fixed
+schedule, so a slow webhook does not slow down the load; --concurrency
+caps the requests in flight. A comma-separated list of rates runs one
+step per rate, to find the rate at which the n8n pipeline starts to queue.
+Every request is written as a JSON line (latency, status, error), and
+each step reports p50/p95/p99 and the error rate.
 """
 
+import argparse
+import itertools
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 from pathlib import Path
 
+import webhooks
+from latency_stats import format_seconds, percentile, print_latency_summary, summarize
+
 # ============================================================
 # CONFIGURATION - Edit these values as needed
 # ============================================================
@@ -41,12 +64,46 @@ APPLICATION_FOLDER = "https://drive.google.com/drive/u/4/folders/1EDHnjVEdbhOJ4x
 
 # Der application_folder ist in der Fördernetzdokumente die Zwischenablage. 
 
+# Load test defaults
+DEFAULT_LOAD_CONCURRENCY = 10
+LOAD_TIMEOUT_SECONDS = 120
+
 # ============================================================
 # DO NOT EDIT BELOW THIS LINE
 # ============================================================
 
 SCRIPT_DIR = Path(__file__).parent
 TEST_DATA_FILE = SCRIPT_DIR / 'test_data_ids.json'
+LOAD_RESULTS_FILE = SCRIPT_DIR / 'webhook_load_results.jsonl'
+
+
+def webhook_url_and_type():
+    url, label = (WEBHOOK_URL_PROD, "PRODUCTION") if USE_PRODUCTION_WEBHOOK else (WEBHOOK_URL_TEST, "TEST")
+    if webhooks.is_redirected():
+        label += " (WEBHOOK_BASE_URL)"
+    return webhooks.webhook_url(url), label
+
+
+def build_payload(formular, document_record_id, employee_record_id):
+    """Build the webhook payload (wrapped in "data" for N8N access via $json.body.data.*)."""
+    return {
+        "data": {
+            "formular_unique_id": formular["id"],
+            "employee.first_name": VORNAME,
+            "employee.last_name": NACHNAME,
+            "document_name": formular["name"],
+            "application_folder": APPLICATION_FOLDER,
+            "document_record_id": document_record_id,
+            "employees_record_id": employee_record_id
+        }
+    }
+
+
+def trigger_document(document_record_id, employee_record_id, formular_key=SELECTED_FORMULAR, session=requests):
+    """Send the webhook for one document and return the response."""
+    webhook_url, _ = webhook_url_and_type()
+    payload = build_payload(FORMULARE[formular_key], document_record_id, employee_record_id)
+    return session.post(webhook_url, json=payload, timeout=LOAD_TIMEOUT_SECONDS)
 
 
 def main():
@@ -68,24 +125,12 @@ def main():
         return
 
     # Select webhook URL based on flag
-    webhook_url = WEBHOOK_URL_PROD if USE_PRODUCTION_WEBHOOK else WEBHOOK_URL_TEST
-    webhook_type = "PRODUCTION" if USE_PRODUCTION_WEBHOOK else "TEST"
+    webhook_url, webhook_type = webhook_url_and_type()
 
     # Get selected formular
     formular = FORMULARE[SELECTED_FORMULAR]
 
-    # Build the payload (wrapped in "data" for N8N access via $json.body.data.*)
-    payload = {
-        "data": {
-            "formular_unique_id": formular["id"],
-            "employee.first_name": VORNAME,
-            "employee.last_name": NACHNAME,
-            "document_name": formular["name"],
-            "application_folder": APPLICATION_FOLDER,
-            "document_record_id": document_record_id,
-            "employees_record_id": employee_record_id
-        }
-    }
+    payload = build_payload(formular, document_record_id, employee_record_id)
 
     print(f"Calling N8N webhook ({webhook_type})...")
     print(f"Formular: {SELECTED_FORMULAR} - {formular['name']}")
@@ -102,5 +147,194 @@ def main():
     print(f"Response: {response.text}")
 
 
+# ============================================================
+# LOAD TEST
+# ============================================================
+
+def load_fixtures(paths):
+    """Read the fixtures of one or more test_data_ids.json files (single or multi-fixture)."""
+    fixtures = []
+    for path in paths:
+        with open(path, 'r') as f:
+            test_data = json.load(f)
+        for fixture in test_data.get('fixtures', [test_data]):
+            if fixture.get('document_id') and fixture.get('employee_student_id'):
+                fixtures.append(fixture)
+            else:
+                print(f"Skipping incomplete fixture in {path}: {fixture}")
+    return fixtures
+
+
+def build_load_payloads(fixtures, formular_keys):
+    """One payload per fixture, the formulars are used round-robin."""
+    payloads = []
+    for n, fixture in enumerate(fixtures):
+        key = formular_keys[n % len(formular_keys)]
+        payload = build_payload(FORMULARE[key], fixture['document_id'], fixture['employee_student_id'])
+        payloads.append((fixture['document_id'], key, payload))
+    return payloads
+
+
+def send_webhook(session, url, index, payload_entry, scheduled, started_at):
+    """Send one webhook request and return its result line.
+
+    queue_s is the time between the scheduled send and the actual send
+    (> 0 when all connections were busy), latency_s the response time.
+    """
+    document_id, formular_key, payload = payload_entry
+    sent = time.monotonic()
+    result = {
+        'index': index,
+        'document_id': document_id,
+        'formular': formular_key,
+        'scheduled_s': round(scheduled - started_at, 3),
+        'queue_s': round(sent - scheduled, 3),
+    }
+    try:
+        response = session.post(url, json=payload, timeout=LOAD_TIMEOUT_SECONDS)
+        result['status'] = response.status_code
+        result['ok'] = response.ok
+        if not response.ok:
+            result['error'] = response.text[:200]
+    except requests.exceptions.RequestException as e:
+        result['status'] = None
+        result['ok'] = False
+        result['error'] = f"{e.__class__.__name__}: {e}"
+    result['latency_s'] = round(time.monotonic() - sent, 3)
+    return result
+
+
+def run_load(url, payloads, total, rate=None, concurrency=DEFAULT_LOAD_CONCURRENCY, out=None, step=None):
+    """Send `total` requests, open-loop at `rate` per second or closed-loop with `concurrency` in flight.
+
+    Returns the results and the duration of the step.
+    """
+    session = webhooks.create_session(concurrency)
+    results = []
+    lock = threading.Lock()
+    payload_cycle = itertools.cycle(payloads)
+
+    def send(index, payload_entry, scheduled):
+        result = send_webhook(session, url, index, payload_entry, scheduled, started)
+        if step is not None:
+            result['rate'] = step
+        with lock:
+            results.append(result)
+            if out:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            done = len(results)
+        if done % 50 == 0 or done == total:
+            print(f"   {done}/{total} requests done")
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index in range(total):
+            scheduled = started + index / rate if rate else time.monotonic()
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, index, next(payload_cycle), scheduled)
+    duration = time.monotonic() - started
+    session.close()
+
+    return results, duration
+
+
+def parse_keys(value):
+    """Parse "1,2,3" into [1, 2, 3]."""
+    return [int(part) for part in value.split(',') if part.strip()]
+
+
+def parse_rates(value):
+    """Parse "1,2,4" into [1.0, 2.0, 4.0]. Raises ValueError for rates that are not positive numbers."""
+    rates = [float(part) for part in value.split(',') if part.strip()]
+    if not rates or any(rate <= 0 for rate in rates):
+        raise ValueError(f"rates must be positive numbers, got {value!r}")
+    return rates
+
+
+def main_load(args):
+    fixtures = load_fixtures(args.fixtures or [TEST_DATA_FILE])
+    if not fixtures:
+        print("Error: No complete fixtures found.")
+        print("Please run 'python scripts/tests/create_test_data.py --count N' first.")
+        return
+
+    formular_keys = parse_keys(args.formulare) if args.formulare else [SELECTED_FORMULAR]
+    unknown = [key for key in formular_keys if key not in FORMULARE]
+    if unknown:
+        print(f"Error: Unknown formular(s) {unknown}, available: {sorted(FORMULARE)}")
+        return
+
+    webhook_url, webhook_type = webhook_url_and_type()
+    webhook_url = args.url or webhook_url
+    payloads = build_load_payloads(fixtures, formular_keys)
+    rates = args.rate or [None]
+
+    print(f"Webhook load test ({webhook_type if not args.url else 'CUSTOM URL'})")
+    print(f"URL: {webhook_url}")
+    print(f"Fixtures: {len(fixtures)}, Formulare: {formular_keys}, Concurrency: {args.concurrency}")
+
+    steps = []
+    with open(args.results, 'w') as out:
+        for rate in rates:
+            if args.requests:
+                total = args.requests
+            elif rate and args.duration:
+                total = max(1, round(rate * args.duration))
+            else:
+                total = len(payloads)
+
+            label = f"{rate:g} requests/s" if rate else f"concurrency {args.concurrency}"
+            print(f"\nStep: {total} requests at {label}...")
+            results, duration = run_load(webhook_url, payloads, total, rate, args.concurrency, out, rate)
+
+            summary = summarize(results, duration)
+            queue_p95 = percentile(sorted(r['queue_s'] for r in results), 95)
+            print_latency_summary(summary, f"WEBHOOK LOAD - {label}")
+            print(f"Send delay:  p95 {format_seconds(queue_p95)} (> 0: all {args.concurrency} connections busy)")
+            steps.append((label, summary, queue_p95))
+
+    if len(steps) > 1:
+        print("\n" + "="*50)
+        print("STEPS")
+        print("="*50)
+        print(f"{'step':>20} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7} {'delay p95':>10}")
+        for label, summary, queue_p95 in steps:
+            print(f"{label:>20} {summary['throughput_per_s']:7.2f} {format_seconds(summary['p50_s']):>8} "
+                  f"{format_seconds(summary['p95_s']):>8} {format_seconds(summary['p99_s']):>8} "
+                  f"{summary['error_rate']:7.1%} {format_seconds(queue_p95):>10}")
+
+    print(f"\nResults: {args.results}")
+
+
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Trigger the N8N document creation webhook.')
+    parser.add_argument('--load', action='store_true', help='Load test with the payloads of many fixtures')
+    parser.add_argument('--fixtures', nargs='+', help=f'Fixture files (default: {TEST_DATA_FILE.name})')
+    parser.add_argument('--formulare', help=f'Comma-separated formulars used round-robin (default: {SELECTED_FORMULAR})')
+    parser.add_argument('--rate', help='Target requests per second, comma-separated for several steps (default: closed loop)')
+    parser.add_argument('--duration', type=float, help='Seconds per rate step (requests = rate * duration)')
+    parser.add_argument('--requests', type=int, help='Requests per step (default: one per fixture)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_LOAD_CONCURRENCY,
+                        help=f'Maximum requests in flight (default: {DEFAULT_LOAD_CONCURRENCY})')
+    parser.add_argument('--url', help='Send to this URL instead of the configured webhook')
+    parser.add_argument('--results', default=LOAD_RESULTS_FILE, help=f'Per-request results (default: {LOAD_RESULTS_FILE.name})')
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.requests is not None and args.requests < 1:
+        parser.error("--requests must be at least 1")
+    if args.duration is not None and args.duration <= 0:
+        parser.error("--duration must be positive")
+    if args.rate:
+        try:
+            args.rate = parse_rates(args.rate)
+        except ValueError:
+            parser.error(f"--rate must be one or more positive numbers, e.g. 1,2,4 (got {args.rate!r})")
+
+    if args.load:
+        main_load(args)
+    else:
+        main()
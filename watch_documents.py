@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Watch documents until the n8n pipeline has processed them and report the latency.
+
+Usage:
+    python scripts/tests/watch_documents.py
+    python scripts/tests/watch_documents.py --fixtures a.json b.json
+    python scripts/tests/watch_documents.py --ids recA recB recC
+    python scripts/tests/watch_documents.py --trigger --formulare 1,2 --timeout 1800
+
+The documents come from test_data_ids.json (single or multi-fixture, see
+create_test_data.py --count N), other fixture files or --ids. With
+--trigger the document creation webhook is sent for every fixture first,
+--concurrency at a time (see trigger_document_creation.py), and the clock
+of each document starts when its webhook was sent; otherwise it starts
+when watching begins. Each result records when the document was first
+polled (first_poll_s): a document that finished earlier shows that as
+its latency.
+
+All in-flight documents are polled together: one list request per 100
+documents with an OR(RECORD_ID()=...) formula instead of one GET per
+record. The interval starts short, grows while nothing changes and drops
+back as soon as a document finishes. Every status change is timestamped.
+The run ends with the completion latency (p50/p95/p99 and a histogram)
+and writes one JSON line per document.
+"""
+
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+from airtable_client import AirtableClient, chunked
+from latency_stats import format_seconds, print_histogram, print_latency_summary, summarize
+from webhooks import create_session
+
+# ============================================================
+# CONFIGURATION - Edit these values as needed
+# ============================================================
+
+# Statuses set by the queue worker when it is done with a document
+FINAL_STATUSES = {'done', 'error'}
+SUCCESS_STATUSES = {'done'}
+
+# Polling: start at MIN, grow by BACKOFF while nothing changes, up to MAX
+MIN_INTERVAL_SECONDS = 2
+MAX_INTERVAL_SECONDS = 30
+INTERVAL_BACKOFF = 1.5
+
+# Documents per list request (one page, keeps the formula short)
+POLL_BATCH_SIZE = 100
+
+DEFAULT_TIMEOUT_SECONDS = 900
+
+# Webhooks sent at once with --trigger
+DEFAULT_TRIGGER_CONCURRENCY = 10
+
+# ============================================================
+# DO NOT EDIT BELOW THIS LINE
+# ============================================================
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+TEST_DATA_FILE = SCRIPT_DIR / 'test_data_ids.json'
+RESULTS_FILE = SCRIPT_DIR / 'document_latencies.jsonl'
+
+# Load environment variables from .env.local in project root
+load_dotenv(PROJECT_ROOT / '.env.local', override=True)
+
+AIRTABLE_TOKEN = os.getenv('AIRTABLE_TOKEN')
+AIRTABLE_BASE_ID = os.getenv('AIRTABLE_BASE_ID')
+
+client = AirtableClient(AIRTABLE_TOKEN, AIRTABLE_BASE_ID)
+
+
+def record_id_formula(record_ids):
+    """OR(RECORD_ID()='a',RECORD_ID()='b',...) for a batch of record IDs."""
+    return 'OR(' + ','.join(f"RECORD_ID()='{record_id}'" for record_id in record_ids) + ')'
+
+
+class DocumentWatcher:
+    """Tracks many documents at once until they reach a final status."""
+
+    def __init__(self, airtable=None, final_statuses=FINAL_STATUSES, min_interval=MIN_INTERVAL_SECONDS,
+                 max_interval=MAX_INTERVAL_SECONDS, batch_size=POLL_BATCH_SIZE):
+        self.airtable = airtable or client
+        self.final_statuses = final_statuses
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_size = batch_size
+        self.started = time.monotonic()
+        self.documents = {}
+        self.polls = 0
+        self.poll_errors = 0
+
+    def add(self, document_id, started=None, **meta):
+        """Watch a document; its latency counts from `started` (monotonic, default: now)."""
+        self.documents[document_id] = {
+            'document_id': document_id,
+            **meta,
+            'started': started if started is not None else time.monotonic(),
+            'status': None,
+            'transitions': [],
+            'finished': None,
+            'first_poll': None,
+            'last_poll': None,
+        }
+
+    def pending_ids(self):
+        return [doc_id for doc_id, doc in self.documents.items() if doc['finished'] is None]
+
+    def poll(self):
+        """Fetch the status of all pending documents. Returns the number of documents that finished.
+
+        A failed list request (e.g. retries exhausted) is logged and its
+        batch stays pending for the next poll, so one bad response does not
+        end the run and lose the transitions recorded so far.
+        """
+        finished = 0
+        for batch in chunked(self.pending_ids(), self.batch_size):
+            try:
+                records = self.airtable.list_records('documents', formula=record_id_formula(batch), fields=['status'])
+                statuses = {record['id']: record['fields'].get('status') for record in records}
+            except Exception as e:
+                self.poll_errors += 1
+                print(f"   Status poll for {len(batch)} document(s) failed, retrying next poll: {e}")
+                continue
+            now = time.monotonic()
+            self.polls += 1
+
+            for doc_id in batch:
+                # A document that is gone (deleted) cannot finish anymore
+                status = statuses.get(doc_id, 'missing')
+                finished += self.update(doc_id, status, now)
+        return finished
+
+    def update(self, document_id, status, now):
+        doc = self.documents[document_id]
+        changed = status != doc['status']
+        if changed:
+            doc['transitions'].append({
+                'status': status,
+                'at_s': round(now - doc['started'], 3),
+                # Time since the previous poll: the change happened somewhere in between
+                'resolution_s': round(now - doc['last_poll'], 3) if doc['last_poll'] else None,
+            })
+            doc['status'] = status
+        if doc['first_poll'] is None:
+            doc['first_poll'] = now
+        doc['last_poll'] = now
+
+        if changed and (status in self.final_statuses or status == 'missing'):
+            doc['finished'] = now
+            return 1
+        return 0
+
+    def run(self, timeout=DEFAULT_TIMEOUT_SECONDS, progress=True):
+        """Poll until every document is final or the timeout is reached."""
+        interval = self.min_interval
+        deadline = time.monotonic() + timeout
+
+        while self.pending_ids():
+            finished = self.poll()
+            pending = len(self.pending_ids())
+            # Something finished: more are likely close behind, poll fast again
+            interval = self.min_interval if finished else min(interval * INTERVAL_BACKOFF, self.max_interval)
+            if progress:
+                elapsed = time.monotonic() - self.started
+                print(f"   [{elapsed:7.1f}s] {len(self.documents) - pending}/{len(self.documents)} final"
+                      + (f", next poll in {interval:.1f}s" if pending else ""))
+            if not pending or time.monotonic() + interval > deadline:
+                break
+            time.sleep(interval)
+
+    def results(self):
+        """One dict per document: final status, latency and transitions."""
+        results = []
+        for doc in self.documents.values():
+            result = {key: value for key, value in doc.items()
+                      if key not in ('started', 'finished', 'first_poll', 'last_poll')}
+            if doc['finished'] is None:
+                result['status'] = 'timeout'
+            result['ok'] = doc['status'] in SUCCESS_STATUSES and doc['finished'] is not None
+            result['latency_s'] = round(doc['finished'] - doc['started'], 3) if doc['finished'] else None
+            # Shortest latency this document could have shown
+            result['first_poll_s'] = round(doc['first_poll'] - doc['started'], 3) if doc['first_poll'] else None
+            results.append(result)
+        return results
+
+
+def load_document_ids(paths):
+    """All fixtures with a document_id from the given fixture files."""
+    documents = []
+    for path in paths:
+        with open(path, 'r') as f:
+            test_data = json.load(f)
+        for fixture in test_data.get('fixtures', [test_data]):
+            if fixture.get('document_id'):
+                documents.append(fixture)
+    return documents
+
+
+def trigger_all(watcher, fixtures, formular_keys, concurrency=DEFAULT_TRIGGER_CONCURRENCY):
+    """Send the document creation webhook for every fixture, start each clock at its send.
+
+    The webhooks go out concurrently over one pooled session, so the first
+    poll is not delayed by a long row of sequential requests (each of them
+    can take up to LOAD_TIMEOUT_SECONDS).
+    """
+    import trigger_document_creation
+
+    session = create_session(concurrency)
+
+    def send(n):
+        fixture = fixtures[n]
+        formular_key = formular_keys[n % len(formular_keys)]
+        started = time.monotonic()
+        try:
+            response = trigger_document_creation.trigger_document(
+                fixture['document_id'], fixture.get('employee_student_id'), formular_key, session=session
+            )
+            ok = response.ok
+        except Exception as e:
+            print(f"   Trigger failed for {fixture['document_id']}: {e}")
+            ok = False
+        return fixture, formular_key, started, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        sent = list(executor.map(send, range(len(fixtures))))
+    session.close()
+
+    for fixture, formular_key, started, ok in sent:
+        if ok:
+            watcher.add(fixture['document_id'], started, formular=formular_key)
+        else:
+            print(f"   Not watching {fixture['document_id']} (webhook failed)")
+
+
+def print_report(results, duration):
+    latencies = [r['latency_s'] for r in results if r['ok']]
+    by_status = {}
+    for r in results:
+        by_status[r['status']] = by_status.get(r['status'], 0) + 1
+
+    summary = summarize(results, duration)
+    print_latency_summary(summary, 'DOCUMENT COMPLETION')
+    print(f"Statuses:    {', '.join(f'{status} {count}' for status, count in sorted(by_status.items(), key=str))}")
+    print_histogram(latencies, title='Completion latency')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch documents until the n8n pipeline has processed them.')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--fixtures', nargs='+', help=f'Fixture files (default: {TEST_DATA_FILE.name})')
+    source.add_argument('--ids', nargs='+', help='Document record IDs')
+    parser.add_argument('--trigger', action='store_true', help='Send the document creation webhook first')
+    parser.add_argument('--formulare', default=None, help='Comma-separated formulars for --trigger (round-robin)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_TRIGGER_CONCURRENCY,
+                        help=f'Webhooks sent at once with --trigger (default: {DEFAULT_TRIGGER_CONCURRENCY})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help=f'Give up after this many seconds (default: {DEFAULT_TIMEOUT_SECONDS})')
+    parser.add_argument('--min-interval', type=float, default=MIN_INTERVAL_SECONDS, help='Shortest poll interval in seconds')
+    parser.add_argument('--max-interval', type=float, default=MAX_INTERVAL_SECONDS, help='Longest poll interval in seconds')
+    parser.add_argument('--results', default=RESULTS_FILE, help=f'Per-document results (default: {RESULTS_FILE.name})')
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    if args.ids:
+        fixtures = [{'document_id': doc_id} for doc_id in args.ids]
+    else:
+        paths = args.fixtures or [TEST_DATA_FILE]
+        missing = [str(path) for path in paths if not Path(path).exists()]
+        if missing:
+            print(f"Error: {', '.join(missing)} not found.")
+            print("Please run 'python scripts/tests/create_test_data.py' first.")
+            return
+        fixtures = load_document_ids(paths)
+
+    if not fixtures:
+        print("No documents to watch.")
+        return
+
+    watcher = DocumentWatcher(min_interval=args.min_interval, max_interval=args.max_interval)
+    if args.trigger:
+        import trigger_document_creation
+        formular_keys = ([int(key) for key in args.formulare.split(',')] if args.formulare
+                         else [trigger_document_creation.SELECTED_FORMULAR])
+        print(f"Triggering {len(fixtures)} document(s), {args.concurrency} at a time...")
+        trigger_started = time.monotonic()
+        trigger_all(watcher, fixtures, formular_keys, args.concurrency)
+        print(f"   Triggered in {format_seconds(time.monotonic() - trigger_started)}")
+    else:
+        for fixture in fixtures:
+            watcher.add(fixture['document_id'])
+
+    print(f"Watching {len(watcher.documents)} document(s), timeout {args.timeout:.0f}s...")
+    try:
+        watcher.run(timeout=args.timeout)
+    except KeyboardInterrupt:
+        print("\nInterrupted, reporting the documents finished so far.")
+    duration = time.monotonic() - watcher.started
+
+    results = watcher.results()
+    with open(args.results, 'w') as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    print_report(results, duration)
+    print(f"\nStatus polls: {watcher.polls} list requests for {len(results)} documents"
+          + (f", {watcher.poll_errors} failed" if watcher.poll_errors else ""))
+    first_polls = [r['first_poll_s'] for r in results if r['first_poll_s'] is not None]
+    if first_polls:
+        # A document that finished before its first poll shows this as its latency
+        print(f"First poll:  {format_seconds(min(first_polls))} - {format_seconds(max(first_polls))} after the clock started")
+    client.print_stats()
+    print(f"Results: {args.results} ({datetime.now().isoformat(timespec='seconds')})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Webhook helpers: redirect the n8n and Make URLs (e.g. to fake_webhooks.py) and send with retries.
+
+Usage:
+    from webhooks import webhook_url
+
+    requests.post(webhook_url(WEBHOOK_URL), json=payload)
+
+    # Many requests: pooled session, retries on 429/5xx and connection errors
+    session = create_session(concurrency=8)
+    response, error, attempts = post_with_retries(session, webhook_url(WEBHOOK_URL), payload)
+
+Without WEBHOOK_BASE_URL in the environment the URL is returned unchanged.
+With it, scheme and host are replaced and the path (plus query) is kept,
+so every live hook keeps its own route on the local receiver:
+
+    WEBHOOK_BASE_URL=http://127.0.0.1:8780
+    https://hook.eu1.make.com/nh9q...        -> http://127.0.0.1:8780/nh9q...
+    https://n8n.../webhook/e854...           -> http://127.0.0.1:8780/webhook/e854...
+"""
+
+import os
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from airtable_client import RETRY_STATUS_CODES, backoff_seconds
+
+REQUEST_TIMEOUT_SECONDS = 30
+MAX_RETRIES = 3
+
+
+def base_url():
+    """WEBHOOK_BASE_URL from the environment (without trailing slash), None if unset."""
+    value = os.getenv('WEBHOOK_BASE_URL')
+    return value.rstrip('/') if value else None
+
+
+def webhook_url(url):
+    """Return the URL to post to: unchanged, or on WEBHOOK_BASE_URL with the same path."""
+    base = base_url()
+    if not base:
+        return url
+
+    parts = urlsplit(url)
+    # Placeholders like "HIER_DEINE_WEBHOOK_URL_EINFUEGEN" have no scheme, the whole value is the path
+    path = parts.path if parts.scheme else url
+    target = f"{base}/{path.lstrip('/')}"
+    return f"{target}?{parts.query}" if parts.query else target
+
+
+def is_redirected():
+    return base_url() is not None
+
+
+def create_session(concurrency):
+    """Pooled session with one keep-alive connection per concurrent request."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def post_with_retries(session, url, payload, timeout=REQUEST_TIMEOUT_SECONDS, max_retries=MAX_RETRIES):
+    """POST a JSON payload, retry on 429/5xx and connection errors with exponential backoff.
+
+    Returns (response, error, attempts): the last response (None if the last
+    attempt raised) and the error text of a failed request (None on success).
+    """
+    for attempt in range(1, max_retries + 2):
+        try:
+            response = session.post(url, json=payload, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            response, error = None, f"{e.__class__.__name__}: {e}"
+        else:
+            if response.ok:
+                return response, None, attempt
+            error = f"Status {response.status_code}: {response.text[:200]}"
+            if response.status_code not in RETRY_STATUS_CODES:
+                return response, error, attempt
+
+        if attempt <= max_retries:
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            time.sleep(backoff_seconds(attempt, retry_after))
+    return response, error, attempt